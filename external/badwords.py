@@ -40,10 +40,4 @@ STRIP_WHITESPACE = re.compile(r"\s+")
 # It then returns a boolean if the specified text contains badword.
 async def has_badwords(text: str, context: npps4.idol.BasicSchoolIdolContext) -> bool:
     new_text = re.sub(STRIP_WHITESPACE, "", text.lower())
-    server_data = npps4.data.get()
-
-    for badword in server_data.badwords:
-        if badword in new_text:
-            return True
-
-    return False
+    return npps4.data.get().badword_matcher.search(new_text)
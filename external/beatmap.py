@@ -24,12 +24,14 @@
 #
 # For more information, please refer to <http://unlicense.org/>
 
+import collections
 import collections.abc
 import json
 import os
 
 import pydantic
 
+import npps4.beatmap
 import npps4.config.config
 
 from typing import Literal
@@ -47,14 +49,80 @@ class BeatmapData(pydantic.BaseModel):
     vanish: Literal[0, 1, 2] = 0  # 0 = Normal; 1 = Note hidden as it approaches; 2 = Note shows just before its timing.
 
 
-# Beatmap provider file must define "get_beatmap_data" async function with these parameters:
-# * "livejson" (str) of the beatmap as in their live_setting_m
-# * "context" (npps4.idol.BasicSchoolIdolContext) to access the database.
-#
-# It then returns an iterable of BeatmapData above or None if the beatmap is not found:
-async def get_beatmap_data(livejson: str, context) -> collections.abc.Iterable[BeatmapData] | None:
+# Packed beatmap file created by `scripts/pack_beatmaps.py`. When it exists, beatmaps are read from it instead of the
+# JSON files in the `beatmaps` folder.
+PACKED_BEATMAP_FILE = os.path.join(npps4.config.config.ROOT_DIR, "beatmaps.npb")
+# Maximum amount of notes to keep in the parsed beatmap cache, across all beatmaps.
+BEATMAP_CACHE_MAX_NOTES = 100000
+
+_beatmap_cache: collections.OrderedDict[tuple[str, float], tuple[BeatmapData, ...]] = collections.OrderedDict()
+_beatmap_cache_notes = 0
+_packed_beatmaps: npps4.beatmap.PackedBeatmaps | None = None
+
+
+def _get_cached_beatmap(key: tuple[str, float]):
+    result = _beatmap_cache.get(key)
+    if result is not None:
+        _beatmap_cache.move_to_end(key)
+    return result
+
+
+def _set_cached_beatmap(key: tuple[str, float], beatmap: tuple[BeatmapData, ...]):
+    global _beatmap_cache_notes
+
+    if len(beatmap) > BEATMAP_CACHE_MAX_NOTES:
+        return
+
+    _beatmap_cache[key] = beatmap
+    _beatmap_cache_notes = _beatmap_cache_notes + len(beatmap)
+
+    while _beatmap_cache_notes > BEATMAP_CACHE_MAX_NOTES:
+        _, evicted = _beatmap_cache.popitem(last=False)
+        _beatmap_cache_notes = _beatmap_cache_notes - len(evicted)
+
+
+def _get_packed_beatmaps():
+    global _packed_beatmaps
+
     try:
-        with open(os.path.join(npps4.config.config.ROOT_DIR, "beatmaps", livejson), "r", encoding="UTF-8") as f:
+        mtime = os.stat(PACKED_BEATMAP_FILE).st_mtime
+    except OSError:
+        mtime = None
+
+    if _packed_beatmaps is not None and _packed_beatmaps.mtime != mtime:
+        _packed_beatmaps.close()
+        _packed_beatmaps = None
+
+    if _packed_beatmaps is None and mtime is not None:
+        _packed_beatmaps = npps4.beatmap.PackedBeatmaps(PACKED_BEATMAP_FILE)
+
+    return _packed_beatmaps
+
+
+def _load_packed_beatmap(packed: npps4.beatmap.PackedBeatmaps, livejson: str):
+    notes = packed.get_notes(livejson)
+    if notes is None:
+        return None
+
+    # Packed data is validated when packing.
+    return tuple(
+        BeatmapData.model_construct(
+            timing_sec=timing_sec,
+            notes_attribute=notes_attribute,
+            notes_level=notes_level,
+            effect=effect,
+            effect_value=effect_value,
+            position=position,
+            speed=speed,
+            vanish=vanish,
+        )
+        for timing_sec, notes_attribute, notes_level, effect, effect_value, position, speed, vanish in notes
+    )
+
+
+def _load_json_beatmap(path: str):
+    try:
+        with open(path, "r", encoding="UTF-8") as f:
             jsondata = f.read()
     except IOError:
         return None
@@ -72,9 +140,62 @@ async def get_beatmap_data(livejson: str, context) -> collections.abc.Iterable[B
     except pydantic.ValidationError:
         return None
 
+    return tuple(result)
+
+
+def _get_beatmap_source(livejson: str):
+    packed = _get_packed_beatmaps()
+    if packed is not None and livejson in packed:
+        return packed, (livejson, packed.mtime)
+
+    path = os.path.join(npps4.config.config.ROOT_DIR, "beatmaps", livejson)
+    try:
+        return path, (livejson, os.stat(path).st_mtime)
+    except OSError:
+        return None
+
+
+# Beatmap provider file must define "get_beatmap_data" async function with these parameters:
+# * "livejson" (str) of the beatmap as in their live_setting_m
+# * "context" (npps4.idol.BasicSchoolIdolContext) to access the database.
+#
+# It then returns an iterable of BeatmapData above or None if the beatmap is not found.
+# The returned iterable may be shared between calls, so callers must not modify it.
+async def get_beatmap_data(livejson: str, context) -> collections.abc.Iterable[BeatmapData] | None:
+    source = _get_beatmap_source(livejson)
+    if source is None:
+        return None
+
+    source, key = source
+    result = _get_cached_beatmap(key)
+    if result is not None:
+        return result
+
+    if isinstance(source, npps4.beatmap.PackedBeatmaps):
+        result = _load_packed_beatmap(source, livejson)
+    else:
+        result = _load_json_beatmap(source)
+
+    if result is not None:
+        _set_cached_beatmap(key, result)
+
     return result
 
 
+# Beatmap provider file may define "get_beatmap_version" async function with these parameters:
+# * "livejson" (str) of the beatmap as in their live_setting_m
+# * "context" (npps4.idol.BasicSchoolIdolContext) to access the database.
+#
+# It then returns a hashable value which changes whenever the beatmap returned by "get_beatmap_data" changes, or None
+# if it can't tell. When it's defined, the server keeps the beatmaps encoded as JSON until their version changes.
+async def get_beatmap_version(livejson: str, context) -> collections.abc.Hashable | None:
+    source = _get_beatmap_source(livejson)
+    if source is None:
+        return None
+
+    return source[1]
+
+
 # Beatmap provider file must define "randomize_beatmaps" async function with these parameters:
 # * "beatmap" (iterable of BeatmapData)
 # * "seed" (bytes) with length of 16. It's up to implementation how to use this seed.
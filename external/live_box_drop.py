@@ -35,13 +35,13 @@
 # For more information, please refer to <http://unlicense.org/>
 
 import dataclasses
-import random
 
 import sqlalchemy
 
 import npps4.data
 import npps4.db.effort
 import npps4.idol
+import npps4.sampler
 
 from typing import Any
 
@@ -102,39 +102,33 @@ async def process_effort_box(
     )
 
 
-server_data = None
-cached_live_drops: dict[int, list[tuple[int, int, int, dict[str, Any] | None]]] = {}
-_SYSRAND = random.SystemRandom()
+def _build_drops(live_effort_point_box_spec_id: int):
+    def build(server_data: npps4.data.ServerData):
+        drops = server_data.live_effort_drops.get(live_effort_point_box_spec_id)
+        if not drops:
+            return None
 
+        items: list[tuple[int, int, int, dict[str, Any] | None]] = []
+        weights: list[int] = []
+        for drop in drops:
+            extra_data: dict[str, Any] | None = None
+            if hasattr(drop, "extra"):
+                extra_data = getattr(drop, "extra")
 
-def _refresh_drop_cache():
-    global server_data
-    current_server_data = npps4.data.get()
+            items.append((drop.add_type, drop.item_id, drop.amount, extra_data))
+            weights.append(drop.weight)
 
-    if current_server_data != server_data:
-        for live_effort_point_box_spec_id, drops in current_server_data.live_effort_drops.items():
-            result: list[tuple[int, int, int, dict[str, Any] | None]] = []
+        return npps4.sampler.AliasTable(items, weights)
 
-            for drop in drops:
-                extra_data: dict[str, Any] | None = None
-                if hasattr(drop, "extra"):
-                    extra_data = getattr(drop, "extra")
-
-                result.extend([(drop.add_type, drop.item_id, drop.amount, extra_data)] * drop.weight)
-
-            cached_live_drops[live_effort_point_box_spec_id] = result
-
-        server_data = current_server_data
+    return build
 
 
 def _get_reward_from_box(live_effort_point_box_spec_id: int, amount: int, /):
-    global cached_live_drops
-    _refresh_drop_cache()
+    drops = npps4.sampler.get_server_data_table(
+        ("live_effort_drops", live_effort_point_box_spec_id), _build_drops(live_effort_point_box_spec_id)
+    )
 
-    result: list[tuple[int, int, int, dict[str, Any] | None]] = []
-    if live_effort_point_box_spec_id in cached_live_drops:
-        drops = cached_live_drops[live_effort_point_box_spec_id]
-        for i in range(amount):
-            result.append(_SYSRAND.choice(drops))
+    if drops is None:
+        return []
 
-    return result
+    return drops.sample_many(amount)
@@ -27,58 +27,45 @@
 #
 # For more information, please refer to <http://unlicense.org/>
 
-import random
-
 import npps4.data
 import npps4.idol
+import npps4.sampler
 
-_SYSRAND = random.SystemRandom()
-
-_last_server_data = None
-_cached_rare_drops: dict[int, list[int]] = {}
-_cached_common_drops: list[int] = []
-
-
-def _rebuild_cache():
-    global _cached_rare_drops, _cached_common_drops, _last_server_data
-    server_data = npps4.data.get()
 
-    if server_data != _last_server_data:
-        # Rebuild common drop cache
-        _cached_common_drops = []
+def _build_common_drops(server_data: npps4.data.ServerData):
+    return npps4.sampler.AliasTable.from_pairs((d.unit_id, d.weight) for d in server_data.common_live_unit_drops)
 
-        for unit_drop in server_data.common_live_unit_drops:
-            _cached_common_drops.extend([unit_drop.unit_id] * unit_drop.weight)
 
-        # Rebuild live specific drop cache
-        _cached_rare_drops = {}
+def _build_rare_drops(live_setting_id: int):
+    def build(server_data: npps4.data.ServerData):
+        live_unit_drops = server_data.live_specific_live_unit_drops.get(live_setting_id)
+        if not live_unit_drops:
+            return None
+        return npps4.sampler.AliasTable.from_pairs((d.unit_id, d.weight) for d in live_unit_drops)
 
-        for lsid, live_unit_drops in server_data.live_specific_live_unit_drops.items():
-            by_lsid: list[int] = []
+    return build
 
-            for unit_drop in live_unit_drops:
-                by_lsid.extend([unit_drop.unit_id] * unit_drop.weight)
 
-            _cached_rare_drops[lsid] = by_lsid
-
-        _last_server_data = server_data
-
-    return server_data
+def _build_drop_chance(server_data: npps4.data.ServerData):
+    chance = server_data.live_unit_drop_chance
+    return npps4.sampler.AliasTable([_get_drop_n, _get_drop_r], [chance.common, chance.live_specific])
 
 
 def _get_drop_r(context: npps4.idol.BasicSchoolIdolContext, live_setting_id: int):
-    global _cached_rare_drops
-    unit_drops = _cached_rare_drops.get(live_setting_id)
+    unit_drops = npps4.sampler.get_server_data_table(
+        ("live_unit_drop_r", live_setting_id), _build_rare_drops(live_setting_id)
+    )
 
-    if unit_drops:
-        return _SYSRAND.choice(unit_drops)
+    if unit_drops is not None:
+        return unit_drops.sample()
 
     return 0
 
 
 def _get_drop_n(context: npps4.idol.BasicSchoolIdolContext, live_setting_id: int):
-    global _cached_common_drops
-    return _SYSRAND.choice(_cached_common_drops)
+    unit_drops = npps4.sampler.get_server_data_table("live_unit_drop_n", _build_common_drops)
+    assert unit_drops is not None
+    return unit_drops.sample()
 
 
 # Live Show! unit reward drop file must define "get_live_drop_unit" async function with these parameters:
@@ -87,15 +74,11 @@ def _get_drop_n(context: npps4.idol.BasicSchoolIdolContext, live_setting_id: int
 #
 # It then returns an integer `unit_id` to give to player.
 async def get_live_drop_unit(live_setting_id: int, context: npps4.idol.BasicSchoolIdolContext):
-    global _last_server_data
-    server_data = _rebuild_cache()
+    choice_func = npps4.sampler.get_server_data_table("live_unit_drop_chance", _build_drop_chance)
+    assert choice_func is not None
     unit_id = 0
 
-    choice_func = [_get_drop_n] * server_data.live_unit_drop_chance.common + [
-        _get_drop_r
-    ] * server_data.live_unit_drop_chance.live_specific
-
     while unit_id == 0:
-        unit_id = _SYSRAND.choice(choice_func)(context, live_setting_id)
+        unit_id = choice_func.sample()(context, live_setting_id)
 
     return unit_id
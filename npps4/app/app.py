@@ -1,3 +1,4 @@
+import contextlib
 import traceback
 import urllib.parse
 
@@ -12,7 +13,23 @@ from .. import errhand
 from .. import util
 from .. import version
 
-core = fastapi.FastAPI(title="NPPS4", version="%d.%d.%d" % version.NPPS4_VERSION, docs_url="/main.php/api")
+from typing import AsyncContextManager, Callable
+
+# Async context managers entered when the server starts and exited (in reverse order) when it shuts down.
+lifespan_handlers: list[Callable[[], AsyncContextManager[None]]] = []
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: fastapi.FastAPI):
+    async with contextlib.AsyncExitStack() as stack:
+        for handler in lifespan_handlers:
+            await stack.enter_async_context(handler())
+        yield
+
+
+core = fastapi.FastAPI(
+    title="NPPS4", version="%d.%d.%d" % version.NPPS4_VERSION, docs_url="/main.php/api", lifespan=_lifespan
+)
 main = fastapi.APIRouter(prefix="/main.php")
 webview = fastapi.APIRouter(prefix="/webview.php", default_response_class=fastapi.responses.HTMLResponse)
 templates = fastapi.templating.Jinja2Templates("templates")
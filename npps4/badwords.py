@@ -0,0 +1,63 @@
+import collections.abc
+
+
+class BadwordMatcher:
+    """Aho-Corasick automaton which finds any of the badwords in a text in time linear to the text length."""
+
+    def __init__(self, badwords: collections.abc.Iterable[str]):
+        # State 0 is the root. Each state has its transitions, failure link, and whether a badword ends there.
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[bool] = [False]
+
+        for badword in badwords:
+            state = 0
+            for ch in badword:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(False)
+                state = next_state
+            self.output[state] = True
+
+        # Breadth-first so failure links of shallower states are ready first.
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail != 0 and ch not in self.goto[fail]:
+                    fail = self.fail[fail]
+                fail = self.goto[fail].get(ch, 0)
+                self.fail[next_state] = fail
+                self.output[next_state] = self.output[next_state] or self.output[fail]
+
+    def search(self, text: str):
+        """Check if any of the badwords is a substring of `text`."""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+
+        if output[0]:
+            # Empty badword
+            return True
+
+        state = 0
+        for ch in text:
+            while True:
+                next_state = goto[state].get(ch)
+                if next_state is not None:
+                    state = next_state
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+
+            if output[state]:
+                return True
+
+        return False
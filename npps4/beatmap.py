@@ -0,0 +1,120 @@
+import collections.abc
+import mmap
+import os
+import struct
+
+from typing import Literal, Protocol
+
+# Packed beatmap file layout (all little-endian):
+# * Header: magic (4 bytes), beatmap count (uint32)
+# * Index, for each beatmap: name length (uint16), name (UTF-8), first note (uint32), note count (uint32)
+# * Notes, NOTE_STRUCT each.
+MAGIC = b"NPB1"
+HEADER_STRUCT = struct.Struct("<4sI")
+INDEX_NAME_STRUCT = struct.Struct("<H")
+INDEX_RANGE_STRUCT = struct.Struct("<II")
+# timing_sec, notes_attribute, notes_level, effect, effect_value, position, speed, vanish
+NOTE_STRUCT = struct.Struct("<diiididB")
+
+type PackedNote = tuple[float, int, int, int, float, int, float, int]
+
+
+class Note(Protocol):
+    timing_sec: float
+    notes_attribute: int
+    notes_level: int
+    effect: int
+    effect_value: float
+    position: int
+    speed: float
+    vanish: Literal[0, 1, 2]
+
+
+def pack(beatmaps: collections.abc.Iterable[tuple[str, collections.abc.Iterable[Note]]]):
+    index: list[tuple[bytes, int, int]] = []
+    notes = bytearray()
+    note_count = 0
+
+    for name, beatmap in beatmaps:
+        start = note_count
+        for note in beatmap:
+            notes += NOTE_STRUCT.pack(
+                note.timing_sec,
+                note.notes_attribute,
+                note.notes_level,
+                note.effect,
+                note.effect_value,
+                note.position,
+                note.speed,
+                note.vanish,
+            )
+            note_count = note_count + 1
+        index.append((name.encode("utf-8"), start, note_count - start))
+
+    result = bytearray(HEADER_STRUCT.pack(MAGIC, len(index)))
+    for name_bytes, start, count in index:
+        result += INDEX_NAME_STRUCT.pack(len(name_bytes))
+        result += name_bytes
+        result += INDEX_RANGE_STRUCT.pack(start, count)
+
+    result += notes
+    return bytes(result)
+
+
+class PackedBeatmaps:
+    """Memory-mapped view of a packed beatmap file created by `pack`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._view = memoryview(self._mmap)
+        magic, count = HEADER_STRUCT.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a packed beatmap file")
+
+        offset = HEADER_STRUCT.size
+        self._index: dict[str, tuple[int, int]] = {}
+        for _ in range(count):
+            (name_length,) = INDEX_NAME_STRUCT.unpack_from(self._view, offset)
+            offset = offset + INDEX_NAME_STRUCT.size
+            name = str(self._view[offset : offset + name_length], "utf-8")
+            offset = offset + name_length
+            self._index[name] = INDEX_RANGE_STRUCT.unpack_from(self._view, offset)
+            offset = offset + INDEX_RANGE_STRUCT.size
+
+        self._notes_offset = offset
+
+    def __contains__(self, name: str):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get_view(self, name: str):
+        """Get the raw note data of the beatmap without copying, or None if the beatmap is not found."""
+        note_range = self._index.get(name)
+        if note_range is None:
+            return None
+
+        start = self._notes_offset + note_range[0] * NOTE_STRUCT.size
+        return self._view[start : start + note_range[1] * NOTE_STRUCT.size]
+
+    def get_notes(self, name: str) -> collections.abc.Iterator[PackedNote] | None:
+        view = self.get_view(name)
+        if view is None:
+            return None
+
+        return NOTE_STRUCT.iter_unpack(view)
+
+    def close(self):
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Note data views are still referenced somewhere. The mapping is closed once they're garbage collected.
+            pass
@@ -221,3 +221,123 @@ def get_session_expiry_time():
 def is_account_export_enabled():
     global CONFIG_DATA
     return CONFIG_DATA.iex.enable_export
+
+
+def is_stats_endpoints_enabled():
+    global CONFIG_DATA
+    return CONFIG_DATA.advanced.enable_stats_endpoints
+
+
+def get_master_data_cache_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.master_data_cache_size
+
+
+def get_master_data_version_check_interval():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.master_data_version_check_interval
+
+
+def use_master_data_snapshot():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.master_data_snapshot
+
+
+def use_master_data_inline_query():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.master_data_inline_query
+
+
+def get_master_data_inline_query_time_limit():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.master_data_inline_query_time_limit
+
+
+def get_live_notes_cache_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.live_notes_cache_size
+
+
+def get_response_cache_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.response_cache_size
+
+
+def get_response_cache_ttl():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.response_cache_ttl
+
+
+def is_response_cache_per_user():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.response_cache_per_user
+
+
+def get_replay_cache_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.replay_cache_size
+
+
+def get_replay_cache_ttl():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.replay_cache_ttl
+
+
+def get_signing_threads():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.signing_threads
+
+
+def get_signing_queue_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.signing_queue_size
+
+
+def get_session_cache_ttl():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.session_cache_ttl
+
+
+def get_response_compress_level():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.response_compress_level
+
+
+def get_response_compress_threshold():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.response_compress_threshold
+
+
+def get_response_compress_offload_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.performance.response_compress_offload_size
+
+
+def get_maintenance_batch_size():
+    global CONFIG_DATA
+    return CONFIG_DATA.maintenance.batch_size
+
+
+def get_incentive_cleanup_interval():
+    global CONFIG_DATA
+    return CONFIG_DATA.maintenance.incentive_cleanup_interval
+
+
+def get_session_cleanup_interval():
+    global CONFIG_DATA
+    return CONFIG_DATA.maintenance.session_cleanup_interval
+
+
+def get_session_access_flush_interval():
+    global CONFIG_DATA
+    return CONFIG_DATA.maintenance.session_access_flush_interval
+
+
+def get_response_cleanup_interval():
+    global CONFIG_DATA
+    return CONFIG_DATA.maintenance.response_cleanup_interval
+
+
+def get_wal_checkpoint_interval():
+    global CONFIG_DATA
+    return CONFIG_DATA.maintenance.wal_checkpoint_interval
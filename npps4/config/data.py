@@ -3,7 +3,7 @@ import re
 
 import pydantic
 
-from typing import Annotated
+from typing import Annotated, Literal
 
 _VERSION_TEST = re.compile(r"^\d+\.\d+$")
 
@@ -35,6 +35,16 @@ class _Main(pydantic.BaseModel):
 
 class _Database(pydantic.BaseModel):
     url: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    query_cache_size: int = 500
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size: int = -65536
+    sqlite_busy_timeout: int = 25000
 
 
 class _DownloadNone(pydantic.BaseModel):
@@ -76,6 +86,7 @@ class _Advanced(pydantic.BaseModel):
     application_key: Annotated[str, pydantic.AfterValidator(_test_length(32))] = "b6e6c940a93af2357ea3e0ace0b98afc"
     consumer_key: str = "lovelive_test"
     verify_xmc: bool = True
+    enable_stats_endpoints: bool = False
 
 
 class _ImportExport(pydantic.BaseModel):
@@ -84,6 +95,35 @@ class _ImportExport(pydantic.BaseModel):
     bypass_signature: bool = False
 
 
+class _Performance(pydantic.BaseModel):
+    master_data_cache_size: int = 65536
+    master_data_version_check_interval: int = 60
+    master_data_snapshot: bool = False
+    master_data_inline_query: bool = False
+    master_data_inline_query_time_limit: float = 0.005
+    live_notes_cache_size: int = 512
+    response_cache_size: int = 0
+    response_cache_ttl: int = 60
+    response_cache_per_user: bool = False
+    replay_cache_size: int = 0
+    replay_cache_ttl: int = 300
+    signing_threads: int = 4
+    signing_queue_size: int = 64
+    session_cache_ttl: int = 30
+    response_compress_level: int = 9
+    response_compress_threshold: int = 65536
+    response_compress_offload_size: int = 262144
+
+
+class _Maintenance(pydantic.BaseModel):
+    batch_size: int = 1000
+    incentive_cleanup_interval: int = 300
+    session_cleanup_interval: int = 300
+    session_access_flush_interval: int = 30
+    response_cleanup_interval: int = 3600
+    wal_checkpoint_interval: int = 600
+
+
 class ConfigData(pydantic.BaseModel):
     main: _Main
     database: _Database
@@ -91,6 +131,8 @@ class ConfigData(pydantic.BaseModel):
     game: _Game
     advanced: _Advanced
     iex: _ImportExport = pydantic.Field(default_factory=_ImportExport)
+    performance: _Performance = pydantic.Field(default_factory=_Performance)
+    maintenance: _Maintenance = pydantic.Field(default_factory=_Maintenance)
 
 
 __all__ = ["ConfigData"]
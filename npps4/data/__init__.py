@@ -1,9 +1,18 @@
+import asyncio
+import contextlib
 import dataclasses
+import hashlib
 import json
 import os
 import time
 
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
 from . import schema
+from .. import badwords
 from .. import util
 from ..system import item_model
 from ..config import config
@@ -11,9 +20,43 @@ from ..config import config
 from typing import Callable
 
 
+class SerialCodeIndex:
+    """Serial code lookup table.
+
+    Plaintext codes are looked up directly. Hashed codes are grouped by their salt, so each distinct salt is hashed
+    only once per lookup. If multiple codes match, the one listed first wins.
+    """
+
+    def __init__(self, serial_codes: list[schema.SerialCode]):
+        self.plain: dict[str, tuple[int, schema.SerialCode]] = {}
+        self.hashed: dict[bytes, dict[str, tuple[int, schema.SerialCode]]] = {}
+
+        for i, serial_code in enumerate(serial_codes):
+            match serial_code.serial_code:
+                case str():
+                    self.plain.setdefault(serial_code.serial_code, (i, serial_code))
+                case schema.SerialCodeHashed():
+                    digests = self.hashed.setdefault(serial_code.serial_code.salt, {})
+                    digests.setdefault(serial_code.serial_code.hash.lower(), (i, serial_code))
+
+    def find(self, input_code: str):
+        result = self.plain.get(input_code)
+        input_bytes = input_code.encode("utf-8")
+
+        for salt, digests in self.hashed.items():
+            digest = hashlib.sha256(salt + input_bytes, usedforsecurity=False).hexdigest()
+            found = digests.get(digest)
+            if found is not None and (result is None or found[0] < result[0]):
+                result = found
+
+        return None if result is None else result[1]
+
+
 @dataclasses.dataclass
 class ServerData:
     json_schema_link: str | None
+    # Declared before `badwords`, which shadows the module in the class body.
+    badword_matcher: badwords.BadwordMatcher
     badwords: list[str]
     achievement_reward: dict[int, list[item_model.BaseItem]]
     live_unit_drop_chance: schema.LiveUnitDropChance
@@ -22,7 +65,9 @@ class ServerData:
     live_effort_drops: dict[int, list[schema.BaseItemWithWeight]]
     secretbox_data: dict[int, schema.SecretboxData]
     serial_codes: list[schema.SerialCode]
+    serial_code_index: SerialCodeIndex
     sticker_shop: list[schema.StickerShop]
+    sticker_shop_index: dict[int, schema.StickerShop]
 
 
 def ensure_no_conflict[
@@ -40,45 +85,117 @@ def ensure_no_conflict[
 
 
 SERVER_DATA_PATH = config.get_server_data_path()
+# How long (in seconds) to wait for the file watcher to stop on shutdown before cancelling it.
+WATCH_STOP_TIMEOUT = 1
+# How often (in seconds) the server data file is checked for changes when watchfiles is not available.
+WATCH_POLL_INTERVAL = 2
 server_data: ServerData | None = None
 last_server_data_timestamp: int = 0
+# Called with newly loaded server data before it replaces the current one, to prepare data derived from it.
+reload_handlers: list[Callable[[ServerData], None]] = []
+_watching = False
+
+
+def load():
+    with open(SERVER_DATA_PATH, "r", encoding="utf-8", newline="") as f:
+        serialized_data = schema.SerializedServerData.model_validate(json.load(f))
+
+    sticker_shop = ensure_no_conflict(serialized_data.sticker_shop)
+    new_server_data = ServerData(
+        json_schema_link=serialized_data.json_schema_link,
+        badwords=serialized_data.badwords,
+        badword_matcher=badwords.BadwordMatcher(serialized_data.badwords),
+        achievement_reward=dict((k.achievement_id, k.rewards) for k in serialized_data.achievement_reward),
+        live_unit_drop_chance=serialized_data.live_unit_drop_chance,
+        common_live_unit_drops=serialized_data.common_live_unit_drops,
+        live_specific_live_unit_drops=dict(
+            (d.live_setting_id, d.drops) for d in serialized_data.live_specific_live_unit_drops
+        ),
+        live_effort_drops=dict((d.live_effort_point_box_spec_id, d.drops) for d in serialized_data.live_effort_drops),
+        secretbox_data={sb.secretbox_id: sb for sb in ensure_no_conflict(serialized_data.secretbox_data)},
+        serial_codes=serialized_data.serial_codes,
+        serial_code_index=SerialCodeIndex(serialized_data.serial_codes),
+        sticker_shop=sticker_shop,
+        sticker_shop_index={s.exchange_item_id: s for s in sticker_shop},
+    )
 
+    for handler in reload_handlers:
+        handler(new_server_data)
 
-def get():
+    return new_server_data
+
+
+def _reload():
     global server_data, last_server_data_timestamp
 
     stat = os.stat(SERVER_DATA_PATH)
     if server_data is None or stat.st_mtime_ns > last_server_data_timestamp:
         try:
-            with open(SERVER_DATA_PATH, "r", encoding="utf-8", newline="") as f:
-                serialized_data = schema.SerializedServerData.model_validate(json.load(f))
-                new_server_data = ServerData(
-                    json_schema_link=serialized_data.json_schema_link,
-                    badwords=serialized_data.badwords,
-                    achievement_reward=dict((k.achievement_id, k.rewards) for k in serialized_data.achievement_reward),
-                    live_unit_drop_chance=serialized_data.live_unit_drop_chance,
-                    common_live_unit_drops=serialized_data.common_live_unit_drops,
-                    live_specific_live_unit_drops=dict(
-                        (d.live_setting_id, d.drops) for d in serialized_data.live_specific_live_unit_drops
-                    ),
-                    live_effort_drops=dict(
-                        (d.live_effort_point_box_spec_id, d.drops) for d in serialized_data.live_effort_drops
-                    ),
-                    secretbox_data={sb.secretbox_id: sb for sb in ensure_no_conflict(serialized_data.secretbox_data)},
-                    serial_codes=serialized_data.serial_codes,
-                    sticker_shop=ensure_no_conflict(serialized_data.sticker_shop),
-                )
-                server_data = new_server_data
+            server_data = load()
         except Exception as e:
             if isinstance(e, KeyboardInterrupt) or server_data is None:
                 raise e from None
-            util.log("Cannot load new data, using old data for now", util.logging.ERROR, e)
+            util.log("Cannot load new data, using old data for now", severity=util.logging.ERROR, e=e)
         finally:
             last_server_data_timestamp = stat.st_mtime_ns
 
     return server_data
 
 
+def get():
+    if _watching and server_data is not None:
+        # The watcher reloads the data when the file changes.
+        return server_data
+
+    return _reload()
+
+
+async def _watch_changes(stop_event: asyncio.Event):
+    if watchfiles is None:
+        while not stop_event.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), WATCH_POLL_INTERVAL)
+            yield
+    else:
+        # Watch the directory as the file is replaced, not modified in-place, on update.
+        path = os.path.abspath(SERVER_DATA_PATH)
+        async for _ in watchfiles.awatch(
+            os.path.dirname(path), watch_filter=lambda _, changed: changed == path, stop_event=stop_event
+        ):
+            yield
+
+
+async def _watch(stop_event: asyncio.Event):
+    async for _ in _watch_changes(stop_event):
+        try:
+            # Parsing and building the indexes takes a while, so don't block requests.
+            await asyncio.to_thread(_reload)
+        except Exception as e:
+            util.log("Cannot check server data for changes", severity=util.logging.ERROR, e=e)
+
+
+@contextlib.asynccontextmanager
+async def watch():
+    """Reload the server data in background when the file changes, so `get` doesn't need to check it."""
+    global _watching
+
+    _reload()
+    stop_event = asyncio.Event()
+    watcher = asyncio.create_task(_watch(stop_event))
+    _watching = True
+    try:
+        yield
+    finally:
+        _watching = False
+        stop_event.set()
+        # The watchfiles thread checks the stop event every step. Cancelling the task would leave that thread running
+        # past the event loop, so give it a chance to stop by itself first.
+        await asyncio.wait((watcher,), timeout=WATCH_STOP_TIMEOUT)
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+
+
 def update():
     global last_server_data_timestamp
     server_data = get()  # ensure not None
@@ -113,5 +230,8 @@ def update():
         f.write(json_encoded)
     os.replace(temp_filename, SERVER_DATA_PATH)
 
+    server_data.badword_matcher = badwords.BadwordMatcher(server_data.badwords)
+    server_data.serial_code_index = SerialCodeIndex(server_data.serial_codes)
+    server_data.sticker_shop_index = {s.exchange_item_id: s for s in server_data.sticker_shop}
     server_data = dataclasses.replace(server_data)  # Create new copy
     last_server_data_timestamp = time.time_ns()
@@ -17,18 +17,25 @@ async def get_decrypted_row[
     return decrypt_row(session, obj)
 
 
+def decrypt_row_data(encryption_release_id: int, release_tag: str | None) -> dict[str, Any] | None:
+    key = release_key.get(encryption_release_id)
+    if key is None:
+        return None
+
+    jsondata = util.decrypt_aes(base64.b64decode(key), base64.b64decode(release_tag or ""))
+    return json.loads(jsondata)
+
+
 def decrypt_row[_T: common.MaybeEncrypted](session: sqlalchemy.ext.asyncio.AsyncSession, obj: _T | None) -> _T | None:
     if obj is not None and obj._encryption_release_id is not None:
-        key = release_key.get(obj._encryption_release_id)
+        data = decrypt_row_data(obj._encryption_release_id, obj.release_tag)
 
-        if key is None:
+        if data is None:
             return None
         else:
             session.expunge(obj)
 
             # Decrypt row
-            jsondata = util.decrypt_aes(base64.b64decode(key), base64.b64decode(obj.release_tag or ""))
-            data: dict[str, Any] = json.loads(jsondata)
             for k, v in data.items():
                 setattr(obj, k, v)
 
@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class FilterCategory(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="achievement")
+
+
+class FilterCategory(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `achievement_filter_category_m` (
         `achievement_filter_category_id` INTEGER NOT NULL,
@@ -31,7 +34,7 @@ class FilterCategory(common.GameDBBase, common.MaybeEncrypted):
     default_select_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class Achievement(common.GameDBBase, common.MaybeEncrypted):
+class Achievement(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `achievement_m` (
         `achievement_id` INTEGER NOT NULL,
@@ -104,7 +107,7 @@ class Achievement(common.GameDBBase, common.MaybeEncrypted):
     term_invisible_flag: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class Story(common.GameDBBase):
+class Story(Base):
     """```sql
     CREATE TABLE `achievement_story_m` (
         `achievement_id` INTEGER NOT NULL,
@@ -124,7 +127,7 @@ class Story(common.GameDBBase):
     __table_args__ = (sqlalchemy.PrimaryKeyConstraint(achievement_id, next_achievement_id),)
 
 
-class Category(common.GameDBBase, common.MaybeEncrypted):
+class Category(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `achievement_category_m` (
         `achievement_category_id` INTEGER NOT NULL,
@@ -144,7 +147,7 @@ class Category(common.GameDBBase, common.MaybeEncrypted):
     end_date: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class Tag(common.GameDBBase):
+class Tag(Base):
     """```sql
     CREATE TABLE `achievement_tag_m` (
         `achievement_id` INTEGER NOT NULL,
@@ -164,7 +167,7 @@ class Tag(common.GameDBBase):
     __table_args__ = (sqlalchemy.PrimaryKeyConstraint(achievement_id, achievement_category_id),)
 
 
-class UnitTypeGroup(common.GameDBBase):
+class UnitTypeGroup(Base):
     """```sql
         CREATE TABLE `achievement_unit_type_group_m` (
         `achievement_unit_type_group_id` INTEGER NOT NULL,
@@ -179,15 +182,3 @@ class UnitTypeGroup(common.GameDBBase):
     unit_type_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(common.IDInteger)
     rank: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
     __table_args__ = (sqlalchemy.PrimaryKeyConstraint(achievement_unit_type_group_id, unit_type_id),)
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('achievement')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
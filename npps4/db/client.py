@@ -0,0 +1,198 @@
+import contextlib
+import dataclasses
+import math
+import pathlib
+import sqlite3
+import time
+
+import sqlalchemy
+import sqlalchemy.event
+import sqlalchemy.exc
+import sqlalchemy.ext.asyncio
+import sqlalchemy.orm
+
+from ..config import config
+from ..download import download
+
+from typing import Any
+
+# Client databases, attached under their own name. The tables in `npps4.db.<name>` are qualified with that name.
+# SQLite can attach at most 10 databases by default.
+DATABASES = (
+    "achievement",
+    "effort",
+    "exchange",
+    "game_mater",
+    "item",
+    "live",
+    "museum",
+    "scenario",
+    "subscenario",
+    "unit",
+)
+DATABASE_PATHS = {name: download.get_db_path(name) for name in DATABASES}
+
+
+def _attach_databases(dbapi_connection: Any):
+    mmap_size = int(config.CONFIG_DATA.database.sqlite_mmap_size)
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, path in DATABASE_PATHS.items():
+            # The files don't change while the server runs (new client version is stored in new directory), so SQLite
+            # can skip locking them.
+            uri = pathlib.Path(path).absolute().as_uri() + "?mode=ro&immutable=1"
+            cursor.execute(f"ATTACH DATABASE ? AS {name}", (uri,))
+            cursor.execute(f"PRAGMA {name}.mmap_size={mmap_size}")
+    finally:
+        cursor.close()
+
+
+# The main database of each connection is a private, empty, in-memory database.
+engine = sqlalchemy.ext.asyncio.create_async_engine(
+    "sqlite+aiosqlite:///file::memory:?uri=true", connect_args={"check_same_thread": False}
+)
+sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
+
+
+@sqlalchemy.event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection: Any, connection_record: sqlalchemy.pool.ConnectionPoolEntry):
+    _attach_databases(dbapi_connection)
+
+
+def get_sessionmaker():
+    global sessionmaker
+    return sessionmaker
+
+
+# Amount of SQLite virtual machine instructions between the time limit checks of inline queries.
+PROGRESS_HANDLER_INTERVAL = 1000
+
+# Deadline (in `time.perf_counter` seconds) of the inline query currently running. Inline queries only run on the
+# event loop thread, so one at a time.
+_inline_deadline = math.inf
+
+
+def _check_inline_deadline():
+    # Non-zero return value interrupts the query.
+    return time.perf_counter() > _inline_deadline
+
+
+# Same databases opened with pysqlite, for queries which run directly on the event loop. Checking out a connection
+# must never wait (that would block the event loop), so the pool can grow as needed.
+sync_engine = sqlalchemy.create_engine(
+    "sqlite+pysqlite:///file::memory:?uri=true",
+    poolclass=sqlalchemy.QueuePool,
+    pool_size=config.CONFIG_DATA.database.pool_size,
+    max_overflow=-1,
+    connect_args={"check_same_thread": False},
+)
+
+
+@sqlalchemy.event.listens_for(sync_engine, "connect")
+def _on_sync_connect(dbapi_connection: Any, connection_record: sqlalchemy.pool.ConnectionPoolEntry):
+    _attach_databases(dbapi_connection)
+    dbapi_connection.set_progress_handler(_check_inline_deadline, PROGRESS_HANDLER_INTERVAL)
+
+
+@dataclasses.dataclass(kw_only=True)
+class InlineQueryStats:
+    queries: int
+    interrupted: int
+    total_time: float
+    max_time: float
+
+
+class _InlineQueryCounter:
+    def __init__(self):
+        self.queries = 0
+        self.interrupted = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add(self, duration: float, interrupted: bool):
+        self.queries = self.queries + 1
+        self.interrupted = self.interrupted + interrupted
+        self.total_time = self.total_time + duration
+        self.max_time = max(self.max_time, duration)
+
+    def stats(self):
+        return InlineQueryStats(
+            queries=self.queries, interrupted=self.interrupted, total_time=self.total_time, max_time=self.max_time
+        )
+
+
+_inline_counter = _InlineQueryCounter()
+
+
+def get_inline_query_stats():
+    return _inline_counter.stats()
+
+
+class _QueryInterrupted(Exception):
+    pass
+
+
+class InlineSession:
+    """Client database session which runs the queries synchronously, without leaving the event loop thread.
+
+    Only the part of `AsyncSession` used to query the client databases is implemented. Queries which take longer than
+    `time_limit` seconds are interrupted and run again with a regular `AsyncSession` in background thread.
+    """
+
+    __slots__ = ("time_limit", "_session", "_fallback")
+
+    def __init__(self, time_limit: float):
+        self.time_limit = time_limit
+        self._session = sqlalchemy.orm.Session(sync_engine)
+        self._fallback: sqlalchemy.ext.asyncio.AsyncSession | None = None
+
+    @property
+    def fallback(self):
+        if self._fallback is None:
+            self._fallback = sessionmaker()
+        return self._fallback
+
+    @contextlib.contextmanager
+    def _guard(self):
+        global _inline_deadline
+        start = time.perf_counter()
+        _inline_deadline = start + self.time_limit
+        interrupted = False
+
+        try:
+            yield
+        except sqlalchemy.exc.OperationalError as e:
+            if isinstance(e.orig, sqlite3.OperationalError) and str(e.orig) == "interrupted":
+                interrupted = True
+                raise _QueryInterrupted() from e
+            raise
+        finally:
+            _inline_deadline = math.inf
+            _inline_counter.add(time.perf_counter() - start, interrupted)
+
+    async def execute(self, statement: sqlalchemy.Executable, params: Any = None, **kwargs: Any):
+        try:
+            with self._guard():
+                # Fetch all rows now, while the time limit applies.
+                return self._session.execute(statement, params, **kwargs).freeze()()
+        except _QueryInterrupted:
+            return await self.fallback.execute(statement, params, **kwargs)
+
+    async def get[T](self, entity: type[T], ident: Any, **kwargs: Any) -> T | None:
+        try:
+            with self._guard():
+                return self._session.get(entity, ident, **kwargs)
+        except _QueryInterrupted:
+            return await self.fallback.get(entity, ident, **kwargs)
+
+    def expunge(self, instance: object):
+        # The instance may come from either session.
+        session = sqlalchemy.orm.object_session(instance)
+        if session is not None:
+            session.expunge(instance)
+
+    async def close(self):
+        self._session.close()
+        if self._fallback is not None:
+            await self._fallback.close()
+            self._fallback = None
@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class LiveEffortPointBoxSpec(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="effort")
+
+
+class LiveEffortPointBoxSpec(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `live_effort_point_box_spec_m` (
         `live_effort_point_box_spec_id` INTEGER NOT NULL,
@@ -47,15 +50,3 @@ class LiveEffortPointBoxSpec(common.GameDBBase, common.MaybeEncrypted):
     movie_name: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
     movie_name_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
     asset_se_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('effort')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
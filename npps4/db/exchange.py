@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class ExchangeFestivalPointUnit(common.GameDBBase):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="exchange")
+
+
+class ExchangeFestivalPointUnit(Base):
     """```sql
     CREATE TABLE `exchange_festival_point_unit_m` (
         `unit_id` INTEGER NOT NULL,
@@ -18,7 +21,7 @@ class ExchangeFestivalPointUnit(common.GameDBBase):
     unit_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
 
 
-class ExchangeNoPointUnit(common.GameDBBase):
+class ExchangeNoPointUnit(Base):
     """```sql
     CREATE TABLE `exchange_nopoint_unit_m` (
         `unit_id` INTEGER NOT NULL,
@@ -30,7 +33,7 @@ class ExchangeNoPointUnit(common.GameDBBase):
     unit_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
 
 
-class ExchangePoint(common.GameDBBase, common.MaybeEncrypted):
+class ExchangePoint(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `exchange_point_m` (
         `exchange_point_id` INTEGER NOT NULL,
@@ -71,15 +74,3 @@ class ExchangePoint(common.GameDBBase, common.MaybeEncrypted):
     sort: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
     start_date: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
     end_date: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('exchange')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
@@ -1,12 +1,16 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
 from ..download import download
 
 
-class GameSetting(common.GameDBBase):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="game_mater")
+
+
+class GameSetting(Base):
     """```sql
     CREATE TABLE `game_setting_m` (
         `game_setting_id` INTEGER NOT NULL,
@@ -112,7 +116,7 @@ class GameSetting(common.GameDBBase):
     exchange_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class SortCondition(common.GameDBBase):
+class SortCondition(Base):
     """```sql
     CREATE TABLE `sort_condition_m` (
         `sort_condition_id` INTEGER NOT NULL,
@@ -134,7 +138,7 @@ class SortCondition(common.GameDBBase):
     sort_label_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class AddType(common.GameDBBase, common.MaybeEncrypted):
+class AddType(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `add_type_m` (
         `add_type` INTEGER NOT NULL,
@@ -163,7 +167,7 @@ class AddType(common.GameDBBase, common.MaybeEncrypted):
     large_asset_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class Strings(common.GameDBBase):
+class Strings(Base):
     """```sql
     CREATE TABLE `strings_m` (
         `string_key` TEXT NOT NULL,
@@ -185,7 +189,9 @@ game_mater = download.get_db_path("game_mater")
 
 
 def load_client_setting():
-    sync_engine = sqlalchemy.create_engine(f"sqlite+pysqlite:///file:{game_mater}?mode=ro&uri=true")
+    sync_engine = sqlalchemy.create_engine(f"sqlite+pysqlite:///file:{game_mater}?mode=ro&uri=true").execution_options(
+        schema_translate_map={"game_mater": None}
+    )
     sync_sessionmaker = sqlalchemy.orm.sessionmaker(sync_engine)
     with sync_sessionmaker() as session:
         # Preload game_setting_m
@@ -207,14 +213,3 @@ def load_client_setting():
 
 
 GAME_SETTING, STRINGS = load_client_setting()
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{game_mater}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class KGItem(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="item")
+
+
+class KGItem(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `kg_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -53,7 +56,7 @@ class KGItem(common.GameDBBase, common.MaybeEncrypted):
     merchandise_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class Award(common.GameDBBase, common.MaybeEncrypted):
+class Award(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `award_m` (
         `award_id` INTEGER NOT NULL,
@@ -82,7 +85,7 @@ class Award(common.GameDBBase, common.MaybeEncrypted):
     di_asset_display_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class Background(common.GameDBBase, common.MaybeEncrypted):
+class Background(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `background_m` (
         `background_id` INTEGER NOT NULL,
@@ -117,7 +120,7 @@ class Background(common.GameDBBase, common.MaybeEncrypted):
 # TODO: background_flash_m
 
 
-class LiveSE(common.GameDBBase):
+class LiveSE(Base):
     """```sql
     CREATE TABLE `live_se_m` (
         `live_se_id` INTEGER NOT NULL,
@@ -142,7 +145,7 @@ class LiveSE(common.GameDBBase):
 # TODO: live_se_group_m
 
 
-class LiveNotesIcon(common.GameDBBase, common.MaybeEncrypted):
+class LiveNotesIcon(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `live_notes_icon_m` (
         `live_notes_icon_id` INTEGER NOT NULL,
@@ -164,7 +167,7 @@ class LiveNotesIcon(common.GameDBBase, common.MaybeEncrypted):
 # TODO: live_notes_icon_asset_m
 
 
-class RecoveryItem(common.GameDBBase, common.MaybeEncrypted):
+class RecoveryItem(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `recovery_item_m` (
         `recovery_item_id` INTEGER NOT NULL,
@@ -201,7 +204,7 @@ class RecoveryItem(common.GameDBBase, common.MaybeEncrypted):
     description_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class ChangeDelegateItem(common.GameDBBase):
+class ChangeDelegateItem(Base):
     """```sql
     CREATE TABLE `change_delegate_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -217,7 +220,7 @@ class ChangeDelegateItem(common.GameDBBase):
     rarity: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class ChangeDelegateItemAmount(common.GameDBBase):
+class ChangeDelegateItemAmount(Base):
     """```sql
     CREATE TABLE `change_delegate_item_amount_m` (
         `unit_rarity` INTEGER NOT NULL,
@@ -235,7 +238,7 @@ class ChangeDelegateItemAmount(common.GameDBBase):
     cost_game_coin_amount: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class BuffItem(common.GameDBBase):
+class BuffItem(Base):
     """```sql
     CREATE TABLE `buff_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -259,7 +262,7 @@ class BuffItem(common.GameDBBase):
     event_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class UnitEnhanceItem(common.GameDBBase):
+class UnitEnhanceItem(Base):
     """```sql
     CREATE TABLE `unit_enhance_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -279,7 +282,7 @@ class UnitEnhanceItem(common.GameDBBase):
     enhance_amount: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class LotteryTicket(common.GameDBBase):
+class LotteryTicket(Base):
     """```sql
     CREATE TABLE `lottery_ticket_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -293,7 +296,7 @@ class LotteryTicket(common.GameDBBase):
     lottery_ticket_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitReinforceItem(common.GameDBBase):
+class UnitReinforceItem(Base):
     """```sql
     CREATE TABLE `unit_reinforce_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -311,7 +314,7 @@ class UnitReinforceItem(common.GameDBBase):
     event_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class UnitReinforceItemTargetUnit(common.GameDBBase):
+class UnitReinforceItemTargetUnit(Base):
     """```sql
     CREATE TABLE `unit_reinforce_item_target_unit_m` (
         `item_id` INTEGER NOT NULL,
@@ -325,7 +328,7 @@ class UnitReinforceItemTargetUnit(common.GameDBBase):
     unit_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
 
 
-class ItemExchange(common.GameDBBase):
+class ItemExchange(Base):
     """```sql
     CREATE TABLE `item_exchange_m` (
         `item_id` INTEGER NOT NULL,
@@ -343,7 +346,7 @@ class ItemExchange(common.GameDBBase):
     game_coin_amount: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UserRankUpItem(common.GameDBBase):
+class UserRankUpItem(Base):
     """```sql
     CREATE TABLE `user_rank_up_item_m` (
         `item_id` INTEGER NOT NULL,
@@ -359,7 +362,7 @@ class UserRankUpItem(common.GameDBBase):
     use_limit_rank_min: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class BuffItemUseLimitTime(common.GameDBBase):
+class BuffItemUseLimitTime(Base):
     """```sql
     CREATE TABLE `buff_item_use_limit_time_m` (
         `buff_item_use_limit_time_id` INTEGER NOT NULL,
@@ -375,7 +378,7 @@ class BuffItemUseLimitTime(common.GameDBBase):
     end_time: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
 
 
-class ItemExpire(common.GameDBBase):
+class ItemExpire(Base):
     """```sql
     CREATE TABLE `item_expire_m` (
         `add_type` INTEGER NOT NULL,
@@ -391,7 +394,7 @@ class ItemExpire(common.GameDBBase):
     expire_date: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
 
 
-class Memories(common.GameDBBase, common.MaybeEncrypted):
+class Memories(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `memories_m` (
         `memories_id` INTEGER NOT NULL,
@@ -408,15 +411,3 @@ class Memories(common.GameDBBase, common.MaybeEncrypted):
     img_asset: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
     background_shader_param_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
     background_flash_param_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('item')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class LiveTrack(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="live")
+
+
+class LiveTrack(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `live_track_m` (
         `live_track_id` INTEGER NOT NULL,
@@ -38,7 +41,7 @@ class LiveTrack(common.GameDBBase, common.MaybeEncrypted):
     unit_type_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class LiveSetting(common.GameDBBase, common.MaybeEncrypted):
+class LiveSetting(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `live_setting_m` (
         `live_setting_id` INTEGER NOT NULL,
@@ -110,7 +113,7 @@ class CommonLive:
     s_rank_complete: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class NormalLive(common.GameDBBase, CommonLive, Live):
+class NormalLive(Base, CommonLive, Live):
     """```sql
     CREATE TABLE `normal_live_m` (
         `live_difficulty_id` INTEGER NOT NULL,
@@ -130,7 +133,7 @@ class NormalLive(common.GameDBBase, CommonLive, Live):
     default_unlocked_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class SpecialLive(common.GameDBBase, CommonLive, Live):
+class SpecialLive(Base, CommonLive, Live):
     """```sql
     CREATE TABLE `special_live_m` (
         `live_difficulty_id` INTEGER NOT NULL,
@@ -154,7 +157,7 @@ class SpecialLive(common.GameDBBase, CommonLive, Live):
     exclude_live_bonus_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class FreeLive(common.GameDBBase, Live):
+class FreeLive(Base, Live):
     """```sql
     CREATE TABLE `free_live_m` (
         `live_difficulty_id` INTEGER NOT NULL,
@@ -168,7 +171,7 @@ class FreeLive(common.GameDBBase, Live):
     random_flag: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class LiveCombo(common.GameDBBase):
+class LiveCombo(Base):
     """```sql
     CREATE TABLE `live_combo_m` (
         `combo_cnt` INTEGER NOT NULL,
@@ -184,7 +187,7 @@ class LiveCombo(common.GameDBBase):
     add_love_cnt: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class LiveUnitRewardLot(common.GameDBBase):
+class LiveUnitRewardLot(Base):
     """```sql
     CREATE TABLE `live_unit_reward_lot_m` (
         `live_unit_reward_lot_id` INTEGER NOT NULL,
@@ -216,7 +219,7 @@ class CommonGoalReward:
     item_option: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class LiveGoalRewardCommon(common.GameDBBase, CommonGoalReward):
+class LiveGoalRewardCommon(Base, CommonGoalReward):
     """```sql
     CREATE TABLE `live_goal_reward_common_m` (
         `live_goal_reward_common_id` INTEGER NOT NULL,
@@ -239,7 +242,7 @@ class LiveGoalRewardCommon(common.GameDBBase, CommonGoalReward):
     difficulty: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class LiveGoalReward(common.GameDBBase, CommonGoalReward):
+class LiveGoalReward(Base, CommonGoalReward):
     """```sql
     CREATE TABLE `live_goal_reward_m` (
         `live_goal_reward_id` INTEGER NOT NULL,
@@ -260,7 +263,7 @@ class LiveGoalReward(common.GameDBBase, CommonGoalReward):
     live_difficulty_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(index=True)
 
 
-class LiveNoteScoreFactor(common.GameDBBase):
+class LiveNoteScoreFactor(Base):
     """```sql
     CREATE TABLE `live_note_score_factor_m` (
         `effect_id` INTEGER NOT NULL,
@@ -276,7 +279,7 @@ class LiveNoteScoreFactor(common.GameDBBase):
     score_factor: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
 
 
-class LiveCutinBrightness(common.GameDBBase):
+class LiveCutinBrightness(Base):
     """```sql
     CREATE TABLE `live_cutin_brightness_m` (
         `live_cutin_brightness_id` INTEGER NOT NULL,
@@ -290,7 +293,7 @@ class LiveCutinBrightness(common.GameDBBase):
     brightness: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class TrainingMode(common.GameDBBase):
+class TrainingMode(Base):
     """```sql
     CREATE TABLE `training_mode_m` (
         `training_mode_id` INTEGER NOT NULL,
@@ -306,7 +309,7 @@ class TrainingMode(common.GameDBBase):
     start_date: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
 
 
-class LiveTime(common.GameDBBase):
+class LiveTime(Base):
     """```sql
     CREATE TABLE `live_time_m` (
         `live_track_id` INTEGER NOT NULL,
@@ -322,7 +325,7 @@ class LiveTime(common.GameDBBase):
     live_time: sqlalchemy.orm.Mapped[float] = sqlalchemy.orm.mapped_column()
 
 
-class LiveSkillIcon(common.GameDBBase, common.MaybeEncrypted):
+class LiveSkillIcon(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `live_skill_icon_m` (
         `skill_effect_type` INTEGER NOT NULL,
@@ -341,7 +344,7 @@ class LiveSkillIcon(common.GameDBBase, common.MaybeEncrypted):
     icon_order: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class SpecialLiveRotation(common.GameDBBase):
+class SpecialLiveRotation(Base):
     """```sql
     CREATE TABLE `special_live_rotation_m` (
         `rotation_group_id` INTEGER NOT NULL,
@@ -355,15 +358,3 @@ class SpecialLiveRotation(common.GameDBBase):
     rotation_group_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
     live_difficulty_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
     base_date: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('live')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
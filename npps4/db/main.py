@@ -1,8 +1,10 @@
 import base64
+import dataclasses
 import hashlib
 import hmac
 
 import sqlalchemy
+import sqlalchemy.event
 import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
@@ -12,6 +14,8 @@ from .. import util
 from ..config import config
 from ..system import core
 
+from typing import Any, Callable
+
 SALT_SIZE = 16
 
 
@@ -254,6 +258,11 @@ class Incentive(common.Base, kw_only=True):
     unit_rarity: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column(default=None, index=True)
     unit_attribute: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column(default=None, index=True)
 
+    __table_args__ = (
+        sqlalchemy.Index("ix_incentive_user_id_add_type_item_id", user_id, add_type, item_id),
+        sqlalchemy.Index("ix_incentive_user_id_expire_date_insert_date", user_id, expire_date, insert_date),
+    )
+
     def get_message(self, language: idoltype.Language = idoltype.Language.en):
         if language == idoltype.Language.jp:
             return self.message_jp
@@ -425,10 +434,78 @@ class ExchangeItemLimit(common.Base, kw_only=True):
     __table_args__ = (sqlalchemy.UniqueConstraint(user_id, exchange_item_id),)
 
 
-engine = sqlalchemy.ext.asyncio.create_async_engine(config.get_database_url())
+def _get_engine_options(url: sqlalchemy.URL, /):
+    database_config = config.CONFIG_DATA.database
+    options: dict[str, Any] = {
+        "pool_recycle": database_config.pool_recycle,
+        "pool_pre_ping": database_config.pool_pre_ping,
+        "query_cache_size": database_config.query_cache_size,
+    }
+
+    # In-memory SQLite database uses single connection pool which can't be sized.
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options["pool_size"] = database_config.pool_size
+        options["max_overflow"] = database_config.max_overflow
+        options["pool_timeout"] = database_config.pool_timeout
+
+    return options
+
+
+def _setup_sqlite_connection(dbapi_connection: Any):
+    database_config = config.CONFIG_DATA.database
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={database_config.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(database_config.sqlite_busy_timeout)}")
+        cursor.execute(f"PRAGMA mmap_size={int(database_config.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(database_config.sqlite_cache_size)}")
+        # Checkpoints are mostly done by the maintenance task, if it runs. Otherwise keep SQLite's default so the
+        # write-ahead log doesn't grow unbounded (e.g. in scripts).
+        if config.get_wal_checkpoint_interval() > 0 and not config.is_script_mode():
+            cursor.execute("PRAGMA wal_autocheckpoint=100000")
+    finally:
+        cursor.close()
+
+
+# Settings applied once to each new connection of the pool, by dialect name.
+CONNECT_HOOKS: dict[str, Callable[[Any], None]] = {"sqlite": _setup_sqlite_connection}
+
+_url = sqlalchemy.make_url(config.get_database_url())
+engine = sqlalchemy.ext.asyncio.create_async_engine(_url, **_get_engine_options(_url))
 sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
 
 
+@sqlalchemy.event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection: Any, connection_record: sqlalchemy.pool.ConnectionPoolEntry):
+    hook = CONNECT_HOOKS.get(engine.dialect.name)
+    if hook is not None:
+        hook(dbapi_connection)
+
+
+@dataclasses.dataclass(kw_only=True)
+class PoolStats:
+    pool: str
+    size: int | None
+    checked_in: int | None
+    checked_out: int | None
+    overflow: int | None
+
+
+def get_pool_stats():
+    pool = engine.pool
+    if isinstance(pool, sqlalchemy.QueuePool):
+        return PoolStats(
+            pool=type(pool).__name__,
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+
+    return PoolStats(pool=type(pool).__name__, size=None, checked_in=None, checked_out=None, overflow=None)
+
+
 def get_sessionmaker():
     global sessionmaker
     return sessionmaker
@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class MuseumContents(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="museum")
+
+
+class MuseumContents(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `museum_contents_m` (
         `museum_contents_id` INTEGER NOT NULL,
@@ -45,15 +48,3 @@ class MuseumContents(common.GameDBBase, common.MaybeEncrypted):
     pure_buff: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
     cool_buff: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
     sort_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('museum')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class Scenario(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="scenario")
+
+
+class Scenario(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `scenario_m` (
         `scenario_id` INTEGER NOT NULL,
@@ -37,7 +40,7 @@ class Scenario(common.GameDBBase, common.MaybeEncrypted):
     asset_bgm_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class Chapter(common.GameDBBase, common.MaybeEncrypted):
+class Chapter(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `scenario_chapter_m` (
         `scenario_chapter_id` INTEGER NOT NULL,
@@ -66,14 +69,3 @@ class Chapter(common.GameDBBase, common.MaybeEncrypted):
     type: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
     sort: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
     member_category: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('scenario')}?mode=ro&uri=true",
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
@@ -0,0 +1,197 @@
+import asyncio
+import collections.abc
+import contextlib
+import dataclasses
+
+import sqlalchemy
+import sqlalchemy.orm
+
+from . import achievement
+from . import common
+from . import decrypt_row_data
+from . import live
+from . import unit
+from .. import util
+from ..config import config
+from ..download import download
+
+from typing import Any
+
+
+def _load_table[T: common.GameDBBase](session: sqlalchemy.orm.Session, cls: type[T]) -> list[T]:
+    result: list[T] = []
+
+    for row in session.scalars(sqlalchemy.select(cls)):
+        if isinstance(row, common.MaybeEncrypted) and row._encryption_release_id is not None:
+            decrypted = decrypt_row_data(row._encryption_release_id, row.release_tag)
+            if decrypted is None:
+                # Release key is not available. Treat it as non-existent, same as decrypt_row.
+                continue
+
+            # Same as decrypt_row. Detach it first so the decrypted values are never written back.
+            session.expunge(row)
+            for k, v in decrypted.items():
+                setattr(row, k, v)
+            row.release_tag = None
+            row._encryption_release_id = None
+
+        result.append(row)
+
+    return result
+
+
+def _group_by[T](rows: list[T], key: str, sort_key: str | None = None) -> dict[Any, list[T]]:
+    grouped: dict[Any, list[T]] = {}
+
+    for row in rows:
+        grouped.setdefault(getattr(row, key), []).append(row)
+
+    if sort_key is not None:
+        for v in grouped.values():
+            v.sort(key=lambda r: getattr(r, sort_key))
+
+    return grouped
+
+
+def _index_by[T](rows: list[T], key: str) -> dict[Any, T]:
+    return {getattr(row, key): row for row in rows}
+
+
+@dataclasses.dataclass(kw_only=True)
+class MasterDataSnapshot:
+    """Detached rows of the client databases, indexed the way the system layer looks them up.
+
+    The rows are shared by all requests and must be treated as read-only."""
+
+    unit_info: dict[int, unit.Unit]
+    unit_by_number: dict[int, unit.Unit]
+    unit_rarity: dict[int, unit.Rarity]
+    unit_level_up_pattern: dict[int, list[unit.UnitLevelUpPattern]]
+    unit_level_limit_pattern: dict[int, list[unit.LevelLimitPattern]]
+    unit_skill: dict[int, unit.UnitSkill]
+    unit_skill_level_up_pattern: dict[int, list[unit.UnitSkillLevelUpPattern]]
+    live_setting: dict[int, live.LiveSetting]
+    live_setting_ids_by_track: dict[int, list[int]]
+    normal_live: dict[int, live.NormalLive]
+    special_live: dict[int, live.SpecialLive]
+    live_goal_reward: dict[int, list[live.LiveGoalReward]]
+    achievement_info: dict[int, achievement.Achievement]
+    achievement_by_type: dict[int, list[achievement.Achievement]]
+    next_achievement_ids: dict[int, list[int]]
+
+
+@contextlib.contextmanager
+def _open_session(name: str):
+    sync_engine = sqlalchemy.create_engine(f"sqlite+pysqlite:///file:{download.get_db_path(name)}?mode=ro&uri=true")
+    try:
+        # Tables are qualified with the name the database is attached as, but here the database is opened directly.
+        with sqlalchemy.orm.Session(sync_engine.execution_options(schema_translate_map={name: None})) as session:
+            yield session
+    finally:
+        sync_engine.dispose()
+
+
+def build():
+    with _open_session("unit") as session:
+        units = _load_table(session, unit.Unit)
+        unit_rarities = _load_table(session, unit.Rarity)
+        unit_level_up_patterns = _load_table(session, unit.UnitLevelUpPattern)
+        unit_level_limit_patterns = _load_table(session, unit.LevelLimitPattern)
+        unit_skills = _load_table(session, unit.UnitSkill)
+        unit_skill_level_up_patterns = _load_table(session, unit.UnitSkillLevelUpPattern)
+
+    with _open_session("live") as session:
+        live_settings = _load_table(session, live.LiveSetting)
+        normal_lives = _load_table(session, live.NormalLive)
+        special_lives = _load_table(session, live.SpecialLive)
+        live_goal_rewards = _load_table(session, live.LiveGoalReward)
+
+    with _open_session("achievement") as session:
+        achievements = _load_table(session, achievement.Achievement)
+        achievement_stories = _load_table(session, achievement.Story)
+
+    return MasterDataSnapshot(
+        unit_info=_index_by(units, "unit_id"),
+        unit_by_number=_index_by(units, "unit_number"),
+        unit_rarity=_index_by(unit_rarities, "rarity"),
+        unit_level_up_pattern=_group_by(unit_level_up_patterns, "unit_level_up_pattern_id", "unit_level"),
+        unit_level_limit_pattern=_group_by(unit_level_limit_patterns, "unit_level_limit_id", "unit_level"),
+        unit_skill=_index_by(unit_skills, "unit_skill_id"),
+        unit_skill_level_up_pattern=_group_by(
+            unit_skill_level_up_patterns, "unit_skill_level_up_pattern_id", "skill_level"
+        ),
+        live_setting=_index_by(live_settings, "live_setting_id"),
+        live_setting_ids_by_track={
+            k: [ls.live_setting_id for ls in v] for k, v in _group_by(live_settings, "live_track_id").items()
+        },
+        normal_live=_index_by(normal_lives, "live_difficulty_id"),
+        special_live=_index_by(special_lives, "live_difficulty_id"),
+        live_goal_reward=_group_by(live_goal_rewards, "live_difficulty_id"),
+        achievement_info=_index_by(achievements, "achievement_id"),
+        achievement_by_type=_group_by(achievements, "achievement_type"),
+        next_achievement_ids={
+            k: [s.next_achievement_id for s in v] for k, v in _group_by(achievement_stories, "achievement_id").items()
+        },
+    )
+
+
+_snapshot: MasterDataSnapshot | None = None
+# Master data version the snapshot is built from.
+_snapshot_version: collections.abc.Hashable = None
+# Returns the current master data version. Set by `init`.
+_get_version: collections.abc.Callable[[], collections.abc.Hashable] | None = None
+_rebuild_task: asyncio.Task[None] | None = None
+
+
+def _swap(master_snapshot: MasterDataSnapshot | None, version: collections.abc.Hashable):
+    global _snapshot, _snapshot_version
+    _snapshot, _snapshot_version = master_snapshot, version
+
+
+async def _rebuild(version: collections.abc.Hashable):
+    global _rebuild_task
+
+    try:
+        _swap(await asyncio.to_thread(build), version)
+        util.log("Master data snapshot rebuilt", version, severity=util.logging.INFO)
+    except Exception as e:
+        # Lookups fall back to the database until the version changes again.
+        util.log("Cannot rebuild master data snapshot", version, severity=util.logging.ERROR, e=e)
+        _swap(None, version)
+    finally:
+        _rebuild_task = None
+
+
+def init(get_version: collections.abc.Callable[[], collections.abc.Hashable], /):
+    """Build the master data snapshot if it's enabled.
+
+    `get_version` must return the current master data version. The snapshot is rebuilt in the background when it
+    changes, so the previous snapshot may still be served until the rebuild is finished."""
+    global _get_version
+    _get_version = get_version
+
+    if config.use_master_data_snapshot():
+        version = get_version()
+        _swap(build(), version)
+        util.log("Master data snapshot built", version, severity=util.logging.INFO)
+
+
+def get():
+    """Get the master data snapshot, or None if it's disabled or not built."""
+    global _rebuild_task
+
+    if not config.use_master_data_snapshot():
+        return None
+
+    if _get_version is not None and _rebuild_task is None:
+        version = _get_version()
+        if version != _snapshot_version:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Not in the event loop (e.g. scripts), so build it in place.
+                _swap(build(), version)
+            else:
+                _rebuild_task = loop.create_task(_rebuild(version))
+
+    return _snapshot
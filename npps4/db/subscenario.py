@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class SubScenario(common.GameDBBase, common.MaybeEncrypted):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="subscenario")
+
+
+class SubScenario(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `subscenario_m` (
         `subscenario_id` INTEGER NOT NULL,
@@ -27,15 +30,3 @@ class SubScenario(common.GameDBBase, common.MaybeEncrypted):
     title_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
     asset_bgm_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
     scenario_char_asset_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('subscenario')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
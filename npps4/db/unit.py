@@ -1,12 +1,15 @@
 import sqlalchemy
-import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 from . import common
-from ..download import download
 
 
-class UnitAttribute(common.GameDBBase):
+class Base(common.GameDBBase):
+    __abstract__ = True
+    metadata = sqlalchemy.MetaData(schema="unit")
+
+
+class UnitAttribute(Base):
     """```sql
     CREATE TABLE `unit_attribute_m` (
         `attribute_id` INTEGER NOT NULL,
@@ -22,7 +25,7 @@ class UnitAttribute(common.GameDBBase):
     name_en: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
 
 
-class UnitType(common.GameDBBase, common.MaybeEncrypted):
+class UnitType(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_type_m` (
         `unit_type_id` INTEGER NOT NULL,
@@ -104,7 +107,7 @@ class UnitType(common.GameDBBase, common.MaybeEncrypted):
     cv_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class Unit(common.GameDBBase, common.MaybeEncrypted):
+class Unit(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_m` (
         `unit_id` INTEGER NOT NULL,
@@ -181,7 +184,7 @@ class Unit(common.GameDBBase, common.MaybeEncrypted):
     sub_unit_type_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class MemberTag(common.GameDBBase, common.MaybeEncrypted):
+class MemberTag(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `member_tag_m` (
         `member_tag_id` INTEGER NOT NULL,
@@ -206,7 +209,7 @@ class MemberTag(common.GameDBBase, common.MaybeEncrypted):
     num_of_members: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column()
 
 
-class Rarity(common.GameDBBase):
+class Rarity(Base):
     """```sql
     CREATE TABLE `unit_rarity_m` (
         `rarity` INTEGER NOT NULL,
@@ -233,7 +236,7 @@ class Rarity(common.GameDBBase):
     costume_level_limit: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitTypeMemberTag(common.GameDBBase):
+class UnitTypeMemberTag(Base):
     """```sql
     CREATE TABLE `unit_type_member_tag_m` (
         `unit_type_id` INTEGER NOT NULL,
@@ -247,7 +250,7 @@ class UnitTypeMemberTag(common.GameDBBase):
     member_tag_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
 
 
-class UnitMemberTag(common.GameDBBase):
+class UnitMemberTag(Base):
     """```sql
     CREATE TABLE `unit_member_tag_m` (
         `unit_id` INTEGER NOT NULL,
@@ -261,7 +264,7 @@ class UnitMemberTag(common.GameDBBase):
     member_tag_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
 
 
-class UnitLevelUpPattern(common.GameDBBase):
+class UnitLevelUpPattern(Base):
     """```sql
     CREATE TABLE `unit_level_up_pattern_m` (
         `unit_level_up_pattern_id` INTEGER NOT NULL,
@@ -302,7 +305,7 @@ class _UnitFunctionVoiceCommon:
     function_type: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitBaseFunctionVoice(common.GameDBBase, _UnitVoiceCommon, _UnitFunctionVoiceCommon):
+class UnitBaseFunctionVoice(Base, _UnitVoiceCommon, _UnitFunctionVoiceCommon):
     """```sql
     CREATE TABLE `unit_base_function_voice_m` (
         `unit_base_function_voice_id` INTEGER NOT NULL,
@@ -321,7 +324,7 @@ class UnitBaseFunctionVoice(common.GameDBBase, _UnitVoiceCommon, _UnitFunctionVo
     unit_type_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitFunctionVoice(common.GameDBBase, _UnitVoiceCommon, _UnitFunctionVoiceCommon):
+class UnitFunctionVoice(Base, _UnitVoiceCommon, _UnitFunctionVoiceCommon):
     """```sql
     CREATE TABLE `unit_function_voice_m` (
         `unit_function_voice_id` INTEGER NOT NULL,
@@ -340,7 +343,7 @@ class UnitFunctionVoice(common.GameDBBase, _UnitVoiceCommon, _UnitFunctionVoiceC
     unit_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitBaseRandomVoice(common.GameDBBase, _UnitVoiceCommon):
+class UnitBaseRandomVoice(Base, _UnitVoiceCommon):
     """```sql
     CREATE TABLE `unit_base_random_voice_m` (
         `unit_base_random_voice_id` INTEGER NOT NULL,
@@ -357,7 +360,7 @@ class UnitBaseRandomVoice(common.GameDBBase, _UnitVoiceCommon):
     unit_type_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitRandomVoice(common.GameDBBase, _UnitVoiceCommon):
+class UnitRandomVoice(Base, _UnitVoiceCommon):
     """```sql
     CREATE TABLE `unit_random_voice_m` (
         `unit_random_voice_id` INTEGER NOT NULL,
@@ -381,7 +384,7 @@ class _UnitTouchVoiceCommon:
     to_y: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitBaseTouchVoice(common.GameDBBase, _UnitTouchVoiceCommon, _UnitVoiceCommon):
+class UnitBaseTouchVoice(Base, _UnitTouchVoiceCommon, _UnitVoiceCommon):
     """```sql
     CREATE TABLE `unit_base_touch_voice_m` (
         `unit_base_touch_voice_id` INTEGER NOT NULL,
@@ -404,7 +407,7 @@ class UnitBaseTouchVoice(common.GameDBBase, _UnitTouchVoiceCommon, _UnitVoiceCom
     min_rarity: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitTouchVoice(common.GameDBBase, _UnitTouchVoiceCommon, _UnitVoiceCommon):
+class UnitTouchVoice(Base, _UnitTouchVoiceCommon, _UnitVoiceCommon):
     """```sql
     CREATE TABLE `unit_touch_voice_m` (
         `unit_touch_voice_id` INTEGER NOT NULL,
@@ -431,7 +434,7 @@ class UnitTouchVoice(common.GameDBBase, _UnitTouchVoiceCommon, _UnitVoiceCommon)
 # TODO: unit_birthday_voice_m
 
 
-class UnitSkill(common.GameDBBase, common.MaybeEncrypted):
+class UnitSkill(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_skill_m` (
         `unit_skill_id` INTEGER NOT NULL,
@@ -466,7 +469,7 @@ class UnitSkill(common.GameDBBase, common.MaybeEncrypted):
     string_key_long_description: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class UnitSkillLevelUpPattern(common.GameDBBase):
+class UnitSkillLevelUpPattern(Base):
     """```sql
     CREATE TABLE `unit_skill_level_up_pattern_m` (
         `unit_skill_level_up_pattern_id` INTEGER NOT NULL,
@@ -482,7 +485,7 @@ class UnitSkillLevelUpPattern(common.GameDBBase):
     next_exp: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class UnitSkillLevel(common.GameDBBase, common.MaybeEncrypted):
+class UnitSkillLevel(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_skill_level_m` (
         `unit_skill_id` INTEGER NOT NULL,
@@ -515,7 +518,7 @@ class UnitSkillLevel(common.GameDBBase, common.MaybeEncrypted):
     grant_exp: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class AlbumSeries(common.GameDBBase, common.MaybeEncrypted):
+class AlbumSeries(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `album_series_m` (
         `album_series_id` INTEGER NOT NULL,
@@ -540,7 +543,7 @@ class AlbumSeries(common.GameDBBase, common.MaybeEncrypted):
     layout_type: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class RemovableSkill(common.GameDBBase, common.MaybeEncrypted):
+class RemovableSkill(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_removable_skill_m` (
         `unit_removable_skill_id` INTEGER NOT NULL,
@@ -605,7 +608,7 @@ class RemovableSkill(common.GameDBBase, common.MaybeEncrypted):
     selling_price: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class LeaderSkill(common.GameDBBase, common.MaybeEncrypted):
+class LeaderSkill(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_leader_skill_m` (
         `unit_leader_skill_id` INTEGER NOT NULL,
@@ -624,7 +627,7 @@ class LeaderSkill(common.GameDBBase, common.MaybeEncrypted):
     name_string_key: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
 
 
-class ExtraLeaderSkill(common.GameDBBase):
+class ExtraLeaderSkill(Base):
     """```sql
     CREATE TABLE `unit_leader_skill_extra_m` (
         `unit_leader_skill_id` INTEGER NOT NULL,
@@ -642,7 +645,7 @@ class ExtraLeaderSkill(common.GameDBBase):
     effect_value: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class LevelLimitPattern(common.GameDBBase):
+class LevelLimitPattern(Base):
     """```sql
     CREATE TABLE `unit_level_limit_pattern_m` (
         `unit_level_limit_id` INTEGER NOT NULL,
@@ -672,7 +675,7 @@ class LevelLimitPattern(common.GameDBBase):
     sale_price: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column()
 
 
-class SignAsset(common.GameDBBase, common.MaybeEncrypted):
+class SignAsset(Base, common.MaybeEncrypted):
     """```sql
     CREATE TABLE `unit_sign_asset_m` (
         `unit_id` INTEGER NOT NULL,
@@ -695,15 +698,3 @@ class SignAsset(common.GameDBBase, common.MaybeEncrypted):
     normal_icon_asset_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
     rank_max_icon_asset: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column()
     rank_max_icon_asset_en: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column()
-
-
-engine = sqlalchemy.ext.asyncio.create_async_engine(
-    f"sqlite+aiosqlite:///file:{download.get_db_path('unit')}?mode=ro&uri=true",
-    connect_args={"check_same_thread": False},
-)
-sessionmaker = sqlalchemy.ext.asyncio.async_sessionmaker(engine)
-
-
-def get_sessionmaker():
-    global sessionmaker
-    return sessionmaker
@@ -62,7 +62,7 @@ async def album_albumall(context: idol.SchoolIdolUserParams) -> AlbumAllResponse
     return AlbumAllResponse.model_validate([album_to_response(a) for a in all_album])
 
 
-@idol.register("album", "seriesAll")
+@idol.register("album", "seriesAll", cache_tags=())
 async def album_seriesall(context: idol.SchoolIdolUserParams) -> AlbumSeriesAllResponse:
     current_user = await user.get_current(context)
     all_album = await album.all(context, current_user)
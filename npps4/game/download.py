@@ -74,7 +74,7 @@ class DownloadUpdateResponse(pydantic.RootModel[list[DownloadUpdateInfo]]):
     pass
 
 
-@idol.register("download", "update", check_version=False, batchable=False)
+@idol.register("download", "update", check_version=False, batchable=False, cache_tags=(), cache_shared=True)
 async def download_update(context: idol.SchoolIdolAuthParams, request: DownloadUpdateRequest) -> DownloadUpdateResponse:
     try:
         install_version = util.parse_sif_version(request.install_version)
@@ -103,7 +103,7 @@ async def download_update(context: idol.SchoolIdolAuthParams, request: DownloadU
     return DownloadUpdateResponse.model_validate(result)
 
 
-@idol.register("download", "batch", check_version=False, batchable=False)
+@idol.register("download", "batch", check_version=False, batchable=False, cache_tags=(), cache_shared=True)
 async def download_batch(context: idol.SchoolIdolAuthParams, request: DownloadBatchRequest) -> DownloadCommonResponse:
     links = await download.get_batch_files(
         context.request, _TARGET_OS_REMAP[request.os.value], int(request.package_type), request.excluded_package_ids
@@ -117,7 +117,7 @@ async def download_event(context: idol.SchoolIdolAuthParams, request: DownloadBa
     return DownloadCommonResponse.model_validate([])
 
 
-@idol.register("download", "additional", check_version=False, batchable=False)
+@idol.register("download", "additional", check_version=False, batchable=False, cache_tags=(), cache_shared=True)
 async def download_additional(
     context: idol.SchoolIdolAuthParams, request: DownloadAdditionalRequest
 ) -> DownloadCommonResponse:
@@ -316,7 +316,7 @@ async def live_livestatus(context: idol.SchoolIdolUserParams) -> LiveStatusRespo
     )
 
 
-@idol.register("live", "schedule")
+@idol.register("live", "schedule", cache_tags=("daily",), cache_shared=True)
 async def live_schedule(context: idol.SchoolIdolUserParams) -> LiveScheduleResponse:
     ts = util.time()
     special_live_rotation = await live.get_special_live_rotation_difficulty_id(context)
@@ -492,6 +492,7 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
     # FIXME: Perform validation to keep cheaters away?
     # FIXME: Modularize this thing for MedFes, ChaFest, Score Match, etc.
 
+    timer = util.StageTimer("live/reward")
     current_user = await user.get_current(context)
     live_in_progress = await live.get_live_in_progress(context, current_user)
     if live_in_progress is None:
@@ -510,6 +511,8 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
     old_live_clear_data = copy.copy(live_clear_data)
     old_user_info = await user.get_user_info(context, current_user)
 
+    timer.mark("load")
+
     # Update live clear data
     score = request.score_smile + request.score_cute + request.score_cool
     live_clear_data.hi_score = max(live_clear_data.hi_score, score)
@@ -526,8 +529,8 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
     )
 
     # Give live goal rewards
-    for reward_data in live_goal_rewards:
-        await advanced.add_item(context, current_user, reward_data)
+    await advanced.add_items(context, current_user, live_goal_rewards)
+    timer.mark("live_goal")
 
     # This is the intended EXP and G drop
     target_difficulty_index = min(max(live_setting.difficulty, 1), 4) - 1
@@ -553,26 +556,13 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
         live_score_drop = None
         given_exp = math.ceil(given_exp / 2)
 
+    timer.mark("unit_drop")
+
     # Add user EXP
     given_exp = given_exp * live_in_progress.lp_factor
     next_level_info = await user.add_exp(context, current_user, given_exp)
     current_user.game_coin = current_user.game_coin + given_g
 
-    # Add units
-    unit_expiry = util.time() + const.COMMON_UNIT_EXPIRY
-    current_unit_count = await unit.count_units(context, current_user, True)
-    for reward_data in (live_clear_drop, live_combo_drop, live_score_drop):
-        if reward_data is not None:
-            current_unit_count = await unit.process_quick_add(
-                context,
-                current_user,
-                reward_data,
-                current_unit_count=current_unit_count,
-                reason_jp="FIXME live show reward JP text",
-                reason_en="Live Show! Reward",
-                expire=unit_expiry,
-            )
-
     # Add bond
     love_count = request.love_cnt * live_in_progress.lp_factor
     before_after_loves = await unit.add_love_by_deck(context, current_user, live_in_progress.unit_deck_id, love_count)
@@ -581,92 +571,121 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
     effort_result, offer_limited_effort = await effort.add_effort(
         context, current_user, score * live_in_progress.lp_factor
     )
-    for eff in effort_result:
-        for r in eff.rewards:
-            add_result = await advanced.add_item(context, current_user, r)
-            if not add_result.success:
-                # TODO: Message
-                await reward.add_item(
-                    context, current_user, r, "FIXME: Live Show! Clear message for JP", "Live Show! Clear"
-                )
-                r.reward_box_flag = True
+    timer.mark("love_effort")
+
+    # Add units. Units which don't fit go to present box.
+    await unit.process_quick_add_many(
+        context,
+        current_user,
+        (d for d in (live_clear_drop, live_combo_drop, live_score_drop) if d is not None),
+        reason_jp="FIXME live show reward JP text",
+        reason_en="Live Show! Reward",
+        expire=util.time() + const.COMMON_UNIT_EXPIRY,
+    )
+
+    # Give live effort rewards at once
+    effort_rewards = [r for eff in effort_result for r in eff.rewards]
+    effort_reward_results = await advanced.add_items(context, current_user, effort_rewards)
+    for reward_data, success in zip(effort_rewards, effort_reward_results):
+        if not success:
+            # TODO: Message
+            await reward.add_item(
+                context, current_user, reward_data, "FIXME: Live Show! Clear message for JP", "Live Show! Clear"
+            )
+            reward_data.reward_box_flag = True
+
+    timer.mark("add_item")
 
     # Get current deck
     current_deck = await unit.load_unit_deck(context, current_user, live_in_progress.unit_deck_id)
     subscenario_unlocks: list[int] = []
     assert current_deck is not None
-    unit_types_in_deck: set[int] = set()
-    unit_deck_full_info: list[unit_model.UnitInfoData] = []
-    unit_deck_unit_ids: list[int] = []
-    for unit_owning_user_id in current_deck[1]:
-        unit_data = await unit.get_unit(context, unit_owning_user_id)
+    deck_units = await unit.get_units(context, current_deck[1])
+    for unit_data in deck_units:
         unit.validate_unit(current_user, unit_data)
+    deck_units = util.ensure_no_none(deck_units)
 
-        unit_info = await unit.get_unit_info(context, unit_data.unit_id)
-        if unit_info is None:
-            raise ValueError("invalid unit_info (is db corrupt?)")
-        unit_types_in_deck.add(unit_info.unit_type_id)
+    unit_infos = await unit.get_unit_info_many(context, (u.unit_id for u in deck_units))
+    if None in unit_infos.values():
+        raise ValueError("invalid unit_info (is db corrupt?)")
+    unit_rarities = await unit.get_unit_rarity_many(context, (ui.rarity for ui in unit_infos.values() if ui))
+    if None in unit_rarities.values():
+        raise ValueError("invalid unit_rarity (is db corrupt?)")
 
-        # Try to unlock subscenario
-        unit_rarity = await unit.get_unit_rarity(context, unit_info.rarity)
-        if unit_rarity is None:
-            raise ValueError("invalid unit_rarity (is db corrupt?)")
+    unit_types_in_deck: set[int] = set()
+    unit_deck_unit_ids: list[int] = []
+    max_love_unit_ids: list[int] = []
+    for unit_data in deck_units:
+        unit_info = unit_infos[unit_data.unit_id]
+        assert unit_info is not None
+        unit_types_in_deck.add(unit_info.unit_type_id)
 
+        unit_rarity = unit_rarities[unit_info.rarity]
+        assert unit_rarity is not None
         if unit_data.love >= unit_rarity.after_love_max:
-            subscenario_id = await subscenario.get_subscenario_id_of_unit_id(context, unit_data.unit_id)
-            if subscenario_id > 0 and await subscenario.unlock(context, current_user, subscenario_id):
-                subscenario_unlocks.append(subscenario_id)
+            max_love_unit_ids.append(unit_data.unit_id)
 
         unit_deck_unit_ids.append(unit_data.unit_id)
-        unit_deck_full_info.append((await unit.get_unit_data_full_info(context, unit_data))[0])
+
+    # Try to unlock subscenario
+    if max_love_unit_ids:
+        subscenario_ids = await subscenario.get_subscenario_id_of_unit_id_many(context, max_love_unit_ids)
+        subscenario_unlocks = await subscenario.unlock_many(
+            context, current_user, (subscenario_ids[i] for i in max_love_unit_ids if subscenario_ids[i] > 0)
+        )
+
+    unit_deck_full_info = [u for u, _ in await unit.get_all_unit_data_full_info(context, deck_units)]
+    timer.mark("deck")
 
     # Check achievement
-    accomplished_achievement = (
-        await achievement.check_type_1(context, current_user, True)
-        + await achievement.check_type_2(context, current_user, live_setting.difficulty, True)
-        # album.trigger_achievement call below checks type 18 through 22.
-        + await album.trigger_achievement(context, current_user, obtained=True, idolized=True, max_love=True)
-        + await achievement.check_type_30(context, current_user)
-        + await achievement.check_type_32(context, current_user, live_setting.live_track_id)
-        # TODO: Check type 33
-        + await achievement.check_type_37(context, current_user, live_setting.live_track_id, True)
-        + await achievement.check_type_50(
-            context,
-            current_user,
-            live_setting.live_track_id,
-            live_setting.difficulty,
-            live_setting.attribute_icon_id,
-            score_rank,
-            combo_rank,
-            unit_deck_unit_ids,
-            True,
+    async with achievement.deferred_flush(context, current_user):
+        accomplished_achievement = (
+            await achievement.check_type_1(context, current_user, True)
+            + await achievement.check_type_2(context, current_user, live_setting.difficulty, True)
+            # album.trigger_achievement call below checks type 18 through 22.
+            + await album.trigger_achievement(context, current_user, obtained=True, idolized=True, max_love=True)
+            + await achievement.check_type_30(context, current_user)
+            + await achievement.check_type_32(context, current_user, live_setting.live_track_id)
+            # TODO: Check type 33
+            + await achievement.check_type_37(context, current_user, live_setting.live_track_id, True)
+            + await achievement.check_type_50(
+                context,
+                current_user,
+                live_setting.live_track_id,
+                live_setting.difficulty,
+                live_setting.attribute_icon_id,
+                score_rank,
+                combo_rank,
+                unit_deck_unit_ids,
+                True,
+            )
+            + await achievement.check_type_58(context, current_user, True)
+        )
+        if score_rank < 5:
+            accomplished_achievement.extend(await achievement.check_type_3(context, current_user, score_rank, True))
+        if combo_rank < 5:
+            accomplished_achievement.extend(await achievement.check_type_4(context, current_user, combo_rank, True))
+        for unit_type_id in unit_types_in_deck:
+            accomplished_achievement.extend(await achievement.check_type_7(context, current_user, unit_type_id, True))
+        accomplished_achievement.extend(await achievement.check_type_53_recursive(context, current_user))
+        accomplished_achievement.fix()
+        timer.mark("achievement")
+
+        # Process achievement rewards part 1
+        accomplished_achievement_rewards = [
+            await achievement.get_achievement_rewards(context, ach) for ach in accomplished_achievement.accomplished
+        ]
+        temp_achievement_rewards = await advanced.fixup_achievement_reward(
+            context, current_user, accomplished_achievement_rewards
         )
-        + await achievement.check_type_58(context, current_user, True)
-    )
-    if score_rank < 5:
-        accomplished_achievement.extend(await achievement.check_type_3(context, current_user, score_rank, True))
-    if combo_rank < 5:
-        accomplished_achievement.extend(await achievement.check_type_4(context, current_user, combo_rank, True))
-    for unit_type_id in unit_types_in_deck:
-        accomplished_achievement.extend(await achievement.check_type_7(context, current_user, unit_type_id, True))
-    accomplished_achievement.extend(await achievement.check_type_53_recursive(context, current_user))
-    accomplished_achievement.fix()
-
-    # Process achievement rewards part 1
-    accomplished_achievement_rewards = [
-        await achievement.get_achievement_rewards(context, ach) for ach in accomplished_achievement.accomplished
-    ]
-    temp_achievement_rewards = await advanced.fixup_achievement_reward(
-        context, current_user, accomplished_achievement_rewards
-    )
 
-    # Check achievement part 2
-    unlocked_scenario = await scenario.count(context, current_user)
-    for reward_list in temp_achievement_rewards:
-        for reward_data in reward_list:
-            if reward_data.add_type == const.ADD_TYPE.SCENARIO:
-                unlocked_scenario = unlocked_scenario + 1
-    accomplished_achievement.extend(await achievement.check_type_59(context, current_user, unlocked_scenario))
+        # Check achievement part 2
+        unlocked_scenario = await scenario.count(context, current_user)
+        for reward_list in temp_achievement_rewards:
+            for reward_data in reward_list:
+                if reward_data.add_type == const.ADD_TYPE.SCENARIO:
+                    unlocked_scenario = unlocked_scenario + 1
+        accomplished_achievement.extend(await achievement.check_type_59(context, current_user, unlocked_scenario))
 
     # Process achievement rewards part 2
     accomplished_achievement_rewards = [
@@ -685,6 +704,8 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
         context, current_user, accomplished_achievement.accomplished, accomplished_achievement_rewards
     )
 
+    timer.mark("achievement_reward")
+
     # Clean live in progress
     context.db.main.expunge(live_in_progress)
     await live.clean_live_in_progress(context, current_user)
@@ -697,6 +718,17 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
     if live_score_drop is not None:
         reward_unit_list.live_rank.append(live_score_drop.as_item_reward)
     user_info = await user.get_user_info(context, current_user)
+    accomplished_achievement_list = await achievement.to_game_representation(
+        context, accomplished_achievement.accomplished, accomplished_achievement_rewards
+    )
+    added_achievement_list = await achievement.to_game_representation(
+        context, accomplished_achievement.new, new_achievement_rewards
+    )
+    unaccomplished_achievement_cnt = await achievement.get_achievement_count(context, current_user, False)
+    museum_info = await museum.get_museum_info_data(context, current_user)
+    present_cnt = await reward.count_presentbox(context, current_user)
+    timer.mark("response")
+    timer.log()
 
     return LiveRewardResponse(
         live_info=[await live.get_live_info_without_notes(context, request.live_difficulty_id, live_setting)],
@@ -724,20 +756,16 @@ async def live_reward(context: idol.SchoolIdolUserParams, request: LiveRewardReq
             for i, unit_data_full in enumerate(unit_deck_full_info)
         ],
         before_user_info=old_user_info,
-        after_user_info=await user.get_user_info(context, current_user),
+        after_user_info=user_info,
         next_level_info=next_level_info,
         goal_accomp_info=LiveRewardGoalAccomplishedInfo(
             achieved_ids=accomplished_live_goals, rewards=live_goal_rewards
         ),
         special_reward_info=[],  # TODO: Give 1 loveca on clearing this track for the first time.
-        accomplished_achievement_list=await achievement.to_game_representation(
-            context, accomplished_achievement.accomplished, accomplished_achievement_rewards
-        ),
-        unaccomplished_achievement_cnt=await achievement.get_achievement_count(context, current_user, False),
-        added_achievement_list=await achievement.to_game_representation(
-            context, accomplished_achievement.new, new_achievement_rewards
-        ),
+        accomplished_achievement_list=accomplished_achievement_list,
+        unaccomplished_achievement_cnt=unaccomplished_achievement_cnt,
+        added_achievement_list=added_achievement_list,
         new_achievement_cnt=len(accomplished_achievement.new),
-        museum_info=await museum.get_museum_info_data(context, current_user),
-        present_cnt=await reward.count_presentbox(context, current_user),
+        museum_info=museum_info,
+        present_cnt=present_cnt,
     )
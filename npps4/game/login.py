@@ -151,6 +151,7 @@ async def login_login(context: idol.SchoolIdolAuthParams, request: LoginRequest)
     # Login
     await session.invalidate_current(context)
     if u.locked:
+        session.invalidate_user_sessions(u.id)
         raise idol.error.locked()
 
     token = await session.encapsulate_token(context, context.token.server_key, context.token.client_key, u.id)
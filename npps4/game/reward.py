@@ -221,19 +221,25 @@ async def reward_openall(context: idol.SchoolIdolUserParams, request: RewardList
     reward_item_list: list[RewardIncentiveItem] = []
     need_check_unit_ach = False
 
-    for incentive in incentives:
-        item_data = await reward.resolve_incentive(context, current_user, incentive)
-        add_result = await advanced.add_item(context, current_user, item_data)
-        success = bool(add_result)
+    # Live clear status is filled when the live show is actually unlocked.
+    item_data_list = [
+        await reward.resolve_incentive(context, current_user, incentive, live_status=False) for incentive in incentives
+    ]
+    add_results = await advanced.add_items(context, current_user, item_data_list)
+    claimed_incentives: list[main.Incentive] = []
 
+    for incentive, item_data, success in zip(incentives, item_data_list, add_results):
         if success:
             reward_item_list.append(
                 RewardIncentiveItem.model_validate(item_data.model_dump() | {"incentive_id": incentive.id})
             )
-            await reward.remove_incentive(context, incentive)
+            claimed_incentives.append(incentive)
             if item_data.add_type == const.ADD_TYPE.UNIT:
                 need_check_unit_ach = True
 
+    if claimed_incentives:
+        await reward.remove_incentives(context, claimed_incentives)
+
     achievement_list = achievement.AchievementContext()
     if need_check_unit_ach:
         # Trigger achievement
@@ -83,7 +83,7 @@ if USE_STUB_DATA:
 
 else:
 
-    @idol.register("secretbox", "all")
+    @idol.register("secretbox", "all", cache_tags=("server_data",))
     async def secretbox_all(context: idol.SchoolIdolUserParams) -> SecretboxAllResponse:
         current_user = await user.get_current(context)
         item_list = await item.get_item_list(context, current_user)
@@ -183,19 +183,17 @@ async def unit_deckinfo(context: idol.SchoolIdolUserParams) -> UnitDeckInfoRespo
     current_user = await user.get_current(context)
     result: list[UnitDeckInfo] = []
 
-    for i in range(1, 19):
-        decklist = await unit.load_unit_deck(context, current_user, i)
-
-        if decklist is not None:
+    for deck_number, deck_name, deck_unit_ids in sorted(await unit.get_all_deck_simple(context, current_user)):
+        if deck_number in unit.VALID_DECK_ID:
             deckpos: list[UnitDeckPositionInfoResponse] = []
-            for j, unit_id in enumerate(decklist[1], 1):
+            for j, unit_id in enumerate(deck_unit_ids, 1):
                 if unit_id > 0:
                     deckpos.append(UnitDeckPositionInfoResponse(position=j, unit_owning_user_id=unit_id))
 
             deckinfo = UnitDeckInfo(
-                unit_deck_id=i,
-                main_flag=current_user.active_deck_index == i,
-                deck_name=decklist[0].name,
+                unit_deck_id=deck_number,
+                main_flag=current_user.active_deck_index == deck_number,
+                deck_name=deck_name,
                 unit_owning_user_ids=deckpos,
             )
             result.append(deckinfo)
@@ -225,8 +223,8 @@ async def unit_unitall(context: idol.SchoolIdolUserParams) -> UnitAllInfoRespons
 
     unit_result: dict[bool, list[unit_model.UnitInfoData]] = {False: [], True: []}
 
-    for unit_data in await unit.get_all_units(context, current_user):
-        unit_serialized_data, _ = await unit.get_unit_data_full_info(context, unit_data)
+    units = list(await unit.get_all_units(context, current_user))
+    for unit_data, (unit_serialized_data, _) in zip(units, await unit.get_all_unit_data_full_info(context, units)):
         unit_result[unit_data.active].append(unit_serialized_data)
 
     return UnitAllInfoResponse(active=unit_result[True], waiting=unit_result[False])
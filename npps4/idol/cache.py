@@ -1,58 +1,329 @@
 import collections.abc
+import dataclasses
+import time
+import zlib
 
 import sqlalchemy
 
+from . import fragment
 from . import session
+from .. import data
 from .. import util
+from ..config import config
 from ..db import main
+from ..system import master_cache
 
-ENABLE_CACHE = False
 
+# Level used to compress the stored responses. Lowest level is used as it's good enough for JSON.
+COMPRESS_LEVEL = 1
+# How often (in seconds) expired responses of idle users are dropped.
+SWEEP_INTERVAL = 60
 
-async def load_response(context: session.SchoolIdolParams, endpoint: str):
-    if ENABLE_CACHE:
-        if isinstance(context, session.SchoolIdolUserParams) and context.nonce > 0:
-            assert context.token is not None
+
+@dataclasses.dataclass
+class _ReplayEntry:
+    endpoint: str
+    response: bytes
+    expiry: float
+
+
+class ReplayCache:
+    """Remembers the last responses of each user by their nonce, so retried requests get the same response.
+
+    Only the last `size` responses of each user are kept, each for at most `ttl` seconds. Responses are stored
+    compressed.
+    """
+
+    def __init__(self, size: int, ttl: int):
+        self.size = size
+        self.ttl = ttl
+        self._users: dict[int, collections.OrderedDict[int, _ReplayEntry]] = {}
+        self._last_sweep = time.monotonic()
+
+    def get(self, user_id: int, nonce: int, endpoint: str):
+        entries = self._users.get(user_id)
+        if entries is not None:
+            entry = entries.get(nonce)
+            if entry is not None and entry.endpoint == endpoint and entry.expiry > time.monotonic():
+                return entry.response
+
+        return None
+
+    def set(self, user_id: int, nonce: int, endpoint: str, response: bytes):
+        t = time.monotonic()
+        entries = self._users.setdefault(user_id, collections.OrderedDict())
+        entries[nonce] = _ReplayEntry(endpoint=endpoint, response=response, expiry=t + self.ttl)
+        entries.move_to_end(nonce)
+
+        while len(entries) > self.size:
+            entries.popitem(last=False)
+
+        if (t - self._last_sweep) >= SWEEP_INTERVAL:
+            self._last_sweep = t
+            self.sweep(t)
+
+    def sweep(self, t: float):
+        for user_id in list(self._users.keys()):
+            entries = self._users[user_id]
+            # Newest entry expires last.
+            if next(reversed(entries.values())).expiry <= t:
+                del self._users[user_id]
+
+    def clear(self, user_id: int):
+        self._users.pop(user_id, None)
+
+
+REPLAY = ReplayCache(config.get_replay_cache_size(), config.get_replay_cache_ttl())
+
+
+def is_replay_enabled(context: session.SchoolIdolParams):
+    return REPLAY.size > 0 and isinstance(context, session.SchoolIdolUserParams) and context.nonce > 0
+
+
+def _decompress(response: bytes):
+    try:
+        return fragment.JSONFragment(zlib.decompress(response))
+    except zlib.error:
+        return None
+
+
+async def load_response(context: session.SchoolIdolParams, endpoint: str, persistent: bool):
+    """Find the response of previous request with same nonce.
+
+    Persistent responses (stored with `persistent=True`) are looked up in the database if it's not in memory."""
+    if is_replay_enabled(context):
+        assert context.token is not None
+        user_id = context.token.user_id
+        response = REPLAY.get(user_id, context.nonce, endpoint)
+
+        if response is None and persistent:
             q = sqlalchemy.select(main.RequestCache).where(
-                main.RequestCache.user_id == context.token.user_id, main.RequestCache.nonce == context.nonce
+                main.RequestCache.user_id == user_id, main.RequestCache.nonce == context.nonce
             )
             result = await context.db.main.execute(q)
 
             cache = result.scalar()
             if cache is not None and cache.endpoint == endpoint:
-                util.log("Cache for endpoint", endpoint, context.nonce, "FOUND!!")
-                return cache.response
+                response = cache.response
+
+        if response is not None:
+            return _decompress(response)
 
-        util.log("Cache for endpoint", endpoint, context.nonce, "not found")
     return None
 
 
 async def store_response(
-    context: session.SchoolIdolParams, endpoint: str, response_base: collections.abc.Sequence[int]
+    context: session.SchoolIdolParams, endpoint: str, response: fragment.JSONFragment, persistent: bool
 ):
-    if ENABLE_CACHE:
-        if isinstance(context, session.SchoolIdolUserParams) and context.nonce > 0:
-            assert context.token is not None
-            user_id = context.token.user_id
-            nonce = context.nonce
-            q = sqlalchemy.select(main.RequestCache).where(
-                main.RequestCache.user_id == user_id, main.RequestCache.nonce == nonce
-            )
-            result = await context.db.main.execute(q)
+    """Store the response of the current request to the database if `persistent` is set.
 
-            response = bytes(response_base)
-            cache = result.scalar()
-            if cache is None:
-                cache = main.RequestCache(user_id=user_id, endpoint=endpoint, nonce=nonce, response=response)
-                context.db.main.add(cache)
-            else:
-                cache.endpoint = endpoint
-                cache.response = response
-            await context.db.main.flush()
-            util.log("Stored cache for endpoint", endpoint, context.nonce)
+    The response must be passed to `remember_response` once the transaction is committed. Returns the compressed
+    response."""
+    assert context.token is not None
+    compressed = zlib.compress(response.data, COMPRESS_LEVEL)
+
+    if persistent:
+        # Only the last persistent response of each user is kept.
+        user_id = context.token.user_id
+        q = sqlalchemy.select(main.RequestCache).where(main.RequestCache.user_id == user_id).limit(1)
+        result = await context.db.main.execute(q)
+
+        cache = result.scalar()
+        if cache is None:
+            cache = main.RequestCache(user_id=user_id, endpoint=endpoint, nonce=context.nonce, response=compressed)
+            context.db.main.add(cache)
+        else:
+            cache.endpoint = endpoint
+            cache.nonce = context.nonce
+            cache.response = compressed
+        await context.db.main.flush()
+        util.log("Stored cache for endpoint", endpoint, context.nonce, severity=util.logging.DEBUG)
+
+    return compressed
+
+
+def remember_response(context: session.SchoolIdolParams, endpoint: str, compressed_response: bytes):
+    assert context.token is not None
+    REPLAY.set(context.token.user_id, context.nonce, endpoint, compressed_response)
 
 
 async def clear(context: session.BasicSchoolIdolContext, user_id: int):
+    REPLAY.clear(user_id)
     q = sqlalchemy.delete(main.RequestCache).where(main.RequestCache.user_id == user_id)
     result = await context.db.main.execute(q)
     return result.rowcount
+
+
+async def cleanup_stale_responses(context: session.BasicSchoolIdolContext, /, limit: int = 1000):
+    """Delete at most `limit` stored responses of users without any session. Returns the amount of deleted rows."""
+    q = (
+        sqlalchemy.select(main.RequestCache.id)
+        .where(
+            main.RequestCache.user_id.not_in(
+                sqlalchemy.select(main.Session.user_id).where(main.Session.user_id != None)
+            )
+        )
+        .limit(limit)
+    )
+    result = await context.db.main.execute(q)
+    cache_ids = list(result.scalars())
+
+    if cache_ids:
+        q = sqlalchemy.delete(main.RequestCache).where(main.RequestCache.id.in_(cache_ids))
+        await context.db.main.execute(q)
+        await context.db.main.flush()
+
+    return len(cache_ids)
+
+
+def _get_server_data_version():
+    data.get()  # Reload server data if needed
+    return data.last_server_data_timestamp
+
+
+# Dependency tags whose version is derived from external state instead of being bumped by `invalidate`.
+TAG_VERSION_PROVIDERS: dict[str, collections.abc.Callable[[], collections.abc.Hashable]] = {
+    "daily": util.get_days_since_unix,
+    "server_data": _get_server_data_version,
+}
+
+
+@dataclasses.dataclass
+class _ResponseEntry:
+    response: fragment.JSONFragment
+    expiry: float
+
+
+@dataclasses.dataclass(kw_only=True)
+class ResponseCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class ResponseCache:
+    """Process-wide LRU cache of encoded responses of read-only endpoints.
+
+    Stale entries are never looked up again because the cache key contains the version of everything the response
+    depends on (user data, dependency tags, master data). They're evicted as they become least recently used.
+
+    The user data version is only bumped by writes made through this process, so each entry is also only used for
+    `ttl` seconds. Responses which depend on the user data are only cached if `per_user` is set.
+    """
+
+    def __init__(self, max_size: int, ttl: int, per_user: bool):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.per_user = per_user
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._data: collections.OrderedDict[collections.abc.Hashable, _ResponseEntry] = collections.OrderedDict()
+        self._tag_versions: dict[str, int] = {}
+        self._user_versions: dict[int, int] = {}
+
+    def get_tag_version(self, tag: str):
+        provider = TAG_VERSION_PROVIDERS.get(tag)
+        if provider is None:
+            return self._tag_versions.get(tag, 0)
+        return provider()
+
+    def make_key(
+        self,
+        context: session.SchoolIdolParams,
+        endpoint: str,
+        request_key: str,
+        tags: tuple[str, ...],
+        shared: bool,
+    ):
+        if shared:
+            user_id = user_version = 0
+        else:
+            assert context.token is not None
+            user_id = context.token.user_id
+            user_version = self._user_versions.get(user_id, 0)
+
+        return (
+            endpoint,
+            request_key,
+            user_id,
+            user_version,
+            tuple(self.get_tag_version(tag) for tag in tags),
+            context.lang,
+            context.platform,
+            context.client_version,
+            str(context.request.base_url),
+            master_cache.MASTER_DATA.version,
+        )
+
+    def get(self, key: collections.abc.Hashable):
+        entry = self._data.get(key)
+
+        if entry is not None and entry.expiry <= time.monotonic():
+            del self._data[key]
+            self.size = self.size - len(entry.response.data)
+            self.evictions = self.evictions + 1
+            entry = None
+
+        if entry is None:
+            self.misses = self.misses + 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits = self.hits + 1
+        return entry.response
+
+    def set(self, key: collections.abc.Hashable, value: fragment.JSONFragment):
+        if len(value.data) > self.max_size:
+            return
+
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size = self.size - len(old.response.data)
+
+        self._data[key] = _ResponseEntry(response=value, expiry=time.monotonic() + self.ttl)
+        self.size = self.size + len(value.data)
+
+        while self.size > self.max_size:
+            _, evicted = self._data.popitem(last=False)
+            self.size = self.size - len(evicted.response.data)
+            self.evictions = self.evictions + 1
+
+    def invalidate(self, tag: str):
+        self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def invalidate_user(self, user_id: int):
+        self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+
+    def stats(self):
+        return ResponseCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self._data),
+            size=self.size,
+            max_size=self.max_size,
+        )
+
+
+RESPONSES = ResponseCache(
+    config.get_response_cache_size(), config.get_response_cache_ttl(), config.is_response_cache_per_user()
+)
+
+
+def is_response_cache_enabled(shared: bool):
+    return RESPONSES.max_size > 0 and RESPONSES.ttl > 0 and (shared or RESPONSES.per_user)
+
+
+def invalidate(tag: str):
+    """Drop cached responses which depend on the specified tag."""
+    RESPONSES.invalidate(tag)
+
+
+def invalidate_user(user_id: int):
+    """Drop cached responses of the specified user. Must be called after modifying the user data is committed."""
+    RESPONSES.invalidate_user(user_id)
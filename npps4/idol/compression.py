@@ -0,0 +1,85 @@
+import asyncio
+import dataclasses
+import gzip
+import time
+
+from . import fragment
+from ..config import config
+
+
+@dataclasses.dataclass(kw_only=True)
+class CompressionStats:
+    responses: int
+    offloaded: int
+    original_size: int
+    compressed_size: int
+    cpu_time: float
+
+
+class _CompressionCounter:
+    def __init__(self):
+        self.responses = 0
+        self.offloaded = 0
+        self.original_size = 0
+        self.compressed_size = 0
+        self.cpu_time = 0.0
+
+    def add(self, original_size: int, compressed_size: int, cpu_time: float, offloaded: bool):
+        self.responses = self.responses + 1
+        self.offloaded = self.offloaded + offloaded
+        self.original_size = self.original_size + original_size
+        self.compressed_size = self.compressed_size + compressed_size
+        self.cpu_time = self.cpu_time + cpu_time
+
+    def stats(self):
+        return CompressionStats(
+            responses=self.responses,
+            offloaded=self.offloaded,
+            original_size=self.original_size,
+            compressed_size=self.compressed_size,
+            cpu_time=self.cpu_time,
+        )
+
+
+# Endpoint path to its compression counter.
+_counters: dict[str, _CompressionCounter] = {}
+
+
+def should_compress(size: int):
+    return fragment.COMPRESS_LEVEL > 0 and size >= config.get_response_compress_threshold()
+
+
+def _compress(data: bytes, parts: list[bytes | fragment.JSONFragment] | None):
+    # Only the CPU time of the thread doing the compression, so waiting for the thread is not counted.
+    start = time.thread_time()
+    if parts is None:
+        result = gzip.compress(data, fragment.COMPRESS_LEVEL, mtime=0)
+    else:
+        result = fragment.gzip_compress(parts, data)
+    return result, time.thread_time() - start
+
+
+async def compress(endpoint: str, data: bytes, parts: list[bytes | fragment.JSONFragment] | None = None):
+    """GZip compress the response `data` (which is the joined `parts`, if specified).
+
+    Large responses are compressed in a background thread, as zlib does not hold the GIL while compressing.
+    """
+    size = len(data) if parts is None else fragment.uncompressed_size(parts)
+    offload = size >= config.get_response_compress_offload_size()
+
+    if offload:
+        result, cpu_time = await asyncio.to_thread(_compress, data, parts)
+    else:
+        result, cpu_time = _compress(data, parts)
+
+    counter = _counters.get(endpoint)
+    if counter is None:
+        counter = _CompressionCounter()
+        _counters[endpoint] = counter
+    counter.add(len(data), len(result), cpu_time, offload)
+
+    return result
+
+
+def get_stats():
+    return {endpoint: counter.stats() for endpoint, counter in _counters.items()}
@@ -2,7 +2,6 @@ import cProfile
 import collections.abc
 import dataclasses
 import enum
-import gzip
 import json
 import os
 import os.path
@@ -12,9 +11,14 @@ import typing
 
 import fastapi
 import pydantic
+import pydantic.json_schema
+import pydantic_core
 
 from . import cache
+from . import compression
+from . import fragment
 from . import session
+from . import signing
 from . import error
 from .. import idoltype
 from .. import release_key
@@ -61,14 +65,39 @@ class Endpoint(Generic[_T, _U, _V]):
     exclude_none: bool
     log_response_data: bool
     profile: bool
+    cache_tags: tuple[str, ...] | None
+    cache_shared: bool
 
 
-def _get_request_data[U: pydantic.BaseModel](model: type[U]):
-    def actual_getter(
-        request_data: Annotated[pydantic.Json, fastapi.Form()],
-        xmc: Annotated[str | None, fastapi.Header(alias="X-Message-Code")],
-    ):
-        return model.model_validate(request_data)
+_TYPE_ADAPTERS: dict[type[pydantic.BaseModel], pydantic.TypeAdapter[Any]] = {}
+
+
+def _get_type_adapter[U: pydantic.BaseModel](model: type[U]) -> pydantic.TypeAdapter[U]:
+    adapter = _TYPE_ADAPTERS.get(model)
+    if adapter is None:
+        adapter = pydantic.TypeAdapter(model)
+        _TYPE_ADAPTERS[model] = adapter
+    return adapter
+
+
+def _get_request_data[T: session.SchoolIdolParams, U: pydantic.BaseModel](context_class: type[T], model: type[U]):
+    adapter = _get_type_adapter(model)
+
+    # The context is the same object the endpoint gets, as FastAPI caches dependencies within a request.
+    async def actual_getter(context: Annotated[T, fastapi.Depends(context_class)]):
+        try:
+            request_json = context.request_json
+        except ValueError as e:
+            raise fastapi.exceptions.RequestValidationError(
+                [{"type": "json_invalid", "loc": ("body", "request_data"), "msg": str(e), "input": None}]
+            ) from None
+
+        try:
+            return adapter.validate_python(request_json)
+        except pydantic.ValidationError as e:
+            raise fastapi.exceptions.RequestValidationError(
+                [{**err, "loc": ("body", "request_data", *err["loc"])} for err in e.errors(include_url=False)]
+            ) from None
 
     return actual_getter
 
@@ -117,11 +146,16 @@ async def client_check(context: session.SchoolIdolParams, check_version: bool, x
     return None
 
 
-_PossibleResponse = _V | list[_V] | error.IdolError | Exception | None
+_PossibleResponse = _V | list[_V] | error.IdolError | Exception | fragment.JSONFragment | None
 
 
-def assemble_response_data(response: _PossibleResponse[_V], exclude_none: bool = False):
-    if isinstance(response, error.IdolError):
+def assemble_response_data(
+    response: _PossibleResponse[_V], exclude_none: bool = False, fragments: fragment.FragmentCollector | None = None
+):
+    if isinstance(response, fragment.JSONFragment):
+        response_data = response
+        status_code = http_code = 200
+    elif isinstance(response, error.IdolError):
         response_data = {"error_code": response.error_code, "detail": response.detail}
         status_code = response.status_code
         http_code = response.http_code
@@ -135,42 +169,115 @@ def assemble_response_data(response: _PossibleResponse[_V], exclude_none: bool =
         response_data = []
         status_code = http_code = 200
     elif isinstance(response, list):
-        response_data = [r.model_dump(exclude_none=exclude_none) for r in response]
+        response_data = [r.model_dump(exclude_none=exclude_none, context=fragments) for r in response]
         status_code = http_code = 200
     else:
-        response_data = response.model_dump(exclude_none=exclude_none)
+        response_data = response.model_dump(exclude_none=exclude_none, context=fragments)
         status_code = http_code = 200
     return response_data, status_code, http_code
 
 
+def _dump_model(model: pydantic.BaseModel, exclude_none: bool, fragments: fragment.FragmentCollector | None):
+    adapter = _get_type_adapter(type(model))
+    return adapter.dump_json(model, ensure_ascii=True, exclude_none=exclude_none, context=fragments)
+
+
+def dump_response_data(
+    response: _PossibleResponse[_V], exclude_none: bool = False, fragments: fragment.FragmentCollector | None = None
+):
+    """Same as `assemble_response_data`, but the response data is encoded straight to JSON bytes.
+
+    If `fragments` is given, the `JSONFragment`s are left as placeholders to be spliced in later.
+    """
+    if isinstance(response, pydantic.BaseModel):
+        response_data = _dump_model(response, exclude_none, fragments)
+        status_code = http_code = 200
+    elif isinstance(response, list):
+        response_data = b"[" + b",".join(_dump_model(r, exclude_none, fragments) for r in response) + b"]"
+        status_code = http_code = 200
+    elif isinstance(response, fragment.JSONFragment):
+        if fragments is None:
+            response_data = response.data
+        else:
+            fragments.add(response)
+            response_data = fragments.fragments[-1][0]
+        status_code = http_code = 200
+    else:
+        response_dict, status_code, http_code = assemble_response_data(response, exclude_none)
+        response_data = pydantic_core.to_json(response_dict, ensure_ascii=True)
+    return response_data, status_code, http_code
+
+
+def _encode_response(response: _PossibleResponse[_V], exclude_none: bool = False):
+    fragments = fragment.FragmentCollector()
+    encoded, status_code, http_code = dump_response_data(response, exclude_none, fragments)
+    if fragments.fragments:
+        encoded = fragment.join(fragments.split(encoded))
+    return fragment.JSONFragment(encoded), status_code, http_code
+
+
+def encode_response_data(response: _V | list[_V] | None, exclude_none: bool = False):
+    """Encode the successful response data, so it can be stored in the response cache."""
+    return _encode_response(response, exclude_none)[0]
+
+
+def _get_response_cache_key(
+    context: session.SchoolIdolParams,
+    endpoint: str,
+    request: pydantic.BaseModel | None,
+    tags: tuple[str, ...] | None,
+    shared: bool,
+):
+    if tags is None or not cache.is_response_cache_enabled(shared):
+        return None
+
+    request_key = "" if request is None else request.model_dump_json()
+    return cache.RESPONSES.make_key(context, endpoint, request_key, tags, shared)
+
+
+def _invalidate_if_modified(context: session.SchoolIdolParams, write_count: int):
+    if context.token is not None and context.db.write_count != write_count:
+        cache.invalidate_user(context.token.user_id)
+
+
 async def build_response(
     context: session.SchoolIdolParams, response: _PossibleResponse[_V] | bytes, exclude_none: bool = False
 ):
+    fragments = fragment.FragmentCollector()
+    response_parts: list[bytes | fragment.JSONFragment] | None = None
+
     if isinstance(response, bytes):
         http_code = 200
         status_code = 200
     else:
-        response_data_dict, status_code, http_code = assemble_response_data(
-            cast(_PossibleResponse[_V], response), exclude_none
+        response_data, status_code, http_code = dump_response_data(
+            cast(_PossibleResponse[_V], response), exclude_none, fragments
+        )
+        response = b"".join(
+            (
+                b'{"response_data":',
+                response_data,
+                b',"release_info":',
+                release_key.formatted_json(),
+                b',"status_code":',
+                str(status_code).encode("UTF-8"),
+                b"}",
+            )
         )
-        response_data = {
-            "response_data": response_data_dict,
-            "release_info": release_key.formatted(),
-            "status_code": status_code,
-        }
-        jsondatastr = json.dumps(response_data)
-        response = jsondatastr.encode("UTF-8")
+
+        if fragments.fragments:
+            response_parts = fragments.split(response)
+            response = fragment.join(response_parts)
 
     response_headers = {
         "Server-Version": util.sif_version_string(config.get_latest_version()),
-        "X-Message-Sign": util.sign_message(response, context.x_message_code),
+        "X-Message-Sign": await signing.sign_message(response, context.x_message_code),
         "status_code": str(status_code),
     }
 
     allow_compress = "gzip" in context.request.headers.get("accept-encoding", "identity").lower()
-    if allow_compress and len(response) >= 65536:
-        # GZip compress
-        response = gzip.compress(response)
+    if allow_compress and compression.should_compress(len(response)):
+        response = await compression.compress(context.request.url.path, response, response_parts)
         response_headers["Content-Encoding"] = "gzip"
 
     return fastapi.responses.Response(
@@ -263,6 +370,12 @@ def register(
     batchable: bool = True,
     xmc_verify: idoltype.XMCVerifyMode = idoltype.XMCVerifyMode.SHARED,
     exclude_none: bool = False,
+    # Cache the encoded response in memory. Only for endpoints which don't modify anything. The response is cached
+    # per-user (unless `cache_shared` is set, per-user caching must also be enabled in the config) and is keyed by the
+    # request data, language, client version, master data version and the version of each dependency tag listed here
+    # (see `cache.invalidate`).
+    cache_tags: collections.abc.Iterable[str] | None = None,
+    cache_shared: bool = False,
     # These are only for debug purpose.
     log_response_data: bool = False,
     allow_retry_on_unhandled_exception: bool = False,
@@ -276,6 +389,7 @@ def register(
             return f
 
         endpoint = f"/{module}/{action}"
+        endpoint_cache_tags = None if cache_tags is None else tuple(cache_tags)
         signature = typing.get_type_hints(f)
         params = list(map(lambda x: x[1], filter(lambda x: x[0] != "return", signature.items())))
         ret: type[_V | pydantic.BaseModel | None] = signature.get("return", pydantic.BaseModel)
@@ -297,27 +411,50 @@ def register(
                 async with context:
                     await context.finalize()
 
+                write_count = context.db.write_count
                 response = await client_check(context, check_version, xmc_verify)
                 if response is None:
+                    replay_response = None
+
                     try:
                         async with context:
-                            cached_response = await cache.load_response(context, endpoint)
+                            cached_response = await cache.load_response(context, endpoint, not batchable)
 
                             if cached_response is None:
-                                if profile_this_endpoint:
-                                    profile_obj = cProfile.Profile()
-                                    with profile_obj:
+                                response_cache_key = _get_response_cache_key(
+                                    context, endpoint, None, endpoint_cache_tags, cache_shared
+                                )
+                                result = None if response_cache_key is None else cache.RESPONSES.get(response_cache_key)
+
+                                if result is None:
+                                    if profile_this_endpoint:
+                                        profile_obj = cProfile.Profile()
+                                        with profile_obj:
+                                            result = await func(context)
+                                        _write_profile_data(module, action, profile_obj)
+                                    else:
                                         result = await func(context)
-                                    _write_profile_data(module, action, profile_obj)
-                                else:
-                                    result = await func(context)
-                                response = await build_response(context, result, exclude_none=exclude_none)
-                                await cache.store_response(context, endpoint, response.body)
 
-                                if log_response_data and result is not None:
-                                    _log_response_data(module, action, result)
+                                    if log_response_data and result is not None:
+                                        _log_response_data(module, action, result)
+
+                                    if response_cache_key is not None:
+                                        result = encode_response_data(result, exclude_none)
+                                        cache.RESPONSES.set(response_cache_key, result)
+
+                                if cache.is_replay_enabled(context):
+                                    if not isinstance(result, fragment.JSONFragment):
+                                        result = encode_response_data(result, exclude_none)
+                                    replay_response = await cache.store_response(
+                                        context, endpoint, result, not batchable
+                                    )
+
+                                response = await build_response(context, result, exclude_none=exclude_none)
                             else:
                                 response = await build_response(context, cached_response)
+
+                        if replay_response is not None:
+                            cache.remember_response(context, endpoint, replay_response)
                     except error.IdolError as e:
                         response = await build_response(context, e)
                     except Exception as e:
@@ -327,6 +464,8 @@ def register(
                             )
                         else:
                             raise e from None
+
+                    _invalidate_if_modified(context, write_count)
                 return response
 
             app.main.post(
@@ -356,7 +495,7 @@ def register(
 
             async def wrap2(
                 context: Annotated[_T, fastapi.Depends(params[0])],
-                request: Annotated[_U, fastapi.Depends(_get_request_data(params[1]))],
+                request: Annotated[_U, fastapi.Depends(_get_request_data(params[0], params[1]))],
             ):
                 nonlocal check_version, xmc_verify, f, allow_retry_on_unhandled_exception, log_response_data
                 nonlocal profile_this_endpoint, endpoint
@@ -364,29 +503,52 @@ def register(
                 async with context:
                     await context.finalize()
 
+                write_count = context.db.write_count
                 func = cast(_EndpointWithRequestWithResponse[_T, _U, _V], f)
                 response = await client_check(context, check_version, xmc_verify)
 
                 if response is None:
+                    replay_response = None
+
                     try:
                         async with context:
-                            cached_response = await cache.load_response(context, endpoint)
+                            cached_response = await cache.load_response(context, endpoint, not batchable)
 
                             if cached_response is None:
-                                if profile_this_endpoint:
-                                    profile_obj = cProfile.Profile()
-                                    with profile_obj:
+                                response_cache_key = _get_response_cache_key(
+                                    context, endpoint, request, endpoint_cache_tags, cache_shared
+                                )
+                                result = None if response_cache_key is None else cache.RESPONSES.get(response_cache_key)
+
+                                if result is None:
+                                    if profile_this_endpoint:
+                                        profile_obj = cProfile.Profile()
+                                        with profile_obj:
+                                            result = await func(context, request)
+                                        _write_profile_data(module, action, profile_obj)
+                                    else:
                                         result = await func(context, request)
-                                    _write_profile_data(module, action, profile_obj)
-                                else:
-                                    result = await func(context, request)
-                                response = await build_response(context, result, exclude_none=exclude_none)
-                                await cache.store_response(context, endpoint, response.body)
 
-                                if log_response_data and result is not None:
-                                    _log_response_data(module, action, result)
+                                    if log_response_data and result is not None:
+                                        _log_response_data(module, action, result)
+
+                                    if response_cache_key is not None:
+                                        result = encode_response_data(result, exclude_none)
+                                        cache.RESPONSES.set(response_cache_key, result)
+
+                                if cache.is_replay_enabled(context):
+                                    if not isinstance(result, fragment.JSONFragment):
+                                        result = encode_response_data(result, exclude_none)
+                                    replay_response = await cache.store_response(
+                                        context, endpoint, result, not batchable
+                                    )
+
+                                response = await build_response(context, result, exclude_none=exclude_none)
                             else:
-                                result = await build_response(context, cached_response, exclude_none=exclude_none)
+                                response = await build_response(context, cached_response)
+
+                        if replay_response is not None:
+                            cache.remember_response(context, endpoint, replay_response)
                     except error.IdolError as e:
                         response = await build_response(context, e)
                     except Exception as e:
@@ -397,6 +559,8 @@ def register(
                             )
                         else:
                             raise e from None
+
+                    _invalidate_if_modified(context, write_count)
                 return response
 
             app.main.post(
@@ -437,6 +601,8 @@ def register(
                 exclude_none=exclude_none,
                 log_response_data=log_response_data,
                 profile=profile_this_endpoint,
+                cache_tags=endpoint_cache_tags,
+                cache_shared=cache_shared,
             )
         return f
 
@@ -453,7 +619,12 @@ class BatchRequestRoot(pydantic.RootModel):
 
 
 class BatchResponse(pydantic.BaseModel):
-    result: dict | list
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    result: Annotated[
+        dict | list | pydantic.json_schema.SkipJsonSchema[fragment.JSONFragment],
+        pydantic.WrapSerializer(fragment.serialize),
+    ]
     status: int
     commandNum: bool = False
     timeStamp: int
@@ -484,13 +655,16 @@ _api_request_data_schema = {
 )
 async def api_endpoint(
     context: Annotated[session.SchoolIdolUserParams, fastapi.Depends(session.SchoolIdolUserParams)],
-    request: Annotated[list[BatchRequest], fastapi.Depends(_get_request_data(BatchRequestRoot))],
+    request: Annotated[
+        BatchRequestRoot, fastapi.Depends(_get_request_data(session.SchoolIdolUserParams, BatchRequestRoot))
+    ],
 ):
     async with context:
         await context.finalize()
 
+    write_count = context.db.write_count
     response = await client_check(context, True, idoltype.XMCVerifyMode.SHARED)
-    raw_request_data = json.loads(context.raw_request_data)
+    raw_request_data: list[dict[str, Any]] = context.request_json
 
     if response is None:
         endpoint_name_list = ["/api"]
@@ -500,8 +674,10 @@ async def api_endpoint(
             endpoint_name_list.append(request_data["action"])
 
         endpoint_name = "_".join(endpoint_name_list)
+        replay_response = None
+
         async with context:
-            cached_response = await cache.load_response(context, endpoint_name)
+            cached_response = await cache.load_response(context, endpoint_name, False)
 
             if cached_response is None:
                 response_data: list[BatchResponse] = []
@@ -518,53 +694,87 @@ async def api_endpoint(
                             raise error.IdolError(error.ERROR_CODE_LIB_ERROR, 404, msg, http_code=404)
 
                         # *Sigh* have to reinvent the wheel.
+                        pydantic_request = None
                         if endpoint.request_class is not None:
-                            pydantic_request = endpoint.request_class.model_validate(request_data)
-                            func = cast(
-                                _EndpointWithRequestWithResponse[
-                                    session.SchoolIdolUserParams, pydantic.BaseModel, pydantic.BaseModel
-                                ]
-                                | _EndpointWithRequestWithoutResponse[session.SchoolIdolUserParams, pydantic.BaseModel],
-                                endpoint.function,
+                            request_adapter = _get_type_adapter(endpoint.request_class)
+                            pydantic_request = request_adapter.validate_python(request_data)
+
+                        # Responses cached per-user can't be used after modifying the user data in this batch.
+                        response_cache_key = None
+                        if endpoint.cache_shared or context.db.write_count == write_count:
+                            response_cache_key = _get_response_cache_key(
+                                context,
+                                f"/{module}/{action}",
+                                pydantic_request,
+                                endpoint.cache_tags,
+                                endpoint.cache_shared,
                             )
-
-                            if endpoint.profile:
-                                profile_obj = cProfile.Profile()
-                                with profile_obj:
+                        result = None if response_cache_key is None else cache.RESPONSES.get(response_cache_key)
+
+                        if result is None:
+                            if pydantic_request is not None:
+                                func = cast(
+                                    _EndpointWithRequestWithResponse[
+                                        session.SchoolIdolUserParams, pydantic.BaseModel, pydantic.BaseModel
+                                    ]
+                                    | _EndpointWithRequestWithoutResponse[
+                                        session.SchoolIdolUserParams, pydantic.BaseModel
+                                    ],
+                                    endpoint.function,
+                                )
+
+                                if endpoint.profile:
+                                    profile_obj = cProfile.Profile()
+                                    with profile_obj:
+                                        result = await func(context, pydantic_request)
+                                    _write_profile_data(module, action, profile_obj)
+                                else:
                                     result = await func(context, pydantic_request)
-                                _write_profile_data(module, action, profile_obj)
                             else:
-                                result = await func(context, pydantic_request)
-                        else:
-                            func = cast(
-                                _EndpointWithoutRequestWithResponse[session.SchoolIdolUserParams, pydantic.BaseModel]
-                                | _EndpointWithoutRequestWithoutResponse[session.SchoolIdolUserParams],
-                                endpoint.function,
-                            )
-                            if endpoint.profile:
-                                profile_obj = cProfile.Profile()
-                                with profile_obj:
+                                func = cast(
+                                    _EndpointWithoutRequestWithResponse[
+                                        session.SchoolIdolUserParams, pydantic.BaseModel
+                                    ]
+                                    | _EndpointWithoutRequestWithoutResponse[session.SchoolIdolUserParams],
+                                    endpoint.function,
+                                )
+                                if endpoint.profile:
+                                    profile_obj = cProfile.Profile()
+                                    with profile_obj:
+                                        result = await func(context)
+                                    _write_profile_data(module, action, profile_obj)
+                                else:
                                     result = await func(context)
-                                _write_profile_data(module, action, profile_obj)
-                            else:
-                                result = await func(context)
 
-                        if endpoint.log_response_data and result is not None:
-                            _log_response_data(module, action, result)
+                            if endpoint.log_response_data and result is not None:
+                                _log_response_data(module, action, result)
+
+                            if response_cache_key is not None:
+                                result = encode_response_data(result, endpoint.exclude_none)
+                                cache.RESPONSES.set(response_cache_key, result)
 
-                        current_response, status_code, http_code = assemble_response_data(result, endpoint.exclude_none)
+                        current_response, status_code, http_code = _encode_response(result, endpoint.exclude_none)
                     except Exception as e:
                         if not isinstance(e, error.IdolError):
                             util.log(f'Error processing "{module}/{action}"', severity=util.logging.ERROR, e=e)
 
-                        current_response, status_code, http_code = assemble_response_data(e)
+                        current_response, status_code, http_code = _encode_response(e)
 
                     response_data.append(
                         BatchResponse(result=current_response, status=status_code, timeStamp=util.time())
                     )
 
-                response = await build_response(context, response_data, False)
-                await cache.store_response(context, endpoint_name, response.body)
+                if cache.is_replay_enabled(context):
+                    encoded_response_data = encode_response_data(response_data)
+                    replay_response = await cache.store_response(context, endpoint_name, encoded_response_data, False)
+                    response = await build_response(context, encoded_response_data)
+                else:
+                    response = await build_response(context, response_data)
             else:
                 response = await build_response(context, cached_response)
+
+        if replay_response is not None:
+            cache.remember_response(context, endpoint_name, replay_response)
+
+        _invalidate_if_modified(context, write_count)
     return response
@@ -0,0 +1,110 @@
+import json
+import secrets
+import zlib
+
+import pydantic
+
+from ..config import config
+
+from typing import Any
+
+COMPRESS_LEVEL = config.get_response_compress_level()
+
+
+class JSONFragment:
+    """Already-encoded JSON value which is spliced into the response body as-is."""
+
+    __slots__ = ("data", "_deflate_data")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._deflate_data: bytes | None = None
+
+    @property
+    def is_compressed(self):
+        return self._deflate_data is not None
+
+    @property
+    def deflate_data(self):
+        """Raw deflate blocks of the data, ended with sync flush so it can be placed anywhere in a deflate stream."""
+        if self._deflate_data is None:
+            compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self._deflate_data = compressor.compress(self.data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return self._deflate_data
+
+
+class EncodedList[T](list[T]):
+    """List which carries its own pre-encoded JSON representation."""
+
+    def __init__(self, iterable: list[T], adapter: pydantic.TypeAdapter[list[T]]):
+        super().__init__(iterable)
+        self.json_fragment = JSONFragment(adapter.dump_json(self))
+
+
+class FragmentCollector:
+    """Serialization context which replaces `EncodedList` values with placeholder strings."""
+
+    def __init__(self):
+        self.prefix = secrets.token_hex(8)
+        self.fragments: list[tuple[bytes, JSONFragment]] = []
+
+    def add(self, fragment: JSONFragment):
+        token = f"__json_fragment_{self.prefix}_{len(self.fragments)}__"
+        self.fragments.append((f'"{token}"'.encode("utf-8"), fragment))
+        return token
+
+    def split(self, data: bytes):
+        """Split the encoded JSON at the placeholders, returning the plain data and fragments in order."""
+        result: list[bytes | JSONFragment] = []
+        start = 0
+
+        for token, fragment in self.fragments:
+            index = data.index(token, start)
+            result.append(data[start:index])
+            result.append(fragment)
+            start = index + len(token)
+
+        result.append(data[start:])
+        return result
+
+
+def serialize(value: Any, handler: pydantic.SerializerFunctionWrapHandler, info: pydantic.SerializationInfo):
+    if isinstance(info.context, FragmentCollector):
+        if isinstance(value, EncodedList):
+            return info.context.add(value.json_fragment)
+        elif isinstance(value, JSONFragment):
+            return info.context.add(value)
+
+    if isinstance(value, JSONFragment):
+        return json.loads(value.data)
+
+    return handler(value)
+
+
+def join(parts: list[bytes | JSONFragment]):
+    return b"".join(p.data if isinstance(p, JSONFragment) else p for p in parts)
+
+
+def gzip_compress(parts: list[bytes | JSONFragment], data: bytes):
+    """GZip compress the joined `parts` (`data`), reusing the compressed data of the fragments."""
+    # Magic, deflate, no flags, no mtime, compression level hint (same as gzip.compress), unknown OS.
+    xfl = b"\x02" if COMPRESS_LEVEL == 9 else b"\x04" if COMPRESS_LEVEL == 1 else b"\x00"
+    result = [b"\x1f\x8b\x08\x00\x00\x00\x00\x00", xfl, b"\xff"]
+
+    for part in parts:
+        if isinstance(part, JSONFragment):
+            result.append(part.deflate_data)
+        elif part:
+            compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+            result.append(compressor.compress(part) + compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    # Empty final block
+    result.append(zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS).flush())
+    result.append((zlib.crc32(data) & 0xFFFFFFFF).to_bytes(4, "little"))
+    result.append((len(data) & 0xFFFFFFFF).to_bytes(4, "little"))
+    return b"".join(result)
+
+
+def uncompressed_size(parts: list[bytes | JSONFragment]):
+    """Amount of bytes `gzip_compress` has to compress, as the fragments compressed before are reused."""
+    return sum(len(p) if isinstance(p, bytes) else 0 if p.is_compressed else len(p.data) for p in parts)
@@ -1,11 +1,13 @@
-import asyncio
 import base64
 import dataclasses
+import itertools
 import pickle
+import time
 import urllib.parse
 
 import fastapi
 import itsdangerous
+import pydantic_core
 import sqlalchemy
 
 from . import database
@@ -27,12 +29,6 @@ class BasicSchoolIdolContext:
         self.cache: dict[str, dict[Any, Any]] = {}
 
     async def __aenter__(self):
-        mainsession = self.db.main
-        if mainsession.bind.dialect.name == "sqlite":
-            # HACK: Set busy timeout to 25s
-            await mainsession.execute(sqlalchemy.text("PRAGMA busy_timeout=25000"))
-            # HACK: Increase WAL page size to 100000
-            await mainsession.execute(sqlalchemy.text("PRAGMA wal_autocheckpoint=100000"))
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -129,14 +125,22 @@ class SchoolIdolParams(BasicSchoolIdolContext):
         self.x_message_code = request.headers.get("X-Message-Code")
         self.request = request
         self.bgtasks = background_task
-        # Note: Due to how FastAPI works, the `request_data` form is retrieved TWICE!
-        # One in here, retrieved as raw bytes, and the other one is in _get_request_data
-        # as Pydantic model.
-        # This is necessary for proper X-Message-Code verification!
+        # The `request_data` form is only retrieved here, as raw bytes. This is necessary for proper X-Message-Code
+        # verification! The decoded JSON is available in `request_json`.
         self.raw_request_data = request_data or b""
+        self._request_json: Any = None
+        self._request_json_decoded = False
 
         super().__init__(lang)
 
+    @property
+    def request_json(self) -> Any:
+        """The `request_data` decoded as JSON. It's decoded only once, raises `ValueError` if it's not valid JSON."""
+        if not self._request_json_decoded:
+            self._request_json = pydantic_core.from_json(self.raw_request_data)
+            self._request_json_decoded = True
+        return self._request_json
+
     def support_background_task(self):
         return True
 
@@ -201,6 +205,8 @@ TOKEN_SERIALIZER = itsdangerous.serializer.Serializer(config.get_secret_key(), s
 FIRST_STAGE_TOKEN_MAX_DURATION = 60
 SALT_SIZE = 16
 TOKEN_SIZE = 16
+# Maximum amount of sessions in the session cache. Oldest entries are evicted first.
+SESSION_CACHE_SIZE = 65536
 
 
 @dataclasses.dataclass(kw_only=True)
@@ -210,6 +216,20 @@ class TokenData:
     user_id: int
 
 
+@dataclasses.dataclass(kw_only=True)
+class _CachedSession:
+    id: int
+    data: TokenData
+    last_accessed: int
+    valid_until: float
+
+
+# Token to session, see `config.get_session_cache_ttl`.
+_session_cache: dict[str, _CachedSession] = {}
+# Session ID to its last access time which is not written to the database yet.
+_pending_access: dict[int, int] = {}
+
+
 async def encapsulate_token(context: BasicSchoolIdolContext, server_key: bytes, client_key: bytes, user_id: int = 0):
     salt = util.randbytes(SALT_SIZE)
     token = util.randbytes(TOKEN_SIZE).hex()[:TOKEN_SIZE]
@@ -223,60 +243,130 @@ async def encapsulate_token(context: BasicSchoolIdolContext, server_key: bytes,
     return str(base64.urlsafe_b64encode(salt + result), "utf-8")
 
 
-async def cleanup_session_table(context: BasicSchoolIdolContext, /):
+async def cleanup_session_table(context: BasicSchoolIdolContext, /, limit: int = 1000):
+    """Delete at most `limit` unauthenticated or expired sessions. Returns the amount of deleted sessions."""
     t = util.time()
-    q = sqlalchemy.delete(main.Session).where(
-        main.Session.user_id == None, main.Session.last_accessed < (t - FIRST_STAGE_TOKEN_MAX_DURATION)
-    )
-    await context.db.main.execute(q)
+    condition = (main.Session.user_id == None) & (main.Session.last_accessed < (t - FIRST_STAGE_TOKEN_MAX_DURATION))
 
     # Delete tokens
     expiry_time = config.get_session_expiry_time()
     if expiry_time > 0:
-        q = sqlalchemy.delete(main.Session).where(main.Session.last_accessed < (t - expiry_time))
-        await context.db.main.execute(q)
-
-    await context.db.main.flush()
-
+        condition = condition | (main.Session.last_accessed < (t - expiry_time))
 
-_currently_cleaning = False
+    q = sqlalchemy.select(main.Session.id).where(condition).limit(limit)
+    result = await context.db.main.execute(q)
+    session_ids = list(result.scalars())
 
+    if session_ids:
+        q = sqlalchemy.delete(main.Session).where(main.Session.id.in_(session_ids))
+        await context.db.main.execute(q)
+        await context.db.main.flush()
 
-async def try_cleanup_tokens():
-    global _currently_cleaning
-    if not _currently_cleaning:
-        _currently_cleaning = True
-        await asyncio.sleep(5)
-        async with BasicSchoolIdolContext() as context:
-            await cleanup_session_table(context)
-        _currently_cleaning = False
+    return len(session_ids)
 
 
-async def decapsulate_token(context: BasicSchoolIdolContext, token_data: str):
+def _load_token(token_data: str):
     encoded_data = base64.urlsafe_b64decode(token_data)
     salt, result = encoded_data[:SALT_SIZE], encoded_data[SALT_SIZE:]
     try:
         token: str = TOKEN_SERIALIZER.loads(result, salt)
     except itsdangerous.BadSignature:
         return None
+    return token
 
-    # Get token
-    q = sqlalchemy.select(main.Session).where(main.Session.token == token)
-    expiry_time = config.get_session_expiry_time()
-    if expiry_time > 0:
-        q = q.where(main.Session.last_accessed >= (util.time() - expiry_time))
 
+async def _find_session(context: BasicSchoolIdolContext, token: str):
+    q = sqlalchemy.select(main.Session).where(main.Session.token == token)
     result = await context.db.main.execute(q)
     session = result.scalar()
     if session is None:
         return None
 
-    session.last_accessed = util.time()
-    return TokenData(client_key=session.client_key, server_key=session.server_key, user_id=session.user_id or 0)
+    return _CachedSession(
+        id=session.id,
+        data=TokenData(client_key=session.client_key, server_key=session.server_key, user_id=session.user_id or 0),
+        last_accessed=max(session.last_accessed, _pending_access.get(session.id, 0)),
+        valid_until=time.monotonic() + config.get_session_cache_ttl(),
+    )
+
+
+async def decapsulate_token(context: BasicSchoolIdolContext, token_data: str):
+    token = _load_token(token_data)
+    if token is None:
+        return None
+
+    # Get token
+    session = _session_cache.get(token)
+    if session is None or session.valid_until < time.monotonic():
+        session = await _find_session(context, token)
+        if session is None:
+            _session_cache.pop(token, None)
+            return None
+
+        if config.get_session_cache_ttl() > 0:
+            _session_cache.pop(token, None)
+            _session_cache[token] = session
+            while len(_session_cache) > SESSION_CACHE_SIZE:
+                del _session_cache[next(iter(_session_cache))]
+
+    t = util.time()
+    expiry_time = config.get_session_expiry_time()
+    if expiry_time > 0 and session.last_accessed < (t - expiry_time):
+        return None
+
+    session.last_accessed = t
+    if config.get_session_access_flush_interval() > 0:
+        _pending_access[session.id] = t
+    else:
+        q = sqlalchemy.update(main.Session).where(main.Session.id == session.id).values(last_accessed=t)
+        await context.db.main.execute(q)
+
+    return session.data
+
+
+def get_pending_session_access(limit: int = 1000):
+    """Get at most `limit` session access times which are not written to the database yet, as (session ID, time)."""
+    return list(itertools.islice(_pending_access.items(), limit))
+
+
+async def write_session_access(context: BasicSchoolIdolContext, pending: list[tuple[int, int]], /):
+    """Write session access times from `get_pending_session_access` to the database.
+
+    They stay pending until `discard_session_access` is called after the transaction is committed, so they're written
+    again later if it's rolled back."""
+    # Core statement, so sessions which are deleted in the meantime are simply skipped.
+    table = cast(sqlalchemy.Table, main.Session.__table__)
+    q = (
+        sqlalchemy.update(table)
+        .where(table.c.id == sqlalchemy.bindparam("session_id"))
+        .values(last_accessed=sqlalchemy.bindparam("t"))
+    )
+    await context.db.main.execute(q, [{"session_id": session_id, "t": t} for session_id, t in pending])
+    await context.db.main.flush()
+
+
+def discard_session_access(written: list[tuple[int, int]], /):
+    """Stop tracking the written session access times, except of sessions which are accessed again since then."""
+    for session_id, t in written:
+        if _pending_access.get(session_id) == t:
+            del _pending_access[session_id]
+
+
+def invalidate_user_sessions(user_id: int):
+    """Drop all cached sessions of the user, e.g. after the user is locked or deleted."""
+    for token, session in list(_session_cache.items()):
+        if session.data.user_id == user_id:
+            del _session_cache[token]
 
 
 async def invalidate_current(context: SchoolIdolParams):
     if context.token_text is not None:
+        token = _load_token(context.token_text)
+        if token is not None:
+            cached = _session_cache.pop(token, None)
+            if cached is not None:
+                _pending_access.pop(cached.id, None)
+
         q = sqlalchemy.delete(main.Session).where(main.Session.token == context.token_text)
         await context.db.main.execute(q)
         await context.db.main.flush()
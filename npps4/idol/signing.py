@@ -0,0 +1,101 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import dataclasses
+import time
+
+from .. import util
+from ..app import app
+from ..config import config
+
+
+@dataclasses.dataclass(kw_only=True)
+class SigningStats:
+    threads: int
+    queue_size: int
+    pending: int
+    signed: int
+    total_time: float
+    max_time: float
+    last_time: float
+
+
+class ResponseSigner:
+    """Signs the responses in a thread pool, so the RSA signature does not block the event loop.
+
+    The big number arithmetic of pycryptodome runs in native code without holding the GIL, so the signatures are
+    computed in parallel. At most `queue_size` responses wait to be signed at once, the rest wait for their turn
+    before being submitted to the pool.
+    """
+
+    def __init__(self, threads: int, queue_size: int):
+        self.threads = threads
+        self.queue_size = queue_size
+        self.executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self.slots: asyncio.Semaphore | None = None
+        self.pending = 0
+        self.signed = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    async def sign(self, content: bytes, request_xmc_hex: str | None):
+        # Latency includes the time spent waiting for a free slot.
+        start = time.perf_counter()
+        self.pending = self.pending + 1
+
+        try:
+            if self.executor is None or self.slots is None:
+                return util.sign_message(content, request_xmc_hex)
+
+            async with self.slots:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, util.sign_message, content, request_xmc_hex)
+        finally:
+            self.pending = self.pending - 1
+            self.last_time = time.perf_counter() - start
+            self.signed = self.signed + 1
+            self.total_time = self.total_time + self.last_time
+            self.max_time = max(self.max_time, self.last_time)
+
+    def stats(self):
+        return SigningStats(
+            threads=self.threads if self.executor is not None else 0,
+            queue_size=self.queue_size,
+            pending=self.pending,
+            signed=self.signed,
+            total_time=self.total_time,
+            max_time=self.max_time,
+            last_time=self.last_time,
+        )
+
+
+SIGNER = ResponseSigner(config.get_signing_threads(), config.get_signing_queue_size())
+
+
+async def sign_message(content: bytes, request_xmc_hex: str | None):
+    return await SIGNER.sign(content, request_xmc_hex)
+
+
+def get_stats():
+    return SIGNER.stats()
+
+
+@contextlib.asynccontextmanager
+async def run_executor():
+    if SIGNER.threads <= 0:
+        yield
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(SIGNER.threads, thread_name_prefix="npps4-signing")
+    SIGNER.slots = asyncio.Semaphore(max(SIGNER.queue_size, 1))
+    SIGNER.executor = executor
+    try:
+        yield
+    finally:
+        SIGNER.executor = None
+        SIGNER.slots = None
+        executor.shutdown(wait=True)
+
+
+app.lifespan_handlers.append(run_executor)
@@ -0,0 +1,189 @@
+import asyncio
+import collections.abc
+import contextlib
+import dataclasses
+import time
+
+import sqlalchemy
+
+from . import idol
+from . import util
+from .app import app
+from .config import config
+from .idol import cache
+from .idol import session
+from .system import reward
+
+
+@dataclasses.dataclass(kw_only=True)
+class MaintenanceTaskStats:
+    interval: int
+    runs: int
+    failures: int
+    last_run: int
+    last_duration: float
+    last_affected: int
+    total_affected: int
+
+
+class MaintenanceTask:
+    """Periodic database maintenance task, run by the scheduler every `interval` seconds.
+
+    `func` returns the amount of rows (or pages) it affected, which is recorded in the stats.
+    """
+
+    def __init__(self, name: str, interval: int, func: collections.abc.Callable[[], collections.abc.Awaitable[int]]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.next_run = time.monotonic() + interval
+        self.runs = 0
+        self.failures = 0
+        self.last_run = 0
+        self.last_duration = 0.0
+        self.last_affected = 0
+        self.total_affected = 0
+
+    async def run(self):
+        start = time.perf_counter()
+        self.runs = self.runs + 1
+        self.last_run = util.time()
+
+        try:
+            self.last_affected = await self.func()
+            self.total_affected = self.total_affected + self.last_affected
+        except Exception as e:
+            self.failures = self.failures + 1
+            self.last_affected = 0
+            util.log("Maintenance task", self.name, "failed", severity=util.logging.ERROR, e=e)
+        finally:
+            self.last_duration = time.perf_counter() - start
+            self.next_run = time.monotonic() + self.interval
+
+        util.log(
+            f"Maintenance task '{self.name}' took {self.last_duration * 1000:.3f}ms, affected {self.last_affected}"
+        )
+
+    def stats(self):
+        return MaintenanceTaskStats(
+            interval=self.interval,
+            runs=self.runs,
+            failures=self.failures,
+            last_run=self.last_run,
+            last_duration=self.last_duration,
+            last_affected=self.last_affected,
+            total_affected=self.total_affected,
+        )
+
+
+async def _run_batched(
+    func: collections.abc.Callable[[idol.BasicSchoolIdolContext, int], collections.abc.Awaitable[int]],
+):
+    """Call `func` repeatedly, each in its own transaction, until it deletes less than a full batch."""
+    batch_size = config.get_maintenance_batch_size()
+    total = 0
+
+    while True:
+        async with idol.BasicSchoolIdolContext() as context:
+            affected = await func(context, batch_size)
+
+        total = total + affected
+        if affected < batch_size:
+            return total
+
+        # Let pending requests go before the next batch.
+        await asyncio.sleep(0)
+
+
+async def cleanup_incentive():
+    return await _run_batched(lambda context, limit: reward.cleanup_incentive(context, limit=limit))
+
+
+async def cleanup_session():
+    # Sessions which are still in use must not be deleted because their access time is not written yet.
+    await flush_session_access()
+    return await _run_batched(lambda context, limit: session.cleanup_session_table(context, limit=limit))
+
+
+async def flush_session_access():
+    batch_size = config.get_maintenance_batch_size()
+    total = 0
+
+    while True:
+        pending = session.get_pending_session_access(batch_size)
+        if not pending:
+            return total
+
+        async with idol.BasicSchoolIdolContext() as context:
+            await session.write_session_access(context, pending)
+
+        # Only forget them once they're committed.
+        session.discard_session_access(pending)
+        total = total + len(pending)
+        if len(pending) < batch_size:
+            return total
+
+        await asyncio.sleep(0)
+
+
+async def cleanup_response():
+    return await _run_batched(lambda context, limit: cache.cleanup_stale_responses(context, limit=limit))
+
+
+async def checkpoint_wal():
+    async with idol.BasicSchoolIdolContext() as context:
+        if context.db.main.get_bind().dialect.name != "sqlite":
+            return 0
+
+        result = await context.db.main.execute(sqlalchemy.text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        row = result.first()
+        # busy, WAL pages, checkpointed pages
+        return 0 if row is None else max(int(row[2]), 0)
+
+
+TASKS: list[MaintenanceTask] = []
+
+
+def get_stats():
+    return {task.name: task.stats() for task in TASKS}
+
+
+async def _scheduler():
+    while True:
+        task = min(TASKS, key=lambda t: t.next_run)
+        delay = task.next_run - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await task.run()
+
+
+@contextlib.asynccontextmanager
+async def run_scheduler():
+    intervals: list[tuple[str, int, collections.abc.Callable[[], collections.abc.Awaitable[int]]]] = [
+        ("incentive", config.get_incentive_cleanup_interval(), cleanup_incentive),
+        ("session", config.get_session_cleanup_interval(), cleanup_session),
+        ("session_access", config.get_session_access_flush_interval(), flush_session_access),
+        ("response", config.get_response_cleanup_interval(), cleanup_response),
+        ("wal_checkpoint", config.get_wal_checkpoint_interval(), checkpoint_wal),
+    ]
+    TASKS[:] = [MaintenanceTask(name, interval, func) for name, interval, func in intervals if interval > 0]
+
+    if TASKS:
+        scheduler = asyncio.create_task(_scheduler())
+        try:
+            yield
+        finally:
+            scheduler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await scheduler
+    else:
+        yield
+
+    # Don't lose the session access times which are not written yet.
+    try:
+        await flush_session_access()
+    except Exception as e:
+        util.log("Cannot write session access times", severity=util.logging.ERROR, e=e)
+
+
+app.lifespan_handlers.append(run_scheduler)
@@ -1,9 +1,15 @@
+import ipaddress
 import os
 
 import fastapi
 
+from . import maintenance
 from .app import app
 from .config import config
+from .db import client
+from .db import main
+from .idol import compression
+from .idol import signing
 
 
 @app.core.get(
@@ -30,3 +36,54 @@ async def server_info(filehash: str):
             )
     else:
         raise fastapi.exceptions.HTTPException(404, "Not found")
+
+
+def _check_stats_access(request: fastapi.Request):
+    if config.is_stats_endpoints_enabled() and request.client is not None:
+        try:
+            if ipaddress.ip_address(request.client.host).is_loopback:
+                return
+        except ValueError:
+            pass
+
+    raise fastapi.exceptions.HTTPException(404, "Not found")
+
+
+@app.core.get("/maintenance_stats", include_in_schema=False, dependencies=[fastapi.Depends(_check_stats_access)])
+async def maintenance_stats() -> dict[str, maintenance.MaintenanceTaskStats]:
+    """
+    Get run statistics of the periodic database maintenance tasks.
+    """
+    return maintenance.get_stats()
+
+
+@app.core.get("/database_stats", include_in_schema=False, dependencies=[fastapi.Depends(_check_stats_access)])
+async def database_stats() -> main.PoolStats:
+    """
+    Get connection pool statistics of the main database.
+    """
+    return main.get_pool_stats()
+
+
+@app.core.get("/master_query_stats", include_in_schema=False, dependencies=[fastapi.Depends(_check_stats_access)])
+async def master_query_stats() -> client.InlineQueryStats:
+    """
+    Get statistics of the client game database queries run directly on the event loop.
+    """
+    return client.get_inline_query_stats()
+
+
+@app.core.get("/signing_stats", include_in_schema=False, dependencies=[fastapi.Depends(_check_stats_access)])
+async def signing_stats() -> signing.SigningStats:
+    """
+    Get statistics of the response signing, including the latency of each signature.
+    """
+    return signing.get_stats()
+
+
+@app.core.get("/compression_stats", include_in_schema=False, dependencies=[fastapi.Depends(_check_stats_access)])
+async def compression_stats() -> dict[str, compression.CompressionStats]:
+    """
+    Get response compression statistics of each endpoint.
+    """
+    return compression.get_stats()
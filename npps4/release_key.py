@@ -1,9 +1,25 @@
+import pydantic_core
+
 _RELEASE_KEYS: dict[int, str] = {}
+_formatted_json: bytes | None = None
 
 get = _RELEASE_KEYS.get
-update = _RELEASE_KEYS.update
+
+
+def update(release_keys: dict[int, str]):
+    global _RELEASE_KEYS, _formatted_json
+    _RELEASE_KEYS.update(release_keys)
+    _formatted_json = None
 
 
 def formatted():
     global _RELEASE_KEYS
     return [{"id": k, "key": v} for k, v in _RELEASE_KEYS.items()]
+
+
+def formatted_json():
+    """`formatted()` encoded as JSON, only re-encoded when the release keys change."""
+    global _formatted_json
+    if _formatted_json is None:
+        _formatted_json = pydantic_core.to_json(formatted(), ensure_ascii=True)
+    return _formatted_json
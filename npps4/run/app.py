@@ -25,6 +25,7 @@ import logging
 import fastapi
 
 from .. import setup  # Needs to be first!
+from .. import data
 from .. import game
 from .. import webview
 from .. import other
@@ -41,6 +42,7 @@ async def not_found_handler(module: str, action: str, request_data: Annotated[by
     raise fastapi.HTTPException(404)
 
 
+app.lifespan_handlers.append(data.watch)
 app.core.include_router(app.main)
 app.core.include_router(app.webview)
 main = app.core
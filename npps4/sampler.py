@@ -0,0 +1,127 @@
+import collections.abc
+import random
+
+from . import data
+from . import util
+
+
+class AliasTable[T]:
+    """Walker alias table for weighted random sampling in constant time.
+
+    Weights are integers, so the probability of each item is exactly its weight divided by the total weight.
+    """
+
+    def __init__(
+        self,
+        items: collections.abc.Sequence[T],
+        weights: collections.abc.Sequence[int],
+        /,
+        rng: random.Random = util.SYSRAND,
+    ):
+        if len(items) != len(weights):
+            raise ValueError("items and weights must have same length")
+        if any(w < 0 for w in weights):
+            raise ValueError("weights must not be negative")
+
+        n = len(items)
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("total weight must be positive")
+
+        self.items = list(items)
+        self.total = total
+        self.rng = rng
+        # Each column is split into the item itself (if below the threshold) and its alias. Thresholds are scaled by
+        # the total weight so no division is needed.
+        self.threshold = [w * n for w in weights]
+        self.alias = list(range(n))
+
+        small = [i for i, t in enumerate(self.threshold) if t < total]
+        large = [i for i, t in enumerate(self.threshold) if t >= total]
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            self.alias[s] = l
+            self.threshold[l] = self.threshold[l] - (total - self.threshold[s])
+            if self.threshold[l] < total:
+                small.append(large.pop())
+
+        # Leftovers are full columns.
+        for i in small + large:
+            self.threshold[i] = total
+
+    @staticmethod
+    def from_pairs[U](pairs: collections.abc.Iterable[tuple[U, int]], /, rng: random.Random = util.SYSRAND):
+        items: list[U] = []
+        weights: list[int] = []
+        for item, weight in pairs:
+            items.append(item)
+            weights.append(weight)
+        return AliasTable(items, weights, rng=rng)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _pick(self, r: int):
+        column, value = divmod(r, self.total)
+        return self.items[column if value < self.threshold[column] else self.alias[column]]
+
+    def sample(self):
+        return self._pick(self.rng.randrange(len(self.items) * self.total))
+
+    def sample_many(self, k: int, /):
+        upper = len(self.items) * self.total
+        return [self._pick(self.rng.randrange(upper)) for _ in range(k)]
+
+
+type _TableBuilder = collections.abc.Callable[[data.ServerData], AliasTable | None]
+
+_last_server_data: data.ServerData | None = None
+_server_data_tables: dict[collections.abc.Hashable, AliasTable | None] = {}
+_builders: dict[collections.abc.Hashable, _TableBuilder] = {}
+# Tables built in advance for newly loaded server data, before it replaces the current one.
+_prepared_tables: tuple[data.ServerData, dict[collections.abc.Hashable, AliasTable | None]] | None = None
+
+
+def get_server_data_table[
+    T
+](key: collections.abc.Hashable, build: collections.abc.Callable[[data.ServerData], AliasTable[T] | None], /):
+    """Get alias table derived from the server data, building it with `build` once per server data version.
+
+    `build` must only depend on the server data passed to it, as it's also used to build the table in advance when
+    the server data is reloaded. Returns None if `build` returns None (e.g. there's nothing to sample).
+    """
+    global _last_server_data, _server_data_tables
+    server_data = data.get()
+
+    if server_data is not _last_server_data:
+        prepared = _prepared_tables
+        _server_data_tables = dict(prepared[1]) if prepared is not None and prepared[0] is server_data else {}
+        _last_server_data = server_data
+
+    table: AliasTable[T] | None
+    if key in _server_data_tables:
+        table = _server_data_tables[key]
+        return table
+
+    _builders.setdefault(key, build)
+    table = build(server_data)
+    _server_data_tables[key] = table
+    return table
+
+
+def _prepare_tables(server_data: data.ServerData):
+    global _prepared_tables
+    tables: dict[collections.abc.Hashable, AliasTable | None] = {}
+
+    for key, build in list(_builders.items()):
+        try:
+            tables[key] = build(server_data)
+        except Exception as e:
+            # Try again when the table is needed.
+            util.log("Cannot build alias table", key, severity=util.logging.WARNING, e=e)
+
+    _prepared_tables = (server_data, tables)
+
+
+data.reload_handlers.append(_prepare_tables)
@@ -1,4 +1,5 @@
 import collections.abc
+import contextlib
 import dataclasses
 
 import pydantic
@@ -16,6 +17,7 @@ from .. import idol
 from .. import util
 from ..db import achievement
 from ..db import main
+from ..db import snapshot
 
 from typing import Callable, Protocol
 
@@ -84,7 +86,12 @@ class AchievementContext:
 
 @common.context_cacheable("achievement")
 async def get_achievement_info(context: idol.BasicSchoolIdolContext, achievement_id: int):
-    info = await db.get_decrypted_row(context.db.achievement, achievement.Achievement, achievement_id)
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        info = master_snapshot.achievement_info.get(achievement_id)
+    else:
+        info = await db.get_decrypted_row(context.db.achievement, achievement.Achievement, achievement_id)
+
     if info is None:
         raise ValueError("invalid achievement")
 
@@ -93,12 +100,121 @@ async def get_achievement_info(context: idol.BasicSchoolIdolContext, achievement
 
 @common.context_cacheable("achievement_story")
 async def get_next_achievement_ids(context: idol.BasicSchoolIdolContext, achievement_id: int):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.next_achievement_ids.get(achievement_id, [])
+
     q = sqlalchemy.select(achievement.Story).where(achievement.Story.achievement_id == achievement_id)
     result = await context.db.achievement.execute(q)
     return list(ach.next_achievement_id for ach in result.scalars())
 
 
-async def add_achievement(
+async def _load_achievement_info_many(context: idol.BasicSchoolIdolContext, achievement_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {
+            i: master_snapshot.achievement_info[i] for i in achievement_ids if i in master_snapshot.achievement_info
+        }
+
+    q = sqlalchemy.select(achievement.Achievement).where(achievement.Achievement.achievement_id.in_(achievement_ids))
+    result = await context.db.achievement.execute(q)
+    infos: dict[int, achievement.Achievement] = {}
+
+    for ach_info in result.scalars():
+        decrypted = db.decrypt_row(context.db.achievement, ach_info)
+        if decrypted is not None:
+            infos[decrypted.achievement_id] = decrypted
+
+    return infos
+
+
+async def _load_next_achievement_ids_many(context: idol.BasicSchoolIdolContext, achievement_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.next_achievement_ids.get(i, []) for i in achievement_ids}
+
+    q = sqlalchemy.select(achievement.Story).where(achievement.Story.achievement_id.in_(achievement_ids))
+    result = await context.db.achievement.execute(q)
+    next_ids: dict[int, list[int]] = {i: [] for i in achievement_ids}
+
+    for story in result.scalars():
+        next_ids[story.achievement_id].append(story.next_achievement_id)
+
+    return next_ids
+
+
+def get_achievement_info_many(context: idol.BasicSchoolIdolContext, achievement_ids: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(context, "achievement", achievement_ids, _load_achievement_info_many)
+
+
+def get_next_achievement_ids_many(context: idol.BasicSchoolIdolContext, achievement_ids: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(context, "achievement_story", achievement_ids, _load_next_achievement_ids_many)
+
+
+class AchievementEngine:
+    """In-memory view of all achievements of an user, shared by the achievement checks in one idol context.
+
+    It's loaded with a single query. Achievement checks are evaluated against it and newly added achievements are
+    tracked in it, so chained and repeated checks don't need to query the database again."""
+
+    def __init__(self, user: main.User, achievements: collections.abc.Iterable[main.Achievement]):
+        self.user = user
+        # Set by `deferred_flush`
+        self.defer_flush = False
+        self.by_achievement_id: dict[int, main.Achievement] = {}
+        self.by_type: dict[int, list[main.Achievement]] = {}
+
+        for ach in achievements:
+            self.track(ach)
+
+    def track(self, ach: main.Achievement):
+        if ach.achievement_id not in self.by_achievement_id:
+            self.by_achievement_id[ach.achievement_id] = ach
+            self.by_type.setdefault(ach.achievement_type, []).append(ach)
+
+    def discard(self, ach: main.Achievement):
+        if self.by_achievement_id.get(ach.achievement_id) is ach:
+            del self.by_achievement_id[ach.achievement_id]
+            self.by_type[ach.achievement_type].remove(ach)
+
+    def has(self, achievement_id: int):
+        return achievement_id in self.by_achievement_id
+
+    def get_unaccomplished(self, achievement_type: int):
+        return [ach for ach in self.by_type.get(achievement_type, []) if not ach.is_accomplished]
+
+    def get_accomplished_ids(self):
+        return [ach.achievement_id for ach in self.by_achievement_id.values() if ach.is_accomplished]
+
+
+def _get_loaded_engine(context: idol.BasicSchoolIdolContext, user: main.User) -> AchievementEngine | None:
+    return context.get_cache("achievement_engine", user.id)
+
+
+async def get_engine(context: idol.BasicSchoolIdolContext, user: main.User, /):
+    engine = _get_loaded_engine(context, user)
+    if engine is None:
+        q = sqlalchemy.select(main.Achievement).where(main.Achievement.user_id == user.id)
+        result = await context.db.main.execute(q)
+        engine = AchievementEngine(user, result.scalars())
+        context.set_cache("achievement_engine", user.id, engine)
+
+    return engine
+
+
+@contextlib.asynccontextmanager
+async def deferred_flush(context: idol.BasicSchoolIdolContext, user: main.User):
+    """Flush the changes of the achievement checks in this block once at the end, instead of after each check."""
+    engine = await get_engine(context, user)
+    engine.defer_flush = True
+    try:
+        yield
+    finally:
+        engine.defer_flush = False
+    await context.db.main.flush()
+
+
+def _new_achievement(
     context: idol.BasicSchoolIdolContext, user: main.User, ach: achievement.Achievement, time: int | None = None
 ):
     if time is None:
@@ -117,11 +233,27 @@ async def add_achievement(
         reset_type=ach.reset_type,
     )
     context.db.main.add(user_ach)
+
+    engine = _get_loaded_engine(context, user)
+    if engine is not None:
+        engine.track(user_ach)
+
+    return user_ach
+
+
+async def add_achievement(
+    context: idol.BasicSchoolIdolContext, user: main.User, ach: achievement.Achievement, time: int | None = None
+):
+    user_ach = _new_achievement(context, user, ach, time)
     await context.db.main.flush()
     return user_ach
 
 
 async def has_achievement(context: idol.BasicSchoolIdolContext, user: main.User, /, achievement_id: int):
+    engine = _get_loaded_engine(context, user)
+    if engine is not None:
+        return engine.has(achievement_id)
+
     q = sqlalchemy.select(main.Achievement.achievement_id).where(
         main.Achievement.achievement_id == achievement_id, main.Achievement.user_id == user.id
     )
@@ -139,6 +271,7 @@ async def update_resettable_achievement(
         return
 
     modified = False
+    engine = _get_loaded_engine(context, user)
     q = sqlalchemy.select(main.Achievement).where(
         main.Achievement.user_id == user.id,
         main.Achievement.reset_type > 0,
@@ -158,6 +291,8 @@ async def update_resettable_achievement(
 
         if ach_info is None or (not ach_info.default_open_flag):
             await context.db.main.delete(ach_data)
+            if engine is not None:
+                engine.discard(ach_data)
         else:
             ach_data.is_accomplished = False
             ach_data.is_reward_claimed = False
@@ -273,6 +408,12 @@ async def mark_achievement_reward_claimed(context: idol.BasicSchoolIdolContext,
 async def get_achievement_count(
     context: idol.BasicSchoolIdolContext, user: main.User, accomplished: bool | None = None
 ):
+    engine = _get_loaded_engine(context, user)
+    if engine is not None:
+        if accomplished is None:
+            return len(engine.by_achievement_id)
+        return sum(ach.is_accomplished == accomplished for ach in engine.by_achievement_id.values())
+
     if accomplished is not None:
         q = (
             sqlalchemy.select(sqlalchemy.func.count())
@@ -299,37 +440,31 @@ async def test_params(ach_info: achievement.Achievement, args: collections.abc.S
     return True
 
 
-async def check_type_countable(
+async def _evaluate(
     context: idol.BasicSchoolIdolContext,
     user: main.User,
     achievement_type: int,
-    count: int,
-    pindex: int = 1,
-    *args: int | None,
-    test: Callable[
-        [achievement.Achievement, collections.abc.Sequence[int | None]], collections.abc.Awaitable[bool]
-    ] = test_params,
+    get_count: Callable[[main.Achievement], int],
+    pindex: int,
+    args: collections.abc.Sequence[int | None],
+    test: Callable[[achievement.Achievement, collections.abc.Sequence[int | None]], collections.abc.Awaitable[bool]],
+    time: int,
 ):
-    time = util.time()
-    await update_resettable_achievement(context, user, time)
-
-    q = sqlalchemy.select(main.Achievement).where(
-        main.Achievement.user_id == user.id,
-        main.Achievement.achievement_type == achievement_type,
-        main.Achievement.is_accomplished == False,
-    )
-    result = await context.db.main.execute(q)
+    engine = await get_engine(context, user)
+    unaccomplished = engine.get_unaccomplished(achievement_type)
+    ach_infos = await get_achievement_info_many(context, (ach.achievement_id for ach in unaccomplished))
 
     achieved: list[main.Achievement] = []
     new: list[main.Achievement] = []
 
-    for ach in result.scalars():
-        ach_info = await get_achievement_info(context, ach.achievement_id)
+    for ach in unaccomplished:
+        ach_info = ach_infos[ach.achievement_id]
         if ach_info is None:
             raise ValueError("achievement info is none, database is corrupted?")
 
         if await test(ach_info, args):
             target_amount = int(getattr(ach_info, f"params{pindex}", None) or 1)
+            count = get_count(ach)
             if count >= target_amount:
                 # Achieved.
                 ach.count = min(count, target_amount)
@@ -342,82 +477,58 @@ async def check_type_countable(
                         ach.reset_value = util.get_days_since_unix(time)
                     case 2:
                         ach.reset_value = util.get_weeks_since_unix(time)
-
-                # New achievement
-                for next_ach_id in await get_next_achievement_ids(context, ach.achievement_id):
-                    new_ach_info = await get_achievement_info(context, next_ach_id)
-                    if new_ach_info is not None and not await has_achievement(
-                        context, user, new_ach_info.achievement_id
-                    ):
-                        new_ach = await add_achievement(context, user, new_ach_info, time)
-                        # Append to new achievement
-                        new.append(new_ach)
             else:
                 ach.count = count
 
-            await context.db.main.flush()
+    # New achievement
+    if achieved:
+        next_ach_ids = await get_next_achievement_ids_many(context, (ach.achievement_id for ach in achieved))
+        new_ach_infos = await get_achievement_info_many(
+            context, (i for ids in next_ach_ids.values() if ids is not None for i in ids)
+        )
+
+        for ach in achieved:
+            for next_ach_id in next_ach_ids[ach.achievement_id] or []:
+                new_ach_info = new_ach_infos[next_ach_id]
+                if new_ach_info is not None and not engine.has(new_ach_info.achievement_id):
+                    # Append to new achievement
+                    new.append(_new_achievement(context, user, new_ach_info, time))
 
-    await context.db.main.flush()
+    if not engine.defer_flush:
+        await context.db.main.flush()
     return AchievementContext(accomplished=achieved, new=new)
 
 
-async def check_type_increment(
+async def check_type_countable(
     context: idol.BasicSchoolIdolContext,
     user: main.User,
     achievement_type: int,
-    increment: bool,
+    count: int,
     pindex: int = 1,
     *args: int | None,
     test: Callable[
         [achievement.Achievement, collections.abc.Sequence[int | None]], collections.abc.Awaitable[bool]
     ] = test_params,
 ):
-    q = sqlalchemy.select(main.Achievement).where(
-        main.Achievement.user_id == user.id,
-        main.Achievement.achievement_type == achievement_type,
-        main.Achievement.is_accomplished == False,
-    )
-    result = await context.db.main.execute(q)
-
     time = util.time()
-    achieved: list[main.Achievement] = []
-    new: list[main.Achievement] = []
-
-    for ach in result.scalars():
-        ach_info = await get_achievement_info(context, ach.achievement_id)
-        if ach_info is None:
-            raise ValueError("achievement info is none, database is corrupted?")
-
-        if await test(ach_info, args):
-            target_amount = int(getattr(ach_info, f"params{pindex}", None) or 1)
-            count = ach.count + increment
-            if count >= target_amount:
-                # Achieved.
-                ach.count = min(count, target_amount)
-                ach.is_accomplished = True
-                achieved.append(ach)
-
-                # Update reset value
-                match ach.reset_type:
-                    case 1:
-                        ach.reset_value = util.get_days_since_unix(time)
-                    case 2:
-                        ach.reset_value = util.get_weeks_since_unix(time)
+    await update_resettable_achievement(context, user, time)
+    return await _evaluate(context, user, achievement_type, lambda _: count, pindex, args, test, time)
 
-                # New achievement
-                for next_ach_id in await get_next_achievement_ids(context, ach.achievement_id):
-                    new_ach_info = await get_achievement_info(context, next_ach_id)
-                    if new_ach_info is not None and not await has_achievement(
-                        context, user, new_ach_info.achievement_id
-                    ):
-                        new_ach = await add_achievement(context, user, new_ach_info, time)
-                        # Append to new achievement
-                        new.append(new_ach)
-            else:
-                ach.count = count
 
-    await context.db.main.flush()
-    return AchievementContext(accomplished=achieved, new=new)
+async def check_type_increment(
+    context: idol.BasicSchoolIdolContext,
+    user: main.User,
+    achievement_type: int,
+    increment: bool,
+    pindex: int = 1,
+    *args: int | None,
+    test: Callable[
+        [achievement.Achievement, collections.abc.Sequence[int | None]], collections.abc.Awaitable[bool]
+    ] = test_params,
+):
+    return await _evaluate(
+        context, user, achievement_type, lambda ach: ach.count + increment, pindex, args, test, util.time()
+    )
 
 
 class RecursiveAchievementCall[**P](Protocol):
@@ -746,11 +857,8 @@ async def get_achievement_filter_ids(context: idol.BasicSchoolIdolContext):
 
 async def count_accomplished_achievement_by_category(context: idol.BasicSchoolIdolContext, user: main.User):
     # Get all achieved
-    q = sqlalchemy.select(main.Achievement.achievement_id).where(
-        main.Achievement.user_id == user.id, main.Achievement.is_accomplished == True
-    )
-    result = await context.db.main.execute(q)
-    all_accomplished = list(result.scalars())
+    engine = await get_engine(context, user)
+    all_accomplished = engine.get_accomplished_ids()
 
     q = (
         sqlalchemy.select(achievement.Tag)
@@ -4,6 +4,7 @@ import dataclasses
 import pydantic
 import sqlalchemy
 
+from . import album
 from . import award
 from . import background
 from . import common
@@ -187,6 +188,118 @@ async def add_item(context: idol.BasicSchoolIdolContext, user: main.User, i: com
     return AddResult(False)  # TODO
 
 
+type _RowWithAmount = (
+    main.Item | main.RecoveryItem | main.RemovableSkillInfo | main.ExchangePointItem | main.UnitSupporter
+)
+
+
+def _add_grouped_amount(
+    items: collections.abc.Sequence[common.AnyItem],
+    groups: dict[int, list[int]],
+    rows: collections.abc.Mapping[int, _RowWithAmount],
+    results: list[bool],
+):
+    for item_id, indices in groups.items():
+        row = rows[item_id]
+        row.amount = row.amount + sum(items[index].amount for index in indices)
+        for index in indices:
+            results[index] = True
+
+
+async def add_items(
+    context: idol.BasicSchoolIdolContext, user: main.User, items: collections.abc.Sequence[common.AnyItem]
+):
+    """Add multiple items at once. Returns list of whetever each item is added.
+
+    Same as calling `add_item` for each item, except items of same kind are added together with one query each and
+    unit slot expansions are applied before adding the units."""
+    results = [False] * len(items)
+    general_items: dict[int, list[int]] = {}
+    recovery_items: dict[int, list[int]] = {}
+    removable_skills: dict[int, list[int]] = {}
+    exchange_points: dict[int, list[int]] = {}
+    supporter_units: dict[int, list[int]] = {}
+    unit_indices: list[int] = []
+
+    for index, i in enumerate(items):
+        match i.add_type:
+            case const.ADD_TYPE.ITEM if i.item_id not in (2, 3, 4):
+                general_items.setdefault(i.item_id, []).append(index)
+            case const.ADD_TYPE.RECOVER_LP_ITEM:
+                recovery_items.setdefault(i.item_id, []).append(index)
+            case const.ADD_TYPE.SCHOOL_IDOL_SKILL:
+                removable_skills.setdefault(i.item_id, []).append(index)
+            case const.ADD_TYPE.EXCHANGE_POINT:
+                if i.amount < 1:
+                    raise ValueError("invalid amount")
+                exchange_points.setdefault(i.item_id, []).append(index)
+            case const.ADD_TYPE.UNIT:
+                unit_indices.append(index)
+            case _:
+                # Currencies (user data) and unlocks.
+                results[index] = bool(await add_item(context, user, i))
+
+    if unit_indices:
+        unit_infos = await unit.get_unit_info_many(context, (items[index].item_id for index in unit_indices))
+        unit_cnt = await unit.count_units(context, user, True)
+        new_units: list[tuple[main.Unit, unit_model.UnitItem, int]] = []
+
+        for index in unit_indices:
+            i = items[index]
+            unit_info = unit_infos[i.item_id]
+            if unit_info is None:
+                raise ValueError("invalid unit_id")
+
+            if unit_info.disable_rank_up > 0:
+                if i.amount < 1:
+                    raise ValueError("invalid amount")
+                supporter_units.setdefault(i.item_id, []).append(index)
+            elif (unit_cnt + i.amount) < user.unit_max:
+                assert type(i) is not unit_model.UnitSupportItem
+
+                for _ in range(i.amount):
+                    if isinstance(i, unit_model.UnitItem):
+                        unit_item = i
+                    else:
+                        unit_item = await unit.create_unit_item(context, i.item_id)
+                        assert isinstance(unit_item, unit_model.UnitItem)
+
+                    unit_data = await unit.create_unit_data(context, user, unit_item, True)
+                    new_units.append((unit_data, unit_item, index))
+
+                unit_cnt = unit_cnt + i.amount
+                results[index] = True
+
+        if new_units:
+            await unit.add_units_by_object(context, user, [unit_data for unit_data, _, _ in new_units])
+
+            for unit_data, unit_item, index in new_units:
+                unit_item.unit_owning_user_id = unit_data.id
+                if unit_item is not items[index]:
+                    util.copy_attr(unit_item, items[index])
+
+    if general_items:
+        rows = await item.get_item_data_guaranteed_many(context, user, general_items.keys())
+        _add_grouped_amount(items, general_items, rows, results)
+    if recovery_items:
+        rows = await item.get_recovery_item_data_guaranteed_many(context, user, recovery_items.keys())
+        _add_grouped_amount(items, recovery_items, rows, results)
+    if removable_skills:
+        rows = await unit.get_removable_skill_info_guaranteed_many(context, user, removable_skills.keys())
+        _add_grouped_amount(items, removable_skills, rows, results)
+    if exchange_points:
+        rows = await exchange.get_exchange_points_guaranteed(context, user, exchange_points.keys())
+        _add_grouped_amount(items, exchange_points, rows, results)
+    if supporter_units:
+        rows = await unit.get_supporter_units_guaranteed(context, user, supporter_units.keys())
+        _add_grouped_amount(items, supporter_units, rows, results)
+        for album_data in (await album.get_many_guaranteed(context, user, supporter_units.keys())).values():
+            album.apply(album_data, True, True, True)
+
+    await context.db.main.flush()
+    return results
+
+
 async def get_user_guest_party_info(context: idol.BasicSchoolIdolContext, user: main.User) -> PartyInfo:
     party_user_info = PartyUserInfo(user_id=user.id, name=user.name, level=user.level)
 
@@ -1,3 +1,5 @@
+import collections.abc
+
 import sqlalchemy
 
 from . import achievement
@@ -18,21 +20,43 @@ async def update(
     favorite_point: int = 0,
     sign_flag: bool = False,
 ):
-    q = sqlalchemy.select(main.Album).where(main.Album.user_id == user.id, main.Album.unit_id == unit_id)
+    album = (await get_many_guaranteed(context, user, (unit_id,)))[unit_id]
+    apply(album, rank_max, love_max, rank_level_max, highest_love, favorite_point, sign_flag)
+    await context.db.main.flush()
+
+
+async def get_many_guaranteed(
+    context: idol.BasicSchoolIdolContext, user: main.User, /, unit_ids: collections.abc.Iterable[int]
+):
+    unit_ids = set(unit_ids)
+    q = sqlalchemy.select(main.Album).where(main.Album.user_id == user.id, main.Album.unit_id.in_(unit_ids))
     result = await context.db.main.execute(q)
-    album = result.scalar()
+    albums = {album.unit_id: album for album in result.scalars()}
 
-    if album is None:
+    for unit_id in unit_ids - albums.keys():
         album = main.Album(user_id=user.id, unit_id=unit_id)
         context.db.main.add(album)
+        albums[unit_id] = album
+
+    return albums
 
+
+def apply(
+    album: main.Album,
+    /,
+    rank_max: bool = False,
+    love_max: bool = False,
+    rank_level_max: bool = False,
+    highest_love: int = 0,
+    favorite_point: int = 0,
+    sign_flag: bool = False,
+):
     album.rank_max_flag = rank_max or album.rank_max_flag
     album.love_max_flag = love_max or album.love_max_flag
     album.rank_level_max_flag = rank_level_max or album.rank_level_max_flag
     album.highest_love_per_unit = max(album.highest_love_per_unit, highest_love)
     album.favorite_point = max(album.favorite_point, favorite_point)
     album.sign_flag = sign_flag or album.sign_flag
-    await context.db.main.flush()
 
 
 async def all(context: idol.BasicSchoolIdolContext, user: main.User):
@@ -5,6 +5,7 @@ import pydantic
 
 from . import item_model
 from . import live_model
+from . import master_cache
 from . import scenario_model
 from . import unit_model
 from .. import idol
@@ -53,13 +54,65 @@ async def get_cached[
     return result
 
 
+async def get_master_cached[
+    T: Hashable, U
+](
+    context: idol.BasicSchoolIdolContext,
+    key: str,
+    id: T,
+    miss: Callable[[idol.BasicSchoolIdolContext, T], collections.abc.Awaitable[U]],
+    /,
+):
+    result: U | None = master_cache.MASTER_DATA.get(key, id)
+
+    if result is None:
+        result = await miss(context, id)
+        master_cache.MASTER_DATA.set(key, id, result)
+
+    return result
+
+
+async def get_master_cached_many[
+    T: Hashable, U
+](
+    context: idol.BasicSchoolIdolContext,
+    key: str,
+    ids: collections.abc.Iterable[T],
+    miss: Callable[[idol.BasicSchoolIdolContext, list[T]], collections.abc.Awaitable[dict[T, U]]],
+    /,
+):
+    """Batched `get_master_cached`. `miss` is called at most once with all the identifiers not in the cache."""
+    result: dict[T, U | None] = {}
+    missing: list[T] = []
+
+    for id in ids:
+        if id not in result:
+            cached: U | None = master_cache.MASTER_DATA.get(key, id)
+            result[id] = cached
+            if cached is None:
+                missing.append(id)
+
+    if missing:
+        loaded = await miss(context, missing)
+        for id in missing:
+            value = loaded.get(id)
+            master_cache.MASTER_DATA.set(key, id, value)
+            result[id] = value
+
+    return result
+
+
 def context_cacheable(cache_key: str):
-    """Decorator to allow caching result based on current idol context."""
+    """Decorator to allow caching result of immutable master data lookup across all idol contexts.
+
+    Only use this for data derived from the client game database. Per-user data must use `get_cached` instead, which
+    only lives as long as the current idol context.
+    """
 
     def wrap0[T: Hashable, U](f: Callable[[idol.BasicSchoolIdolContext, T], collections.abc.Awaitable[U]]):
         @functools.wraps(f)
         async def wrap(context: idol.BasicSchoolIdolContext, identifier: T, /):
-            return await get_cached(context, cache_key, identifier, f)
+            return await get_master_cached(context, cache_key, identifier, f)
 
         # In particular, Hashable and ParamSpec are umually exclusive. Making the type of "f" a generic that needs to
         # be said Callable is also not possible because Python doesn't allow nesting Generics. VSCode seems able to
@@ -83,6 +83,24 @@ async def get_exchange_point(
     return exchange_point
 
 
+async def get_exchange_points_guaranteed(
+    context: idol.BasicSchoolIdolContext, /, user: main.User, exchange_point_ids: collections.abc.Iterable[int]
+):
+    exchange_point_ids = set(exchange_point_ids)
+    q = sqlalchemy.select(main.ExchangePointItem).where(
+        main.ExchangePointItem.user_id == user.id, main.ExchangePointItem.exchange_point_id.in_(exchange_point_ids)
+    )
+    result = await context.db.main.execute(q)
+    exchange_points = {i.exchange_point_id: i for i in result.scalars()}
+
+    for exchange_point_id in exchange_point_ids - exchange_points.keys():
+        exchange_point = main.ExchangePointItem(user_id=user.id, exchange_point_id=exchange_point_id)
+        context.db.main.add(exchange_point)
+        exchange_points[exchange_point_id] = exchange_point
+
+    return exchange_points
+
+
 async def get_exchange_point_list(
     context: idol.BasicSchoolIdolContext, user: main.User, /
 ) -> collections.abc.Iterable[main.ExchangePointItem]:
@@ -258,10 +276,4 @@ async def get_exchange_item_info(context: idol.BasicSchoolIdolContext, /, user:
 
 
 async def find_raw_exchange_item_info_by_id(context: idol.BasicSchoolIdolContext, exchange_item_id: int, /):
-    server_data = data.get()
-
-    for raw_info in server_data.sticker_shop:
-        if raw_info._internal_id == exchange_item_id:
-            return raw_info
-
-    return None
+    return data.get().sticker_shop_index.get(exchange_item_id)
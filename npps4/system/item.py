@@ -1,3 +1,5 @@
+import collections.abc
+
 import sqlalchemy
 
 from . import common
@@ -98,6 +100,22 @@ async def get_item_data_guaranteed(context: idol.BasicSchoolIdolContext, /, user
     return item_data
 
 
+async def get_item_data_guaranteed_many(
+    context: idol.BasicSchoolIdolContext, /, user: main.User, item_ids: collections.abc.Iterable[int]
+):
+    item_ids = set(item_ids)
+    q = sqlalchemy.select(main.Item).where(main.Item.user_id == user.id, main.Item.item_id.in_(item_ids))
+    result = await context.db.main.execute(q)
+    items = {i.item_id: i for i in result.scalars()}
+
+    for item_id in item_ids - items.keys():
+        item_data = main.Item(user_id=user.id, item_id=item_id)
+        context.db.main.add(item_data)
+        items[item_id] = item_data
+
+    return items
+
+
 async def add_item(context: idol.BasicSchoolIdolContext, /, user: main.User, item_id: int, amount: int):
     match item_id:
         case 2:
@@ -142,6 +160,24 @@ async def get_recovery_item_data_guaranteed(
     return item_data
 
 
+async def get_recovery_item_data_guaranteed_many(
+    context: idol.BasicSchoolIdolContext, /, user: main.User, recovery_item_ids: collections.abc.Iterable[int]
+):
+    recovery_item_ids = set(recovery_item_ids)
+    q = sqlalchemy.select(main.RecoveryItem).where(
+        main.RecoveryItem.user_id == user.id, main.RecoveryItem.item_id.in_(recovery_item_ids)
+    )
+    result = await context.db.main.execute(q)
+    items = {i.item_id: i for i in result.scalars()}
+
+    for recovery_item_id in recovery_item_ids - items.keys():
+        item_data = main.RecoveryItem(user_id=user.id, item_id=recovery_item_id)
+        context.db.main.add(item_data)
+        items[recovery_item_id] = item_data
+
+    return items
+
+
 async def add_recovery_item(
     context: idol.BasicSchoolIdolContext, /, user: main.User, recovery_item_id: int, amount: int
 ):
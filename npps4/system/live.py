@@ -1,5 +1,6 @@
 import collections.abc
 
+import pydantic
 import sqlalchemy
 
 from . import common
@@ -12,6 +13,8 @@ from .. import util
 from ..config import config
 from ..db import main
 from ..db import live
+from ..db import snapshot
+from ..idol import fragment
 
 from typing import Literal, overload
 
@@ -163,6 +166,12 @@ async def get_normal_live_clear_status_of_track(
 
 @common.context_cacheable("live_info")
 async def get_live_info_table(context: idol.BasicSchoolIdolContext, live_difficulty_id: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.special_live.get(live_difficulty_id) or master_snapshot.normal_live.get(
+            live_difficulty_id
+        )
+
     live_info = await context.db.live.get(live.SpecialLive, live_difficulty_id)
     if live_info is None:
         live_info = await context.db.live.get(live.NormalLive, live_difficulty_id)
@@ -171,6 +180,10 @@ async def get_live_info_table(context: idol.BasicSchoolIdolContext, live_difficu
 
 @common.context_cacheable("live_setting")
 async def get_live_setting(context: idol.BasicSchoolIdolContext, live_setting_id: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.live_setting.get(live_setting_id)
+
     return await db.get_decrypted_row(context.db.live, live.LiveSetting, live_setting_id)
 
 
@@ -192,18 +205,16 @@ async def get_live_setting_from_difficulty_id(context: idol.BasicSchoolIdolConte
     return await get_live_setting(context, live_info.live_setting_id)
 
 
-async def get_live_info(context: idol.BasicSchoolIdolContext, live_difficulty_id: int, live_setting: live.LiveSetting):
-    beatmap_protocol = config.get_beatmap_provider_protocol()
-    beatmap_data = await beatmap_protocol.get_beatmap_data(live_setting.notes_setting_asset, context)
-    if beatmap_data is None:
-        return None
+# Encoded note lists by live setting ID and the beatmap version reported by the beatmap provider.
+_live_notes_cache: collections.OrderedDict[
+    tuple[int, collections.abc.Hashable], fragment.EncodedList[live_model.LiveNote]
+] = collections.OrderedDict()
+_live_notes_adapter = pydantic.TypeAdapter(list[live_model.LiveNote])
 
-    # TODO: Randomize
-    return live_model.LiveInfoWithNotes(
-        live_difficulty_id=live_difficulty_id,
-        ac_flag=live_setting.ac_flag,
-        swing_flag=live_setting.swing_flag,
-        notes_list=[
+
+def _encode_live_notes(beatmap_data: collections.abc.Iterable):
+    return fragment.EncodedList(
+        [
             live_model.LiveNote(
                 timing_sec=l.timing_sec,
                 notes_attribute=l.notes_attribute,
@@ -216,6 +227,52 @@ async def get_live_info(context: idol.BasicSchoolIdolContext, live_difficulty_id
             )
             for l in beatmap_data
         ],
+        _live_notes_adapter,
+    )
+
+
+async def _get_live_notes(context: idol.BasicSchoolIdolContext, live_setting: live.LiveSetting):
+    beatmap_protocol = config.get_beatmap_provider_protocol()
+    cache_size = config.get_live_notes_cache_size()
+    key = None
+
+    # Only beatmap providers which can tell when a beatmap changes have their beatmaps cached.
+    get_beatmap_version = getattr(beatmap_protocol, "get_beatmap_version", None)
+    if cache_size > 0 and get_beatmap_version is not None:
+        version = await get_beatmap_version(live_setting.notes_setting_asset, context)
+        if version is not None:
+            key = (live_setting.live_setting_id, version)
+            notes_list = _live_notes_cache.get(key)
+            if notes_list is not None:
+                _live_notes_cache.move_to_end(key)
+                return notes_list
+
+    beatmap_data = await beatmap_protocol.get_beatmap_data(live_setting.notes_setting_asset, context)
+    if beatmap_data is None:
+        return None
+
+    notes_list = _encode_live_notes(beatmap_data)
+
+    if key is not None:
+        _live_notes_cache[key] = notes_list
+        while len(_live_notes_cache) > cache_size:
+            _live_notes_cache.popitem(last=False)
+
+    return notes_list
+
+
+async def get_live_info(context: idol.BasicSchoolIdolContext, live_difficulty_id: int, live_setting: live.LiveSetting):
+    notes_list = await _get_live_notes(context, live_setting)
+    if notes_list is None:
+        return None
+
+    # TODO: Randomize
+    # Construct without validation so the notes list keeps its pre-encoded JSON.
+    return live_model.LiveInfoWithNotes.model_construct(
+        live_difficulty_id=live_difficulty_id,
+        ac_flag=live_setting.ac_flag,
+        swing_flag=live_setting.swing_flag,
+        notes_list=notes_list,
     )
 
 
@@ -231,6 +288,10 @@ async def get_live_info_without_notes(
 
 @common.context_cacheable("live_goal_reward")
 async def get_goal_list_by_live_difficulty_id(context: idol.BasicSchoolIdolContext, live_difficulty_id: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.live_goal_reward.get(live_difficulty_id, [])
+
     q = sqlalchemy.select(live.LiveGoalReward).where(live.LiveGoalReward.live_difficulty_id == live_difficulty_id)
     result = await context.db.live.execute(q)
     return list(result.scalars())
@@ -335,6 +396,10 @@ async def get_goal_rewards(context: idol.BasicSchoolIdolContext, goal_ids: list[
 
 @common.context_cacheable("live_setting_ids_from_track")
 async def get_live_setting_ids_from_track_id(context: idol.BasicSchoolIdolContext, live_track_id: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.live_setting_ids_by_track.get(live_track_id, [])
+
     q = sqlalchemy.select(live.LiveSetting.live_setting_id).where(live.LiveSetting.live_track_id == live_track_id)
     result = await context.db.live.execute(q)
     return list(result.scalars())
@@ -2,8 +2,9 @@ import pydantic
 
 from . import item_model
 from .. import const
+from ..idol import fragment
 
-from typing import Literal
+from typing import Annotated, Literal
 
 
 class LiveNote(pydantic.BaseModel):
@@ -25,7 +26,7 @@ class LiveInfo(pydantic.BaseModel):
 
 
 class LiveInfoWithNotes(LiveInfo):
-    notes_list: list[LiveNote]
+    notes_list: Annotated[list[LiveNote], pydantic.WrapSerializer(fragment.serialize)]
 
 
 class LiveStatus(pydantic.BaseModel):
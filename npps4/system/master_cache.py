@@ -0,0 +1,111 @@
+import collections
+import dataclasses
+import time
+
+from .. import util
+from ..config import config
+from ..db import client
+from ..db import snapshot
+from ..download import download
+
+from typing import Any, Hashable
+
+
+def get_master_data_version():
+    return (
+        download.get_server_version(),
+        tuple(client.DATABASE_PATHS.values()),
+    )
+
+
+@dataclasses.dataclass(kw_only=True)
+class MasterDataCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    max_size: int
+
+
+class MasterDataCache:
+    """Process-wide LRU cache for immutable master data lookups.
+
+    Entries are keyed by the cache key and the lookup identifier. The whole cache is dropped when the server version or
+    the path of the client game database changes, which is checked every `master_data_version_check_interval` seconds,
+    so master data of the previous version may be served for that long.
+
+    Cached rows are shared by all requests for the lifetime of the process, so they must be treated as read-only.
+    Copy them before modifying.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._data: collections.OrderedDict[tuple[str, Hashable], Any] = collections.OrderedDict()
+        self._version: tuple[tuple[int, int], tuple[str, ...]] | None = None
+        self._last_version_check = 0.0
+
+    @property
+    def version(self):
+        self.check_version()
+        assert self._version is not None
+        return self._version
+
+    def check_version(self):
+        t = time.monotonic()
+        if self._version is None or (t - self._last_version_check) >= config.get_master_data_version_check_interval():
+            self._last_version_check = t
+            version = get_master_data_version()
+            if version != self._version:
+                if self._version is not None:
+                    util.log("Master data version changed, invalidating master data cache", self._version, version)
+                    self.invalidate()
+                self._version = version
+
+    def invalidate(self):
+        self._data.clear()
+        self.invalidations = self.invalidations + 1
+
+    def get(self, key: str, id: Hashable):
+        self.check_version()
+        k = (key, id)
+        result = self._data.get(k)
+
+        if result is None:
+            self.misses = self.misses + 1
+        else:
+            self._data.move_to_end(k)
+            self.hits = self.hits + 1
+
+        return result
+
+    def set(self, key: str, id: Hashable, value: Any):
+        if value is None or self.max_size <= 0:
+            return
+
+        k = (key, id)
+        self._data[k] = value
+        self._data.move_to_end(k)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions = self.evictions + 1
+
+    def stats(self):
+        return MasterDataCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            size=len(self._data),
+            max_size=self.max_size,
+        )
+
+
+MASTER_DATA = MasterDataCache(config.get_master_data_cache_size())
+# Build the master data snapshot at startup, not on the first request.
+snapshot.init(lambda: MASTER_DATA.version)
@@ -1,10 +1,12 @@
-import asyncio
 import collections.abc
+import dataclasses
 import enum
 import json
 
 import pydantic
 import sqlalchemy
+import sqlalchemy.event
+import sqlalchemy.orm
 
 from . import advanced
 from . import item_model
@@ -32,26 +34,76 @@ class FilterConfig(pydantic.BaseModel):
     category: RewardCategory
 
 
-async def cleanup_incentive(context: idol.BasicSchoolIdolContext, time: int = 0):
-    if time == 0:
-        time = util.time()
+@dataclasses.dataclass
+class _PresentCount:
+    count: int
+    # Last time the count is valid, either because an incentive expires afterwards or the entry gets too old.
+    valid_until: int
 
-    q = sqlalchemy.delete(main.Incentive).where(main.Incentive.expire_date != 0, main.Incentive.expire_date < time)
-    await context.db.main.execute(q)
-    await context.db.main.flush()
+
+# How long (in seconds) the present box count of an user is trusted before it's counted again, so changes made outside
+# the server (e.g. by scripts) eventually show up.
+PRESENT_COUNT_TTL = 60
+PRESENT_COUNT_CACHE_SIZE = 16384
+_present_counts: dict[int, _PresentCount] = {}
+
+
+def _get_pending_present_count(context: idol.BasicSchoolIdolContext, /) -> dict[int, _PresentCount]:
+    """Present box count changes made by the current transaction, applied to the shared counts on commit."""
+    return context.db.main.info.setdefault("present_count_delta", {})
+
+
+def _add_pending_present_count(context: idol.BasicSchoolIdolContext, user_id: int, delta: int, expire: int = 0, /):
+    pending = _get_pending_present_count(context)
+    entry = pending.get(user_id)
+    if entry is None:
+        entry = pending[user_id] = _PresentCount(count=0, valid_until=0)
+
+    entry.count = entry.count + delta
+    if expire != 0:
+        entry.valid_until = expire if entry.valid_until == 0 else min(entry.valid_until, expire)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_commit")
+def _apply_present_count(session: sqlalchemy.orm.Session):
+    pending: dict[int, _PresentCount] | None = session.info.pop("present_count_delta", None)
+    if pending:
+        for user_id, delta in pending.items():
+            entry = _present_counts.get(user_id)
+            if entry is not None:
+                entry.count = entry.count + delta.count
+                if delta.valid_until != 0:
+                    entry.valid_until = min(entry.valid_until, delta.valid_until)
 
 
-_currently_cleaning = False
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_rollback")
+def _discard_present_count(session: sqlalchemy.orm.Session):
+    session.info.pop("present_count_delta", None)
 
 
-async def try_cleanup_incentive():
-    global _currently_cleaning
-    if not _currently_cleaning:
-        _currently_cleaning = True
-        await asyncio.sleep(delay=5)
-        async with idol.BasicSchoolIdolContext() as context:
-            await cleanup_incentive(context)
-        _currently_cleaning = False
+def _is_counted(incentive: main.Incentive, time: int, /):
+    return incentive.expire_date == 0 or incentive.expire_date >= time
+
+
+async def cleanup_incentive(context: idol.BasicSchoolIdolContext, /, time: int = 0, limit: int = 1000):
+    """Delete at most `limit` expired incentives. Returns the amount of deleted incentives."""
+    if time == 0:
+        time = util.time()
+
+    q = (
+        sqlalchemy.select(main.Incentive.id)
+        .where(main.Incentive.expire_date != 0, main.Incentive.expire_date < time)
+        .limit(limit)
+    )
+    result = await context.db.main.execute(q)
+    incentive_ids = list(result.scalars())
+
+    if incentive_ids:
+        q = sqlalchemy.delete(main.Incentive).where(main.Incentive.id.in_(incentive_ids))
+        await context.db.main.execute(q)
+        await context.db.main.flush()
+
+    return len(incentive_ids)
 
 
 async def add_item(
@@ -62,9 +114,6 @@ async def add_item(
     reason_en: str | None = None,
     expire: int = 0,
 ):
-    if context.support_background_task():
-        context.add_task(try_cleanup_incentive)
-
     extra_data = item_data.get_extra_data()
     incentive = main.Incentive(
         user_id=user.id,
@@ -85,6 +134,7 @@ async def add_item(
 
     context.db.main.add(incentive)
     await context.db.main.flush()
+    _add_pending_present_count(context, user.id, 1, expire)
     return incentive
 
 
@@ -115,9 +165,6 @@ async def get_presentbox(
     order_ascending: bool = False,
     order_expiry_date: bool = False,
 ) -> collections.abc.Sequence[main.Incentive]:
-    if context.support_background_task():
-        context.add_task(try_cleanup_incentive)
-
     t = util.time()
 
     # Query non-expire incentives.
@@ -141,7 +188,7 @@ async def get_presentbox(
         q = q.order_by(main.Incentive.insert_date.asc() if order_ascending else main.Incentive.insert_date.desc())
 
     q = q.offset(offset)
-    if limit < 0:
+    if limit >= 0:
         q = q.limit(limit)
 
     result = await context.db.main.execute(q)
@@ -151,9 +198,6 @@ async def get_presentbox(
 async def get_presentbox_simple(
     context: idol.BasicSchoolIdolContext, user: main.User, /
 ) -> collections.abc.Iterable[main.Incentive]:
-    if context.support_background_task():
-        context.add_task(try_cleanup_incentive)
-
     t = util.time()
 
     # Query non-expire incentives.
@@ -164,27 +208,55 @@ async def get_presentbox_simple(
     return result.scalars()
 
 
+async def _count_presentbox_all(context: idol.BasicSchoolIdolContext, user: main.User, t: int, /):
+    q = sqlalchemy.select(
+        sqlalchemy.func.count(),
+        sqlalchemy.func.min(sqlalchemy.case((main.Incentive.expire_date != 0, main.Incentive.expire_date), else_=None)),
+    ).where(main.Incentive.user_id == user.id, (main.Incentive.expire_date == 0) | (main.Incentive.expire_date >= t))
+    result = await context.db.main.execute(q)
+    count, next_expire = result.one()
+
+    # The count includes changes of the current transaction, which are only applied to the shared count on commit.
+    pending = _get_pending_present_count(context).get(user.id)
+    valid_until = t + PRESENT_COUNT_TTL
+    if next_expire is not None:
+        valid_until = min(valid_until, next_expire)
+    entry = _PresentCount(count=count - (0 if pending is None else pending.count), valid_until=valid_until)
+
+    if user.id not in _present_counts and len(_present_counts) >= PRESENT_COUNT_CACHE_SIZE:
+        del _present_counts[next(iter(_present_counts))]
+    _present_counts[user.id] = entry
+    return entry
+
+
 async def count_presentbox(
     context: idol.BasicSchoolIdolContext, /, user: main.User, filter_config: FilterConfig | None = None
 ):
-    if context.support_background_task():
-        context.add_task(try_cleanup_incentive)
-
     t = util.time()
 
+    if filter_config is None or filter_config.category == RewardCategory.ALL:
+        # Unfiltered count is kept per user and adjusted as incentives are added and removed.
+        entry = _present_counts.get(user.id)
+        if entry is None or t > entry.valid_until:
+            entry = await _count_presentbox_all(context, user, t)
+
+        pending = _get_pending_present_count(context).get(user.id)
+        return entry.count + (0 if pending is None else pending.count)
+
     q = (
         sqlalchemy.select(sqlalchemy.func.count())
         .select_from(main.Incentive)
         .where(main.Incentive.user_id == user.id, (main.Incentive.expire_date == 0) | (main.Incentive.expire_date >= t))
     )
-    if filter_config:
-        q = apply_filter(q, filter_config)
+    q = apply_filter(q, filter_config)
 
     qc = await context.db.main.execute(q)
     return qc.scalar() or 0
 
 
-async def resolve_incentive(context: idol.BasicSchoolIdolContext, user: main.User, incentive: main.Incentive):
+async def resolve_incentive(
+    context: idol.BasicSchoolIdolContext, user: main.User, incentive: main.Incentive, /, live_status: bool = True
+):
     extra_data = json.loads(incentive.extra_data) if incentive.extra_data is not None else None
     item_data = await advanced.deserialize_item_data(
         context,
@@ -195,7 +267,7 @@ async def resolve_incentive(context: idol.BasicSchoolIdolContext, user: main.Use
             extra_data=extra_data,
         ),
     )
-    if isinstance(item_data, live_model.LiveItem):
+    if live_status and isinstance(item_data, live_model.LiveItem):
         item_data.additional_normal_live_status_list = await live.get_normal_live_clear_status_of_track(
             context, user, incentive.item_id
         )
@@ -206,9 +278,6 @@ async def resolve_incentive(context: idol.BasicSchoolIdolContext, user: main.Use
 
 
 async def get_incentive(context: idol.BasicSchoolIdolContext, user: main.User, incentive_id: int):
-    if context.support_background_task():
-        context.add_task(try_cleanup_incentive)
-
     q = sqlalchemy.select(main.Incentive).where(main.Incentive.user_id == user.id, main.Incentive.id == incentive_id)
     result = await context.db.main.execute(q)
     return result.scalar()
@@ -218,18 +287,38 @@ async def remove_incentive(context: idol.BasicSchoolIdolContext, incentive: main
     # TODO: Move to incentive history
     await context.db.main.delete(incentive)
     await context.db.main.flush()
+    if _is_counted(incentive, util.time()):
+        _add_pending_present_count(context, incentive.user_id, -1)
+
+
+async def remove_incentives(context: idol.BasicSchoolIdolContext, incentives: collections.abc.Iterable[main.Incentive]):
+    # TODO: Move to incentive history
+    t = util.time()
+    removed: dict[int, int] = {}
+    incentive_ids: list[int] = []
+    for incentive in incentives:
+        incentive_ids.append(incentive.id)
+        if _is_counted(incentive, t):
+            removed[incentive.user_id] = removed.get(incentive.user_id, 0) + 1
+
+    q = sqlalchemy.delete(main.Incentive).where(main.Incentive.id.in_(incentive_ids))
+    await context.db.main.execute(q)
+    await context.db.main.flush()
+    for user_id, amount in removed.items():
+        _add_pending_present_count(context, user_id, -amount)
 
 
 async def has_at_least_one(
     context: idol.BasicSchoolIdolContext, user: main.User, add_type: const.ADD_TYPE, item_id: int
 ):
-    if context.support_background_task():
-        context.add_task(try_cleanup_incentive)
-
     q = (
-        sqlalchemy.select(sqlalchemy.func.count())
-        .select_from(main.Incentive)
-        .where(main.Incentive.add_type == int(add_type), main.Incentive.item_id == item_id)
+        sqlalchemy.select(main.Incentive.id)
+        .where(
+            main.Incentive.user_id == user.id,
+            main.Incentive.add_type == int(add_type),
+            main.Incentive.item_id == item_id,
+        )
+        .limit(1)
     )
     result = await context.db.main.execute(q)
-    return (result.scalar() or 0) > 0
+    return result.scalar() is not None
@@ -4,6 +4,7 @@ from . import user
 from .. import const
 from .. import data
 from .. import idol
+from .. import sampler
 from .. import util
 from ..db import main
 
@@ -115,6 +116,16 @@ def get_secretbox_data(secretbox_id: int):
     return server_data.secretbox_data[secretbox_id]
 
 
+def _build_rarity_table(secretbox_id: int):
+    def build(server_data: data.ServerData):
+        secretbox_data = server_data.secretbox_data.get(secretbox_id)
+        if secretbox_data is None:
+            return None
+        return sampler.AliasTable(range(len(secretbox_data.rarity_rates)), secretbox_data.rarity_rates)
+
+    return build
+
+
 def roll_units(
     secretbox_id: int,
     amount: int,
@@ -126,8 +137,15 @@ def roll_units(
 ):
     secretbox_data = get_secretbox_data(secretbox_id)
     # Calculate weighted probabilities
-    rates = rate_modifier if rate_modifier is not None else secretbox_data.rarity_rates
-    picked_rarity_index = util.SYSRAND.choices(range(len(secretbox_data.rarity_rates)), rates, k=amount)
+    if rate_modifier is None:
+        rarity_table = sampler.get_server_data_table(
+            ("secretbox_rarity", secretbox_id), _build_rarity_table(secretbox_id)
+        )
+        if rarity_table is None:
+            raise KeyError(secretbox_id)
+    else:
+        rarity_table = sampler.AliasTable(range(len(secretbox_data.rarity_rates)), rate_modifier)
+    picked_rarity_index = rarity_table.sample_many(amount)
 
     if guarantee_rarity > 0 and guarantee_amount > 0:
         rindex = guarantee_rarity - 1
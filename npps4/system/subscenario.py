@@ -1,3 +1,5 @@
+import collections.abc
+
 import sqlalchemy
 
 from . import common
@@ -17,6 +19,28 @@ async def unlock(context: idol.BasicSchoolIdolContext, user: main.User, subscena
     return False
 
 
+async def unlock_many(
+    context: idol.BasicSchoolIdolContext, user: main.User, subscenario_ids: collections.abc.Iterable[int]
+):
+    """Unlock multiple subscenarios at once. Returns the subscenario IDs which weren't unlocked before, in order."""
+    subscenario_ids = list(dict.fromkeys(subscenario_ids))
+    if not subscenario_ids:
+        return []
+
+    q = sqlalchemy.select(main.SubScenario.subscenario_id).where(
+        main.SubScenario.user_id == user.id, main.SubScenario.subscenario_id.in_(subscenario_ids)
+    )
+    result = await context.db.main.execute(q)
+    unlocked = set(result.scalars())
+
+    new_subscenario_ids = [i for i in subscenario_ids if i not in unlocked]
+    context.db.main.add_all(
+        main.SubScenario(user_id=user.id, subscenario_id=i, completed=False) for i in new_subscenario_ids
+    )
+    await context.db.main.flush()
+    return new_subscenario_ids
+
+
 async def get(context: idol.BasicSchoolIdolContext, user: main.User, subscenario_id: int):
     q = sqlalchemy.select(main.SubScenario).where(
         main.SubScenario.user_id == user.id, main.SubScenario.subscenario_id == subscenario_id
@@ -64,3 +88,19 @@ async def get_subscenario_id_of_unit_id(context: idol.BasicSchoolIdolContext, un
     result = await context.db.subscenario.execute(q)
     sc_info = db.decrypt_row(context.db.subscenario, result.scalar())
     return sc_info.subscenario_id if sc_info is not None else 0
+
+
+async def get_subscenario_id_of_unit_id_many(
+    context: idol.BasicSchoolIdolContext, unit_ids: collections.abc.Iterable[int]
+):
+    unit_ids = list(set(unit_ids))
+    q = sqlalchemy.select(subscenario.SubScenario).where(subscenario.SubScenario.unit_id.in_(unit_ids))
+    result = await context.db.subscenario.execute(q)
+    subscenario_ids: dict[int, int] = {}
+
+    for sc_info in result.scalars():
+        if sc_info.unit_id not in subscenario_ids:
+            decrypted = db.decrypt_row(context.db.subscenario, sc_info)
+            subscenario_ids[sc_info.unit_id] = decrypted.subscenario_id if decrypted is not None else 0
+
+    return {i: subscenario_ids.get(i, 0) for i in unit_ids}
@@ -1,3 +1,4 @@
+import bisect
 import collections.abc
 import dataclasses
 import itertools
@@ -5,6 +6,7 @@ import math
 
 import pydantic
 import sqlalchemy
+import sqlalchemy.orm
 
 from . import album
 from . import common
@@ -18,9 +20,10 @@ from .. import idol
 from .. import idoltype
 from .. import util
 from ..db import main
+from ..db import snapshot
 from ..db import unit
 
-from typing import Literal, overload
+from typing import Literal, cast, overload
 
 
 @dataclasses.dataclass
@@ -112,8 +115,8 @@ async def create_unit(
         unit_removable_skill_capacity=unit_info.default_removable_skill_capacity,
     )
 
-    unit_level_up_pattern = await get_unit_level_up_pattern(context, unit_info.unit_level_up_pattern_id)
-    unit_data.exp = get_exp_for_target_level(unit_info, unit_level_up_pattern, level)
+    unit_level_up_table = await get_unit_level_up_table(context, unit_info.unit_level_up_pattern_id)
+    unit_data.exp = get_exp_for_target_level(unit_info, unit_level_up_table, level)
 
     if unit_info.rarity == 4:
         # FIXME: Determine if it's promo card and set to 2 in that case
@@ -123,24 +126,36 @@ async def create_unit(
 
 
 async def add_unit_by_object(context: idol.BasicSchoolIdolContext, user: main.User, unit_data: main.Unit):
-    unit_info = await get_unit_info(context, unit_data.unit_id)
-    if unit_info is None:
+    await add_units_by_object(context, user, (unit_data,))
+
+
+async def add_units_by_object(
+    context: idol.BasicSchoolIdolContext, user: main.User, units: collections.abc.Sequence[main.Unit]
+):
+    unit_infos = await get_unit_info_many(context, (unit_data.unit_id for unit_data in units))
+    if None in unit_infos.values():
         raise ValueError("unit info not found")
 
-    rarity = await get_unit_rarity(context, unit_info.rarity)
-    if rarity is None:
+    rarities = await get_unit_rarity_many(context, (unit_info.rarity for unit_info in unit_infos.values() if unit_info))
+    if None in rarities.values():
         raise ValueError("unit rarity not found")
 
-    stats = await get_unit_stats_from_unit_data(context, UnitStatsCalculationID.from_unit_data(unit_data))
-    context.db.main.add(unit_data)
-    await album.update(
-        context,
-        user,
-        unit_data.unit_id,
-        rank_max=unit_data.rank >= unit_info.rank_max,
-        love_max=unit_data.love >= rarity.after_love_max,
-        rank_level_max=stats.level >= rarity.after_level_max,
-    )
+    albums = await album.get_many_guaranteed(context, user, unit_infos.keys())
+    for unit_data in units:
+        unit_info = unit_infos[unit_data.unit_id]
+        assert unit_info is not None
+        rarity = rarities[unit_info.rarity]
+        assert rarity is not None
+
+        stats = await get_unit_stats_from_unit_data(context, UnitStatsCalculationID.from_unit_data(unit_data))
+        album.apply(
+            albums[unit_data.unit_id],
+            rank_max=unit_data.rank >= unit_info.rank_max,
+            love_max=unit_data.love >= rarity.after_love_max,
+            rank_level_max=stats.level >= rarity.after_level_max,
+        )
+
+    context.db.main.add_all(units)
     await context.db.main.flush()
 
 
@@ -169,6 +184,15 @@ async def get_unit(context: idol.BasicSchoolIdolContext, unit_owning_user_id: in
     return result
 
 
+async def get_units(context: idol.BasicSchoolIdolContext, unit_owning_user_ids: collections.abc.Iterable[int]):
+    """Get multiple units in single query. The result is in same order as `unit_owning_user_ids`."""
+    unit_owning_user_ids = list(unit_owning_user_ids)
+    q = sqlalchemy.select(main.Unit).where(main.Unit.id.in_(unit_owning_user_ids))
+    result = await context.db.main.execute(q)
+    units = {u.id: u for u in result.scalars()}
+    return [units.get(i) for i in unit_owning_user_ids]
+
+
 def validate_unit(user: main.User, unit_data: main.Unit | None):
     if unit_data is None or unit_data.user_id != user.id:
         raise idol.error.by_code(idol.error.ERROR_CODE_UNIT_NOT_EXIST)
@@ -194,6 +218,25 @@ async def get_supporter_unit(context: idol.BasicSchoolIdolContext, user: main.Us
     return unitsupp
 
 
+async def get_supporter_units_guaranteed(
+    context: idol.BasicSchoolIdolContext, user: main.User, unit_ids: collections.abc.Iterable[int]
+):
+    """Get the supporter unit rows of the specified supporter unit IDs, creating missing ones."""
+    unit_ids = set(unit_ids)
+    q = sqlalchemy.select(main.UnitSupporter).where(
+        main.UnitSupporter.user_id == user.id, main.UnitSupporter.unit_id.in_(unit_ids)
+    )
+    result = await context.db.main.execute(q)
+    supporters = {unitsupp.unit_id: unitsupp for unitsupp in result.scalars()}
+
+    for unit_id in unit_ids - supporters.keys():
+        unitsupp = main.UnitSupporter(user_id=user.id, unit_id=unit_id, amount=0)
+        context.db.main.add(unitsupp)
+        supporters[unit_id] = unitsupp
+
+    return supporters
+
+
 async def add_supporter_unit(context: idol.BasicSchoolIdolContext, user: main.User, unit_id: int, quantity: int = 1):
     if quantity < 1:
         raise ValueError("invalid amount")
@@ -244,17 +287,29 @@ async def get_unit_support_list_response(context: idol.BasicSchoolIdolContext, /
 
 
 @common.context_cacheable("unit")
-def get_unit_info(context: idol.BasicSchoolIdolContext, unit_id: int, /):
-    return db.get_decrypted_row(context.db.unit, unit.Unit, unit_id)
+async def get_unit_info(context: idol.BasicSchoolIdolContext, unit_id: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_info.get(unit_id)
+
+    return await db.get_decrypted_row(context.db.unit, unit.Unit, unit_id)
 
 
 @common.context_cacheable("unit_rarity")
-def get_unit_rarity(context: idol.BasicSchoolIdolContext, rarity: int, /):
-    return context.db.unit.get(unit.Rarity, rarity)
+async def get_unit_rarity(context: idol.BasicSchoolIdolContext, rarity: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_rarity.get(rarity)
+
+    return await context.db.unit.get(unit.Rarity, rarity)
 
 
 @common.context_cacheable("unit_by_number")
 async def get_unit_info_from_unit_number(context: idol.BasicSchoolIdolContext, unit_number: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_by_number.get(unit_number)
+
     q = sqlalchemy.select(unit.Unit).where(unit.Unit.unit_number == unit_number)
     result = await context.db.unit.execute(q)
     unit_info = result.scalar()
@@ -274,8 +329,14 @@ async def get_unit_info_from_unit_number(context: idol.BasicSchoolIdolContext, u
 
 @common.context_cacheable("unit_level_up_pattern")
 async def get_unit_level_up_pattern(context: idol.BasicSchoolIdolContext, unit_level_up_pattern_id: int, /):
-    q = sqlalchemy.select(unit.UnitLevelUpPattern).where(
-        unit.UnitLevelUpPattern.unit_level_up_pattern_id == unit_level_up_pattern_id
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_level_up_pattern.get(unit_level_up_pattern_id, [])
+
+    q = (
+        sqlalchemy.select(unit.UnitLevelUpPattern)
+        .where(unit.UnitLevelUpPattern.unit_level_up_pattern_id == unit_level_up_pattern_id)
+        .order_by(unit.UnitLevelUpPattern.unit_level)
     )
     result = await context.db.unit.execute(q)
     return list(result.scalars())
@@ -283,7 +344,15 @@ async def get_unit_level_up_pattern(context: idol.BasicSchoolIdolContext, unit_l
 
 @common.context_cacheable("unit_level_limit_pattern")
 async def get_unit_level_limit_pattern(context: idol.BasicSchoolIdolContext, level_limit_id: int, /):
-    q = sqlalchemy.select(unit.LevelLimitPattern).where(unit.LevelLimitPattern.unit_level_limit_id == level_limit_id)
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_level_limit_pattern.get(level_limit_id, [])
+
+    q = (
+        sqlalchemy.select(unit.LevelLimitPattern)
+        .where(unit.LevelLimitPattern.unit_level_limit_id == level_limit_id)
+        .order_by(unit.LevelLimitPattern.unit_level)
+    )
     result = await context.db.unit.execute(q)
     return list(result.scalars())
 
@@ -293,11 +362,19 @@ async def get_unit_skill(context: idol.BasicSchoolIdolContext, default_unit_skil
     if default_unit_skill_id is None or default_unit_skill_id == 0:
         return None
 
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_skill.get(default_unit_skill_id)
+
     return await db.get_decrypted_row(context.db.unit, unit.UnitSkill, default_unit_skill_id)
 
 
 @common.context_cacheable("unit_skill_level_up_pattern")
 async def get_unit_skill_level_up_pattern(context: idol.BasicSchoolIdolContext, unit_skill: int, /):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return master_snapshot.unit_skill_level_up_pattern.get(unit_skill, [])
+
     q = (
         sqlalchemy.select(unit.UnitSkillLevelUpPattern)
         .where(unit.UnitSkillLevelUpPattern.unit_skill_level_up_pattern_id == unit_skill)
@@ -307,6 +384,212 @@ async def get_unit_skill_level_up_pattern(context: idol.BasicSchoolIdolContext,
     return list(result.scalars())
 
 
+class ExpTable[T: unit.UnitLevelUpPattern | unit.LevelLimitPattern | unit.UnitSkillLevelUpPattern]:
+    """Level pattern sorted by level, with precomputed exp thresholds to find the level by exp using binary search."""
+
+    __slots__ = ("patterns", "thresholds")
+
+    def __init__(self, patterns: list[T]):
+        self.patterns = patterns
+        # The last level has next_exp of 0, so use the running maximum to keep the thresholds sorted.
+        self.thresholds = list(itertools.accumulate((p.next_exp for p in patterns), max))
+
+    def find(self, exp: int):
+        """Find the first pattern whose next_exp is larger than `exp`, or None if `exp` is at the last level."""
+        index = bisect.bisect_right(self.thresholds, exp)
+        return self.patterns[index] if index < len(self.patterns) else None
+
+
+@common.context_cacheable("unit_level_up_table")
+async def get_unit_level_up_table(context: idol.BasicSchoolIdolContext, unit_level_up_pattern_id: int, /):
+    return ExpTable(await get_unit_level_up_pattern(context, unit_level_up_pattern_id))
+
+
+@common.context_cacheable("unit_level_limit_table")
+async def get_unit_level_limit_table(context: idol.BasicSchoolIdolContext, level_limit_id: int, /):
+    return ExpTable(await get_unit_level_limit_pattern(context, level_limit_id))
+
+
+@common.context_cacheable("unit_skill_level_up_table")
+async def get_unit_skill_level_up_table(context: idol.BasicSchoolIdolContext, unit_skill: int, /):
+    return ExpTable(await get_unit_skill_level_up_pattern(context, unit_skill))
+
+
+async def _load_master_rows[
+    T: db.common.GameDBBase
+](
+    context: idol.BasicSchoolIdolContext,
+    cls: type[T],
+    column: sqlalchemy.orm.InstrumentedAttribute[int],
+    ids: list[int],
+):
+    q = sqlalchemy.select(cls).where(column.in_(ids))
+    result = await context.db.unit.execute(q)
+    rows: dict[int, T] = {}
+
+    for row in result.scalars():
+        if isinstance(row, db.common.MaybeEncrypted):
+            row = db.decrypt_row(context.db.unit, row)
+        if row is not None:
+            rows[getattr(row, column.key)] = row
+
+    return rows
+
+
+async def _load_master_groups[
+    T: db.common.GameDBBase
+](
+    context: idol.BasicSchoolIdolContext,
+    cls: type[T],
+    column: sqlalchemy.orm.InstrumentedAttribute[int],
+    order: sqlalchemy.orm.InstrumentedAttribute[int],
+    ids: list[int],
+):
+    q = sqlalchemy.select(cls).where(column.in_(ids)).order_by(column, order)
+    result = await context.db.unit.execute(q)
+    groups: dict[int, list[T]] = {i: [] for i in ids}
+
+    for row in result.scalars():
+        groups[getattr(row, column.key)].append(row)
+
+    return groups
+
+
+async def _load_unit_info_many(context: idol.BasicSchoolIdolContext, unit_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.unit_info[i] for i in unit_ids if i in master_snapshot.unit_info}
+
+    return await _load_master_rows(context, unit.Unit, unit.Unit.unit_id, unit_ids)
+
+
+async def _load_unit_rarity_many(context: idol.BasicSchoolIdolContext, rarities: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.unit_rarity[i] for i in rarities if i in master_snapshot.unit_rarity}
+
+    return await _load_master_rows(context, unit.Rarity, unit.Rarity.rarity, rarities)
+
+
+async def _load_unit_level_up_pattern_many(context: idol.BasicSchoolIdolContext, pattern_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.unit_level_up_pattern.get(i, []) for i in pattern_ids}
+
+    return await _load_master_groups(
+        context,
+        unit.UnitLevelUpPattern,
+        unit.UnitLevelUpPattern.unit_level_up_pattern_id,
+        unit.UnitLevelUpPattern.unit_level,
+        pattern_ids,
+    )
+
+
+async def _load_unit_level_limit_pattern_many(context: idol.BasicSchoolIdolContext, level_limit_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.unit_level_limit_pattern.get(i, []) for i in level_limit_ids}
+
+    return await _load_master_groups(
+        context,
+        unit.LevelLimitPattern,
+        unit.LevelLimitPattern.unit_level_limit_id,
+        unit.LevelLimitPattern.unit_level,
+        level_limit_ids,
+    )
+
+
+async def _load_unit_skill_many(context: idol.BasicSchoolIdolContext, unit_skill_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.unit_skill[i] for i in unit_skill_ids if i in master_snapshot.unit_skill}
+
+    return await _load_master_rows(context, unit.UnitSkill, unit.UnitSkill.unit_skill_id, unit_skill_ids)
+
+
+async def _load_unit_skill_level_up_pattern_many(context: idol.BasicSchoolIdolContext, pattern_ids: list[int]):
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        return {i: master_snapshot.unit_skill_level_up_pattern.get(i, []) for i in pattern_ids}
+
+    return await _load_master_groups(
+        context,
+        unit.UnitSkillLevelUpPattern,
+        unit.UnitSkillLevelUpPattern.unit_skill_level_up_pattern_id,
+        unit.UnitSkillLevelUpPattern.skill_level,
+        pattern_ids,
+    )
+
+
+def get_unit_info_many(context: idol.BasicSchoolIdolContext, unit_ids: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(context, "unit", unit_ids, _load_unit_info_many)
+
+
+def get_unit_rarity_many(context: idol.BasicSchoolIdolContext, rarities: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(context, "unit_rarity", rarities, _load_unit_rarity_many)
+
+
+def get_unit_level_up_pattern_many(context: idol.BasicSchoolIdolContext, pattern_ids: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(
+        context, "unit_level_up_pattern", pattern_ids, _load_unit_level_up_pattern_many
+    )
+
+
+def get_unit_level_limit_pattern_many(
+    context: idol.BasicSchoolIdolContext, level_limit_ids: collections.abc.Iterable[int]
+):
+    return common.get_master_cached_many(
+        context, "unit_level_limit_pattern", level_limit_ids, _load_unit_level_limit_pattern_many
+    )
+
+
+def get_unit_skill_many(context: idol.BasicSchoolIdolContext, unit_skill_ids: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(context, "unit_skill", unit_skill_ids, _load_unit_skill_many)
+
+
+def get_unit_skill_level_up_pattern_many(
+    context: idol.BasicSchoolIdolContext, pattern_ids: collections.abc.Iterable[int]
+):
+    return common.get_master_cached_many(
+        context, "unit_skill_level_up_pattern", pattern_ids, _load_unit_skill_level_up_pattern_many
+    )
+
+
+async def _load_unit_level_up_table_many(context: idol.BasicSchoolIdolContext, pattern_ids: list[int]):
+    patterns = await get_unit_level_up_pattern_many(context, pattern_ids)
+    return {k: ExpTable(v or []) for k, v in patterns.items()}
+
+
+async def _load_unit_level_limit_table_many(context: idol.BasicSchoolIdolContext, level_limit_ids: list[int]):
+    patterns = await get_unit_level_limit_pattern_many(context, level_limit_ids)
+    return {k: ExpTable(v or []) for k, v in patterns.items()}
+
+
+async def _load_unit_skill_level_up_table_many(context: idol.BasicSchoolIdolContext, pattern_ids: list[int]):
+    patterns = await get_unit_skill_level_up_pattern_many(context, pattern_ids)
+    return {k: ExpTable(v or []) for k, v in patterns.items()}
+
+
+def get_unit_level_up_table_many(context: idol.BasicSchoolIdolContext, pattern_ids: collections.abc.Iterable[int]):
+    return common.get_master_cached_many(context, "unit_level_up_table", pattern_ids, _load_unit_level_up_table_many)
+
+
+def get_unit_level_limit_table_many(
+    context: idol.BasicSchoolIdolContext, level_limit_ids: collections.abc.Iterable[int]
+):
+    return common.get_master_cached_many(
+        context, "unit_level_limit_table", level_limit_ids, _load_unit_level_limit_table_many
+    )
+
+
+def get_unit_skill_level_up_table_many(
+    context: idol.BasicSchoolIdolContext, pattern_ids: collections.abc.Iterable[int]
+):
+    return common.get_master_cached_many(
+        context, "unit_skill_level_up_table", pattern_ids, _load_unit_skill_level_up_table_many
+    )
+
+
 def detach_from_deck_2(unit_owning_user_id: int, deck: main.UnitDeck):
     has = False
     if deck.unit_owning_user_id_1 == unit_owning_user_id:
@@ -473,10 +756,9 @@ async def get_all_deck_simple(
 async def find_all_valid_deck_number_ids(context: idol.SchoolIdolParams, user: main.User):
     result: set[int] = set()
 
-    for i in VALID_DECK_ID:
-        deck_data = await load_unit_deck(context, user, i, False)
-        if deck_data is not None and all(deck_data[1]):
-            result.add(i)
+    for deck_number, _, deck_unit_ids in await get_all_deck_simple(context, user):
+        if deck_number in VALID_DECK_ID and all(deck_unit_ids):
+            result.add(deck_number)
 
     return result
 
@@ -550,14 +832,12 @@ async def add_love_by_deck(context: idol.BasicSchoolIdolContext, user: main.User
     if deck_data is None:
         raise ValueError("invalid deck")
 
-    units = util.ensure_no_none(
-        [await context.db.main.get(main.Unit, unit_id) for unit_id in deck_data[1]], ValueError, "incomplete deck"
-    )
-    unit_infos = util.ensure_no_none(
-        [await get_unit_info(context, u.unit_id) for u in units], ValueError, "unit info retrieval error"
-    )
+    units = util.ensure_no_none(await get_units(context, deck_data[1]), ValueError, "incomplete deck")
+    unit_info_map = await get_unit_info_many(context, (u.unit_id for u in units))
+    unit_infos = util.ensure_no_none([unit_info_map[u.unit_id] for u in units], ValueError, "unit info retrieval error")
+    unit_rarity_map = await get_unit_rarity_many(context, (u.rarity for u in unit_infos))
     unit_rarities = util.ensure_no_none(
-        [await get_unit_rarity(context, u.rarity) for u in unit_infos], ValueError, "unit rarity retrieval error"
+        [unit_rarity_map[u.rarity] for u in unit_infos], ValueError, "unit rarity retrieval error"
     )
     max_loves = [
         ur.after_love_max if ud.rank == ui.rank_max else ur.before_love_max
@@ -578,8 +858,9 @@ async def add_love_by_deck(context: idol.BasicSchoolIdolContext, user: main.User
 
 
 def calculate_unit_stats(
-    unit_info: unit.Unit, pattern: list[unit.UnitLevelUpPattern] | list[unit.LevelLimitPattern], exp: int
+    unit_info: unit.Unit, table: ExpTable[unit.UnitLevelUpPattern] | ExpTable[unit.LevelLimitPattern], exp: int
 ):
+    pattern = table.patterns
     last = pattern[-1]
     result = UnitStatsResult(
         level=last.unit_level,
@@ -593,28 +874,32 @@ def calculate_unit_stats(
         sale_price=pattern[0].sale_price,
     )
 
-    for diff in pattern:
-        if diff.next_exp > exp:
-            result.level = diff.unit_level
-            result.smile = result.smile - diff.smile_diff
-            result.pure = result.pure - diff.pure_diff
-            result.cool = result.cool - diff.cool_diff
-            result.hp = result.hp - diff.hp_diff
-            result.next_exp = diff.next_exp
-            result.merge_exp = diff.merge_exp
-            result.merge_cost = diff.merge_cost
-            result.sale_price = diff.sale_price
-            break
+    diff = table.find(exp)
+    if diff is not None:
+        result.level = diff.unit_level
+        result.smile = result.smile - diff.smile_diff
+        result.pure = result.pure - diff.pure_diff
+        result.cool = result.cool - diff.cool_diff
+        result.hp = result.hp - diff.hp_diff
+        result.next_exp = diff.next_exp
+        result.merge_exp = diff.merge_exp
+        result.merge_cost = diff.merge_cost
+        result.sale_price = diff.sale_price
 
     return result
 
 
 def get_exp_for_target_level(
-    unit_info: unit.Unit, patterns: list[unit.UnitLevelUpPattern] | list[unit.LevelLimitPattern], level: int
+    unit_info: unit.Unit, table: ExpTable[unit.UnitLevelUpPattern] | ExpTable[unit.LevelLimitPattern], level: int
 ):
     if level == 1:
         return 0
 
+    patterns = table.patterns
+    # Patterns normally start at level 1 without gaps.
+    if 0 <= level - 2 < len(patterns) and patterns[level - 2].unit_level == level - 1:
+        return patterns[level - 2].next_exp
+
     for pattern in patterns:
         if pattern.unit_level == level - 1:
             return pattern.next_exp
@@ -623,61 +908,59 @@ def get_exp_for_target_level(
 
 
 def calculate_unit_skill_stats(
-    unit_skill: unit.UnitSkill | None, pattern: list[unit.UnitSkillLevelUpPattern] | None, exp: int
+    unit_skill: unit.UnitSkill | None, table: ExpTable[unit.UnitSkillLevelUpPattern] | None, exp: int
 ):
-    if unit_skill is None or pattern is None:
+    if unit_skill is None or table is None:
         return (1, 0)
 
-    last = pattern[-1]
-    for stat in pattern:
-        if stat.next_exp > exp:
-            return (stat.skill_level, stat.next_exp)
+    stat = table.find(exp)
+    if stat is not None:
+        return (stat.skill_level, stat.next_exp)
 
-    return (last.skill_level, 0)
+    return (table.patterns[-1].skill_level, 0)
 
 
-@common.context_cacheable("unit_stats_calculated")
-async def get_unit_stats_from_unit_data(context: idol.BasicSchoolIdolContext, calckey: UnitStatsCalculationID):
+def _use_level_limit_pattern(calckey: UnitStatsCalculationID, unit_rarity: unit.Rarity, stats: UnitStatsResult):
+    return (
+        calckey.level_limit_id > 0
+        and stats.level >= unit_rarity.after_level_max
+        and calckey.max_level > unit_rarity.after_level_max
+    )
+
+
+async def _calculate_unit_stats_from_unit_data(context: idol.BasicSchoolIdolContext, calckey: UnitStatsCalculationID):
     unit_info = await get_unit_info(context, calckey.unit_id)
     assert unit_info is not None
     unit_rarity = await get_unit_rarity(context, unit_info.rarity)
     assert unit_rarity is not None
 
-    levelup_pattern = await get_unit_level_up_pattern(context, unit_info.unit_level_up_pattern_id)
-    stats = calculate_unit_stats(unit_info, levelup_pattern, calckey.exp)
+    levelup_table = await get_unit_level_up_table(context, unit_info.unit_level_up_pattern_id)
+    stats = calculate_unit_stats(unit_info, levelup_table, calckey.exp)
 
-    if (
-        calckey.level_limit_id > 0
-        and stats.level >= unit_rarity.after_level_max
-        and calckey.max_level > unit_rarity.after_level_max
-    ):
+    if _use_level_limit_pattern(calckey, unit_rarity, stats):
         # Use level_limit pattern
-        levelup_pattern = await get_unit_level_limit_pattern(context, calckey.level_limit_id)
-        stats = calculate_unit_stats(unit_info, levelup_pattern, calckey.exp)
+        level_limit_table = await get_unit_level_limit_table(context, calckey.level_limit_id)
+        stats = calculate_unit_stats(unit_info, level_limit_table, calckey.exp)
 
     return stats
 
 
-async def get_unit_data_full_info(context: idol.BasicSchoolIdolContext, unit_data: main.Unit):
-    unit_info = await get_unit_info(context, unit_data.unit_id)
-    if unit_info is None:
-        raise ValueError("unit_info is none")
-
-    # Calculate unit level
-    unit_rarity = await get_unit_rarity(context, unit_info.rarity)
-    if unit_rarity is None:
-        raise RuntimeError("unit_rarity is none")
+async def get_unit_stats_from_unit_data(context: idol.BasicSchoolIdolContext, calckey: UnitStatsCalculationID):
+    # The key is derived from user data, so it's only cached in the current idol context. Caching it in the master data
+    # cache would evict the master data rows.
+    return await common.get_cached(context, "unit_stats_calculated", calckey, _calculate_unit_stats_from_unit_data)
 
-    stats = await get_unit_stats_from_unit_data(context, UnitStatsCalculationID.from_unit_data(unit_data))
 
+def make_unit_data_full_info(
+    unit_data: main.Unit,
+    unit_info: unit.Unit,
+    unit_rarity: unit.Rarity,
+    stats: UnitStatsResult,
+    skill: unit.UnitSkill | None,
+    skill_levels: ExpTable[unit.UnitSkillLevelUpPattern] | None,
+):
     # Calculate unit skill level
-    skill = await get_unit_skill(context, unit_info.default_unit_skill_id)
     if skill is not None:
-        skill_levels = await get_unit_skill_level_up_pattern(
-            context,
-            skill.unit_skill_level_up_pattern_id,
-        )
-
         skill_stats = calculate_unit_skill_stats(skill, skill_levels, unit_data.skill_exp)
         skill_max = skill_stats[0] == skill.max_level
         skill_level = skill_stats[0]
@@ -723,6 +1006,82 @@ async def get_unit_data_full_info(context: idol.BasicSchoolIdolContext, unit_dat
     )
 
 
+async def get_unit_data_full_info(context: idol.BasicSchoolIdolContext, unit_data: main.Unit):
+    unit_info = await get_unit_info(context, unit_data.unit_id)
+    if unit_info is None:
+        raise ValueError("unit_info is none")
+
+    # Calculate unit level
+    unit_rarity = await get_unit_rarity(context, unit_info.rarity)
+    if unit_rarity is None:
+        raise RuntimeError("unit_rarity is none")
+
+    stats = await get_unit_stats_from_unit_data(context, UnitStatsCalculationID.from_unit_data(unit_data))
+
+    skill = await get_unit_skill(context, unit_info.default_unit_skill_id)
+    skill_levels = None
+    if skill is not None:
+        skill_levels = await get_unit_skill_level_up_table(context, skill.unit_skill_level_up_pattern_id)
+
+    return make_unit_data_full_info(unit_data, unit_info, unit_rarity, stats, skill, skill_levels)
+
+
+async def get_all_unit_data_full_info(
+    context: idol.BasicSchoolIdolContext, units: collections.abc.Iterable[main.Unit]
+) -> list[tuple[unit_model.UnitInfoData, UnitStatsResult]]:
+    """Batched `get_unit_data_full_info`.
+
+    All master data referenced by `units` is fetched with constant amount of queries."""
+    units = list(units)
+    unit_infos = await get_unit_info_many(context, (u.unit_id for u in units))
+    if None in unit_infos.values():
+        raise ValueError("unit_info is none")
+    unit_infos = cast(dict[int, unit.Unit], unit_infos)
+
+    unit_rarities = await get_unit_rarity_many(context, (ui.rarity for ui in unit_infos.values()))
+    if None in unit_rarities.values():
+        raise RuntimeError("unit_rarity is none")
+    unit_rarities = cast(dict[int, unit.Rarity], unit_rarities)
+
+    levelup_tables = await get_unit_level_up_table_many(
+        context, (ui.unit_level_up_pattern_id for ui in unit_infos.values())
+    )
+    level_limit_tables = await get_unit_level_limit_table_many(
+        context, (u.level_limit_id for u in units if u.level_limit_id > 0)
+    )
+    skills = await get_unit_skill_many(
+        context, (ui.default_unit_skill_id for ui in unit_infos.values() if ui.default_unit_skill_id)
+    )
+    skill_levels = await get_unit_skill_level_up_table_many(
+        context, (s.unit_skill_level_up_pattern_id for s in skills.values() if s is not None)
+    )
+
+    result: list[tuple[unit_model.UnitInfoData, UnitStatsResult]] = []
+
+    for unit_data in units:
+        unit_info = unit_infos[unit_data.unit_id]
+        unit_rarity = unit_rarities[unit_info.rarity]
+        calckey = UnitStatsCalculationID.from_unit_data(unit_data)
+        stats: UnitStatsResult | None = context.get_cache("unit_stats_calculated", calckey)
+
+        if stats is None:
+            levelup_table = levelup_tables[unit_info.unit_level_up_pattern_id]
+            assert levelup_table is not None
+            stats = calculate_unit_stats(unit_info, levelup_table, calckey.exp)
+
+            if _use_level_limit_pattern(calckey, unit_rarity, stats):
+                level_limit_table = level_limit_tables[calckey.level_limit_id]
+                assert level_limit_table is not None
+                stats = calculate_unit_stats(unit_info, level_limit_table, calckey.exp)
+            context.set_cache("unit_stats_calculated", calckey, stats)
+
+        skill = skills.get(unit_info.default_unit_skill_id) if unit_info.default_unit_skill_id else None
+        skill_level = None if skill is None else skill_levels[skill.unit_skill_level_up_pattern_id]
+        result.append(make_unit_data_full_info(unit_data, unit_info, unit_rarity, stats, skill, skill_level))
+
+    return result
+
+
 def calculate_bonus_stat_of_removable_skill(removable_skill: unit.RemovableSkill, stats: tuple[int, int, int]):
     result: list[int] = [0, 0, 0]
 
@@ -820,6 +1179,28 @@ async def add_unit_removable_skill(
     return removable_skill.amount
 
 
+async def get_removable_skill_info_guaranteed_many(
+    context: idol.BasicSchoolIdolContext, user: main.User, removable_skill_ids: collections.abc.Iterable[int]
+):
+    removable_skill_ids = set(removable_skill_ids)
+    q = sqlalchemy.select(main.RemovableSkillInfo).where(
+        main.RemovableSkillInfo.user_id == user.id,
+        main.RemovableSkillInfo.unit_removable_skill_id.in_(removable_skill_ids),
+    )
+    result = await context.db.main.execute(q)
+    removable_skills = {i.unit_removable_skill_id: i for i in result.scalars()}
+
+    t = util.time()
+    for removable_skill_id in removable_skill_ids - removable_skills.keys():
+        removable_skill = main.RemovableSkillInfo(
+            user_id=user.id, unit_removable_skill_id=removable_skill_id, amount=0, insert_date=t
+        )
+        context.db.main.add(removable_skill)
+        removable_skills[removable_skill_id] = removable_skill
+
+    return removable_skills
+
+
 async def sub_unit_removable_skill(
     context: idol.BasicSchoolIdolContext, /, user: main.User, removable_skill_id: int, amount: int = 1
 ):
@@ -902,7 +1283,11 @@ async def unit_to_item[
 
 @common.context_cacheable("unit_support_member")
 async def is_support_member(context: idol.BasicSchoolIdolContext, unit_id: int, /):
-    unit_info = await context.db.unit.get(unit.Unit, unit_id)
+    master_snapshot = snapshot.get()
+    if master_snapshot is not None:
+        unit_info = master_snapshot.unit_info.get(unit_id)
+    else:
+        unit_info = await context.db.unit.get(unit.Unit, unit_id)
     if unit_info is None:
         raise ValueError("invalid unit_id")
     return unit_info.disable_rank_up > 0
@@ -993,6 +1378,43 @@ async def process_quick_add(
     return current_unit_count
 
 
+async def process_quick_add_many(
+    context: idol.BasicSchoolIdolContext,
+    /,
+    user: main.User,
+    quick_add_results: collections.abc.Iterable[QuickAddResult],
+    *,
+    reason_jp: str = "Reward",
+    reason_en: str = "Reward",
+    expire: int = 0,
+):
+    """Same as calling `process_quick_add` for each result, except the units which fit are added together."""
+    current_unit_count = await count_units(context, user, True)
+    new_units: list[tuple[QuickAddResult, main.Unit]] = []
+
+    for quick_add_result in quick_add_results:
+        if quick_add_result.unit_data:
+            if current_unit_count >= user.unit_max:
+                # Move to present box
+                quick_add_result.as_item_reward.reward_box_flag = True
+                await reward.add_item(context, user, quick_add_result.as_item_reward, reason_jp, reason_en, expire)
+            else:
+                assert quick_add_result.full_info is not None
+                new_units.append((quick_add_result, quick_add_result.unit_data))
+                current_unit_count = current_unit_count + 1
+        else:
+            # Add directly
+            await add_supporter_unit(context, user, quick_add_result.unit_id)
+
+    if new_units:
+        await add_units_by_object(context, user, [unit_data for _, unit_data in new_units])
+        # Update unit_owning_user_id
+        for quick_add_result, _ in new_units:
+            quick_add_result.update_unit_owning_user_id()
+
+    return current_unit_count
+
+
 async def has_signed_variant(context: idol.BasicSchoolIdolContext, unit_id: int):
     return await context.db.unit.get(unit.SignAsset, unit_id) is not None
 
@@ -1119,8 +1541,8 @@ async def create_unit_item(
     removable_skill_max = removable_skill_capacity == unit_info.max_removable_skill_capacity
 
     if extra_data.level is not None:
-        unit_level_up_pattern = await get_unit_level_up_pattern(context, unit_info.unit_level_up_pattern_id)
-        exp = get_exp_for_target_level(unit_info, unit_level_up_pattern, extra_data.level)
+        unit_level_up_table = await get_unit_level_up_table(context, unit_info.unit_level_up_pattern_id)
+        exp = get_exp_for_target_level(unit_info, unit_level_up_table, extra_data.level)
     else:
         exp = extra_data.exp
 
@@ -1133,11 +1555,7 @@ async def create_unit_item(
     # Calculate unit skill level
     skill = await get_unit_skill(context, unit_info.default_unit_skill_id)
     if skill is not None:
-        skill_levels = await get_unit_skill_level_up_pattern(
-            context,
-            skill.unit_skill_level_up_pattern_id,
-        )
-
+        skill_levels = await get_unit_skill_level_up_table(context, skill.unit_skill_level_up_pattern_id)
         skill_stats = calculate_unit_skill_stats(skill, skill_levels, extra_data.skill_exp)
         skill_max = skill_stats[0] == skill.max_level
         skill_level = skill_stats[0]
@@ -74,9 +74,8 @@ async def get_current(context: idol.SchoolIdolUserParams):
     if result is None:
         raise ValueError("logic error, user is None")
 
-    context.add_task(session.try_cleanup_tokens)
-
     if result.locked:
+        session.invalidate_user_sessions(result.id)
         raise idol.error.locked()
 
     return result
@@ -305,6 +304,7 @@ async def delete_user(context: idol.BasicSchoolIdolContext, user_id: int):
     await _clean_table(context, main.Background, user_id)
     await _clean_table(context, main.RequestCache, user_id)
     await _clean_table(context, main.Session, user_id)
+    session.invalidate_user_sessions(user_id)
 
     # Perform failsafe on party_user_id
     q = (
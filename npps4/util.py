@@ -132,7 +132,7 @@ class _MeasureClass:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        t = ((self.t - timelib.perf_counter_ns()) // 1000) / 1000000
+        t = ((timelib.perf_counter_ns() - self.t) // 1000) / 1000000
 
         if exc_type is None:
             log(f"Measuring performance of '{self.name}' took {t} seconds.", severity=self.severity)
@@ -144,6 +144,27 @@ def measure(name: str = "", severity: int = logging.DEBUG):
     return _MeasureClass(name, severity)
 
 
+class StageTimer:
+    """Measure time taken by each stage of a long operation, then log all of them at once."""
+
+    def __init__(self, name: str, severity: int = logging.DEBUG):
+        self.name = name
+        self.severity = severity
+        self.start = self.last = timelib.perf_counter_ns()
+        self.stages: list[tuple[str, int]] = []
+
+    def mark(self, stage: str):
+        """Mark the end of `stage`, which started at the previous mark."""
+        t = timelib.perf_counter_ns()
+        self.stages.append((stage, t - self.last))
+        self.last = t
+
+    def log(self):
+        stages = ", ".join(f"{stage} {t / 1000000:.3f}ms" for stage, t in self.stages)
+        total = (self.last - self.start) / 1000000
+        log(f"Stages of '{self.name}' took {total:.3f}ms: {stages}", severity=self.severity)
+
+
 def shallow_dump(model: pydantic.BaseModel, /):
     keys = itertools.chain(model.__class__.model_fields.keys(), model.model_computed_fields.keys())
     return {k: getattr(model, k) for k in keys}
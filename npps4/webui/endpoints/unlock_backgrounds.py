@@ -7,6 +7,7 @@ from .. import template
 from ... import idol
 from ...app import webui
 from ...db import item
+from ...idol import cache
 from ...db import main
 from ...system import background
 
@@ -44,7 +45,10 @@ async def unlock_backgrounds(
         # Get locked and unlocked backgrounds
         unlocked, locked = await get_backgrounds(context, target_user)
 
-        return template.template.TemplateResponse(
-            "unlock_backgrounds.html",
-            {"uid": uid, "request": request, "unlocked_backgrounds": unlocked, "locked_backgrounds": locked},
-        )
+    if bg_id:
+        cache.invalidate_user(uid)
+
+    return template.template.TemplateResponse(
+        "unlock_backgrounds.html",
+        {"uid": uid, "request": request, "unlocked_backgrounds": unlocked, "locked_backgrounds": locked},
+    )
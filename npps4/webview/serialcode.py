@@ -1,3 +1,5 @@
+import collections
+import time
 import urllib.parse
 
 import fastapi
@@ -8,11 +10,53 @@ from .. import idol
 from .. import serialcode
 from .. import util
 from ..app import app
+from ..idol import cache
 from ..system import user
 
 from typing import Annotated
 
 
+# How many serial code attempts an user can make within ATTEMPT_WINDOW seconds.
+ATTEMPT_LIMIT = 10
+ATTEMPT_WINDOW = 60
+# Amount of tracked users before users without recent attempts are forgotten.
+SWEEP_THRESHOLD = 1024
+
+
+class AttemptLimiter:
+    """Sliding window limit of attempts per key."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.attempts: dict[int, collections.deque[float]] = {}
+
+    def try_attempt(self, key: int):
+        t = time.monotonic()
+        attempts = self.attempts.get(key)
+        if attempts is None:
+            if len(self.attempts) >= SWEEP_THRESHOLD:
+                self.sweep(t)
+            attempts = self.attempts[key] = collections.deque()
+
+        while attempts and attempts[0] <= t - self.window:
+            attempts.popleft()
+        if len(attempts) >= self.limit:
+            return False
+
+        attempts.append(t)
+        return True
+
+    def sweep(self, t: float):
+        """Forget keys whose attempts are all outside the window."""
+        stale = [key for key, attempts in self.attempts.items() if not attempts or attempts[-1] <= t - self.window]
+        for key in stale:
+            del self.attempts[key]
+
+
+ATTEMPTS = AttemptLimiter(ATTEMPT_LIMIT, ATTEMPT_WINDOW)
+
+
 class SerialCodeAPIRequest(pydantic.BaseModel):
     key: str
 
@@ -52,16 +96,19 @@ async def serial_code_index_post(
             if current_user is None:
                 return SerialCodeAPIResponse(ok=False, msg="Missing User")
 
+            if not ATTEMPTS.try_attempt(current_user.id):
+                return SerialCodeAPIResponse(ok=False, msg="too many attempts, please try again later")
+
             # Find the serial code
             input_code = key_request.key.strip()
-            for serial_code in data.get().serial_codes:
-                if serial_code.check_serial_code(input_code):
-                    # Found
-                    return SerialCodeAPIResponse(
-                        ok=True, msg=await serialcode.execute(context, current_user, input_code, serial_code)
-                    )
-
-            return SerialCodeAPIResponse(ok=False, msg="unknown or invalid serial code")
+            serial_code = data.get().serial_code_index.find(input_code)
+            if serial_code is None:
+                return SerialCodeAPIResponse(ok=False, msg="unknown or invalid serial code")
+
+            msg = await serialcode.execute(context, current_user, input_code, serial_code)
+
+        cache.invalidate_user(current_user.id)
+        return SerialCodeAPIResponse(ok=True, msg=msg)
     except Exception as e:
         util.log("Error while running serial code", severity=util.logging.ERROR, e=e)
         return SerialCodeAPIResponse(ok=False, msg=str(e))
@@ -11,18 +11,17 @@ async def run_script(args: list[str]):
     input_code = args[0]
     server_data = npps4.data.get()
 
-    for serial_code in server_data.serial_codes:
-        if serial_code.check_serial_code(input_code):
-            if isinstance(serial_code.serial_code, str):
-                raise Exception("cannot encrypt action without secure serial code")
-
-            print(input_code)
-            print()
-            input_data = serial_code.get_action(input_code).model_dump_json(exclude_defaults=True)
-            print(input_data)
-            return
-
-    raise Exception("cannot find such serial code")
+    serial_code = server_data.serial_code_index.find(input_code)
+    if serial_code is None:
+        raise Exception("cannot find such serial code")
+
+    if isinstance(serial_code.serial_code, str):
+        raise Exception("cannot encrypt action without secure serial code")
+
+    print(input_code)
+    print()
+    input_data = serial_code.get_action(input_code).model_dump_json(exclude_defaults=True)
+    print(input_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import npps4.script_dummy  # Must be first
+
+import argparse
+import os
+
+import pydantic
+
+import npps4.beatmap
+import npps4.config.config
+import npps4.system.live_model
+
+
+def load_beatmaps(directory: str):
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+
+        with open(os.path.join(directory, name), "rb") as f:
+            try:
+                notes = pydantic.TypeAdapter(list[npps4.system.live_model.LiveNote]).validate_json(f.read())
+            except pydantic.ValidationError as e:
+                print("Skipping", name, "due to invalid beatmap:", e)
+                continue
+
+        yield name, notes
+
+
+async def run_script(arg: list[str]):
+    parser = argparse.ArgumentParser(__file__, description="Pack JSON beatmaps into single packed beatmap file.")
+    parser.add_argument(
+        "-i",
+        "--input",
+        default=os.path.join(npps4.config.config.ROOT_DIR, "beatmaps"),
+        help="Directory containing the JSON beatmaps.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=os.path.join(npps4.config.config.ROOT_DIR, "beatmaps.npb"),
+        help="Packed beatmap file output.",
+    )
+    args = parser.parse_args(arg)
+
+    packed = npps4.beatmap.pack(load_beatmaps(args.input))
+    # Write to temporary file first so running server never sees partially-written file.
+    temp_output = args.output + ".tmp"
+    with open(temp_output, "wb") as f:
+        f.write(packed)
+    os.replace(temp_output, args.output)
+
+    beatmaps = npps4.beatmap.PackedBeatmaps(args.output)
+    print("Packed", len(beatmaps), "beatmaps to", args.output)
+    beatmaps.close()
+
+
+if __name__ == "__main__":
+    import npps4.scriptutils.boot
+
+    npps4.scriptutils.boot.start(run_script)